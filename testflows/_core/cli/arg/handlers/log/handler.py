@@ -0,0 +1,94 @@
+# Copyright 2024 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import argparse
+
+from collections.abc import Mapping
+
+from testflows._core.cli.arg.common import epilog
+from testflows._core.cli.arg.common import HelpFormatter
+from testflows._core.cli.arg.handlers.handler import Handler as HandlerBase
+from testflows._core.cli.arg.handlers.log.last import (
+    Handler as last_handler,
+)
+from testflows._core.cli.arg.handlers.log.verify import (
+    Handler as verify_handler,
+)
+from testflows._core.cli.arg.handlers.log.index import (
+    Handler as index_handler,
+)
+
+
+class Commands(Mapping):
+    """Log commands that contain any value so that the argument
+    that is not a command is passed to the default command."""
+
+    def __init__(self, parsers):
+        self.parsers = parsers
+
+    def __getitem__(self, name):
+        return self.parsers[name]
+
+    def __iter__(self):
+        return iter(self.parsers)
+
+    def __len__(self):
+        return len(self.parsers)
+
+    def __contains__(self, name):
+        return True
+
+
+class CommandsAction(argparse._SubParsersAction):
+    """Log commands action that runs the `last` command
+    if the first argument is not a command so that
+    `tfs log [output]` works the same as `tfs log last [output]`."""
+
+    default_command = "last"
+
+    def __init__(self, *args, **kwargs):
+        super(CommandsAction, self).__init__(*args, **kwargs)
+        self.choices = Commands(self._name_parser_map)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        if values[0] not in self._name_parser_map:
+            values = [self.default_command] + list(values)
+        super(CommandsAction, self).__call__(parser, namespace, values, option_string)
+
+
+class Handler(HandlerBase):
+    @classmethod
+    def add_command(cls, commands):
+        parser = commands.add_parser(
+            "log",
+            help="log operations",
+            epilog=epilog(),
+            description="Log operations.\n\n"
+            "If the first argument is not a command then the last\n"
+            "temporary test log is written to it as an output file,\n"
+            "the same as using the 'last' command.",
+            formatter_class=HelpFormatter,
+        )
+
+        log_commands = parser.add_subparsers(
+            title="commands",
+            metavar="command",
+            description=None,
+            help=None,
+            action=CommandsAction,
+        )
+        log_commands.required = True
+        last_handler.add_command(log_commands)
+        verify_handler.add_command(log_commands)
+        index_handler.add_command(log_commands)
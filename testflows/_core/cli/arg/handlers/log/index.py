@@ -0,0 +1,79 @@
+# Copyright 2024 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+
+import testflows._core.cli.arg.type as argtype
+import testflows._core.log_index as log_index
+
+from testflows._core.cli.arg.common import epilog
+from testflows._core.cli.arg.common import HelpFormatter
+from testflows._core.cli.arg.handlers.handler import Handler as HandlerBase
+from testflows._core.cli.arg.exit import ExitWithError
+from testflows._core.cli.text import secondary
+from testflows._core.transform.log.read import transform as read_transform
+
+
+class Handler(HandlerBase):
+    @classmethod
+    def add_command(cls, commands):
+        parser = commands.add_parser(
+            "index",
+            help="index log",
+            epilog=epilog(),
+            description=(
+                "Index log by writing one record per test into an SQLite database\n"
+                f"stored next to the log file as '<log>{log_index.extension}'.\n"
+                "The index is used automatically by the 'tfs show' commands\n"
+                "and '--rerun --reference' to only read the messages\n"
+                "of the selected tests. The index is ignored once the log changes."
+            ),
+            formatter_class=HelpFormatter,
+        )
+
+        parser.add_argument(
+            "input",
+            metavar="input",
+            type=argtype.logfile("r", encoding="utf-8"),
+            help="input log",
+        )
+        parser.add_argument(
+            "output",
+            metavar="output",
+            type=argtype.file("w", bufsize=1, encoding="utf-8"),
+            nargs="?",
+            help="output file, default: stdout",
+            default="-",
+        )
+
+        parser.set_defaults(func=cls())
+
+    def handle(self, args):
+        logfile = getattr(args.input, "name", None)
+        if not isinstance(logfile, str) or not os.path.isfile(logfile):
+            raise ExitWithError("input log must be a regular file")
+
+        try:
+            import sqlite3
+        except ImportError:
+            raise ExitWithError("sqlite3 module is not available")
+
+        messages = read_transform(args.input, offset=True)
+        next(messages)
+
+        tests = log_index.build(logfile, messages)
+
+        args.output.write(
+            secondary(f"Indexed {tests} tests into {log_index.filename(logfile)}")
+        )
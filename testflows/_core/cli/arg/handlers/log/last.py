@@ -31,7 +31,7 @@ class Handler(HandlerBase):
     @classmethod
     def add_command(cls, commands):
         parser = commands.add_parser(
-            "log",
+            "last",
             help="retrieve last temporary test log",
             epilog=epilog(),
             description="Retrieve last temporary test log.",
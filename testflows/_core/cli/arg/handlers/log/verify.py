@@ -0,0 +1,278 @@
+# Copyright 2024 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import re
+import multiprocessing
+
+from queue import Empty, Full
+
+import testflows._core.cli.arg.type as argtype
+
+from testflows._core.cli.arg.common import epilog
+from testflows._core.cli.arg.common import HelpFormatter
+from testflows._core.cli.arg.handlers.handler import Handler as HandlerBase
+from testflows._core.cli.arg.exit import ExitWithError
+from testflows._core.cli.text import primary, secondary, danger
+from testflows._core.message import Message, CompactMessageDecoder
+from testflows._core.digest import get_hash_func
+
+#: message hash and test id of a message
+message_re = re.compile(
+    r'^\{"message_keyword":"[A-Z]+","message_hash":"([^"]*)".*?,"test_id":"([^"]*)"'
+)
+#: message hash and test handle of a compact (TFSPv3) message
+compact_message_re = re.compile(
+    r'^\["[A-Z]+","([^"]*)",\d+,\d+,(?:null|"(?:[^"\\]|\\.)*"),\d+,[^,]+,[^,]+,"([^"]+)",'
+)
+
+
+def verify_chains(hash_name, batches):
+    """Verify hash chains of the messages in the batches
+    where each message is a tuple of (chain, start, end, line)
+    and [start:end] is the position of the message hash in the line.
+
+    :param hash_name: hash name
+    :param batches: iterable of message batches
+    :return: tuple of (messages, chains, errors)
+    """
+    hash_func = get_hash_func(hash_name)
+    chains = {}
+    errors = []
+    messages = 0
+
+    for batch in batches:
+        for chain, start, end, line in batch:
+            prev_hash, num = chains.get(chain, ("", 0))
+            msg_hash = line[start:end]
+            calculated = hash_func(
+                f"{line[:start]}{prev_hash}{line[end:]}".encode("utf-8")
+            ).hexdigest()[: len(msg_hash)]
+            if calculated != msg_hash:
+                errors.append((chain, num, msg_hash, calculated))
+            chains[chain] = (msg_hash, num + 1)
+            messages += 1
+
+    return messages, len(chains), errors
+
+
+def verify_worker(hash_name, queue, results):
+    """Verify hash chains of the messages received from the queue."""
+    results.put(verify_chains(hash_name, iter(queue.get, None)))
+
+
+class Handler(HandlerBase):
+    @classmethod
+    def add_command(cls, commands):
+        parser = commands.add_parser(
+            "verify",
+            help="verify log integrity",
+            epilog=epilog(),
+            description=(
+                "Verify log integrity by validating per-test message hash chains.\n"
+                "Tests are verified in parallel using multiple processes."
+            ),
+            formatter_class=HelpFormatter,
+        )
+
+        parser.add_argument(
+            "input",
+            metavar="input",
+            type=argtype.logfile("r", bufsize=1, encoding="utf-8"),
+            nargs="?",
+            help="input log, default: stdin",
+            default="-",
+        )
+        parser.add_argument(
+            "output",
+            metavar="output",
+            type=argtype.file("w", bufsize=1, encoding="utf-8"),
+            nargs="?",
+            help="output file, default: stdout",
+            default="-",
+        )
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            metavar="number",
+            type=argtype.count,
+            help="number of processes, default: number of CPUs",
+            default=None,
+        )
+        parser.add_argument(
+            "--batch-size",
+            metavar="number",
+            type=argtype.count,
+            help="number of messages sent to a process at once, default: 1000",
+            default=1000,
+        )
+
+        parser.set_defaults(func=cls())
+
+    def messages(self, file):
+        """Yield tuples of (chain, start, end, line)
+        for each message in the log.
+        """
+        for line in file:
+            line = line.rstrip("\n")
+            if line.startswith("{"):
+                match = message_re.match(line)
+            elif line.startswith("["):
+                match = compact_message_re.match(line)
+            else:
+                continue
+            if match is None:
+                raise ExitWithError(f"invalid message: {line}")
+            yield match.group(2), match.start(1), match.end(1), line
+
+    def hash_name(self, line):
+        """Return hash name used by the log
+        by reading it from the protocol message.
+        """
+        msg = CompactMessageDecoder().decode(line)
+        if msg["message_keyword"] != str(Message.PROTOCOL):
+            raise ExitWithError("log does not start with a protocol message")
+        return msg.get("protocol_hash", "sha1")
+
+    def check_workers(self, workers):
+        """Raise an error if any of the worker processes has died."""
+        for worker in workers:
+            if worker.exitcode not in (None, 0):
+                raise ExitWithError(
+                    f"verify process {worker.pid} died"
+                    f" with exit code {worker.exitcode}"
+                )
+
+    def put(self, queue, item, workers, timeout=1):
+        """Put item into the worker queue while checking
+        that worker processes are alive.
+        """
+        while True:
+            try:
+                return queue.put(item, timeout=timeout)
+            except Full:
+                self.check_workers(workers)
+
+    def get(self, results, workers, timeout=1):
+        """Get next result while checking that
+        worker processes are alive.
+        """
+        while True:
+            try:
+                return results.get(timeout=timeout)
+            except Empty:
+                self.check_workers(workers)
+
+    def verify(self, hash_name, messages, jobs, batch_size):
+        """Verify messages by sharding hash chains
+        between multiple processes.
+        """
+        if jobs < 2:
+            return verify_chains(hash_name, [messages])
+
+        results = multiprocessing.Queue()
+        queues = [multiprocessing.Queue(maxsize=64) for i in range(jobs)]
+        workers = [
+            multiprocessing.Process(
+                target=verify_worker, args=(hash_name, queue, results), daemon=True
+            )
+            for queue in queues
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            batches = [[] for i in range(jobs)]
+            for message in messages:
+                shard = hash(message[0]) % jobs
+                batch = batches[shard]
+                batch.append(message)
+                if len(batch) >= batch_size:
+                    self.put(queues[shard], batch, workers)
+                    batches[shard] = []
+
+            for shard, queue in enumerate(queues):
+                if batches[shard]:
+                    self.put(queue, batches[shard], workers)
+                self.put(queue, None, workers)
+
+            total_messages, total_chains, all_errors = 0, 0, []
+            for worker in workers:
+                messages, chains, errors = self.get(results, workers)
+                total_messages += messages
+                total_chains += chains
+                all_errors += errors
+
+            return total_messages, total_chains, all_errors
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+                worker.join()
+
+    def handle(self, args):
+        jobs = args.jobs if args.jobs is not None else (os.cpu_count() or 1)
+
+        messages = self.messages(args.input)
+
+        first = next(messages, None)
+        if first is None:
+            raise ExitWithError("log has no messages")
+
+        hash_name = self.hash_name(first[-1])
+
+        if get_hash_func(hash_name) is None:
+            for message in messages:
+                pass
+            codec = getattr(args.input.buffer, "codec", None)
+            if codec is None:
+                verified = "codec could not be detected, nothing was verified"
+            elif not codec.checksum:
+                verified = (
+                    f"log is not compressed (codec: {codec.name}),"
+                    " nothing was verified"
+                )
+            else:
+                verified = (
+                    f"only {codec.name} compressed block checksums were verified"
+                )
+            args.output.write(
+                primary(f"Log messages are not hashed (hash: {hash_name}), {verified}")
+            )
+            return
+
+        def all_messages():
+            yield first
+            yield from messages
+
+        messages, chains, errors = self.verify(
+            hash_name, all_messages(), jobs, args.batch_size
+        )
+
+        for chain, num, msg_hash, calculated in sorted(errors):
+            args.output.write(
+                danger(
+                    f"{chain} message {num}: hash mismatch, "
+                    f"expected {calculated} but found {msg_hash}"
+                )
+            )
+
+        args.output.write(
+            secondary(
+                f"Verified {messages} messages in {chains} tests using {hash_name}"
+            )
+        )
+
+        if errors:
+            raise ExitWithError(f"log integrity check failed, {len(errors)} errors")
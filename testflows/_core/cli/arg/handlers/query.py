@@ -0,0 +1,172 @@
+# Copyright 2024 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import csv
+import json
+
+import testflows._core.cli.arg.type as argtype
+
+from testflows._core.cli.arg.common import epilog
+from testflows._core.cli.arg.common import HelpFormatter
+from testflows._core.cli.arg.handlers.handler import Handler as HandlerBase
+from testflows._core.cli.arg.exit import ExitWithError
+from testflows._core.transform.log.pipeline import QueryLogPipeline
+from testflows._core.transform.log.query import Loader, tables, run_columns
+
+description = f"""Query logs using SQL.
+
+Logs are loaded into an SQLite database that is kept in memory
+unless '--database' is specified, in which case the logs
+are added to the database file that can be queried later
+without loading the logs again.
+
+Each log is a run that has a record in the 'runs' table
+({", ".join(("run",) + run_columns)}).
+Tests, results, attributes, tags, requirements, metrics, and values
+are loaded into the tables with the following columns,
+where the 'run' column refers to the run of the log:
+
+""" + "\n".join(
+    f"  {table}: run, {', '.join(columns)}" for table, columns in tables.values()
+) + """
+
+Note that 'values' is an SQL keyword and must be quoted as "values".
+
+Examples:
+
+Failed tests of each run.
+    tfs query "SELECT run, test_name FROM results WHERE result_type = 'Fail'" --log *.log
+
+Add logs to the database file.
+    tfs query --database runs.db "SELECT count(*) FROM runs" --log *.log
+
+Tests that failed with metric 'memory' above 100 in the last 20 runs.
+    tfs query --database runs.db "SELECT r.run, r.test_name, m.metric_value
+        FROM results r JOIN metrics m ON m.run = r.run AND m.test_id = r.test_id
+        WHERE r.result_type = 'Fail' AND m.metric_name = 'memory' AND m.metric_value > 100
+        AND r.run IN (SELECT run FROM runs ORDER BY started DESC LIMIT 20)"
+"""
+
+
+class Handler(HandlerBase):
+    @classmethod
+    def add_command(cls, commands):
+        parser = commands.add_parser(
+            "query",
+            help="query logs using SQL",
+            epilog=epilog(),
+            description=description,
+            formatter_class=HelpFormatter,
+        )
+
+        parser.add_argument(
+            "query",
+            metavar="query",
+            type=str,
+            help="SQL query",
+        )
+        parser.add_argument(
+            "output",
+            metavar="output",
+            type=argtype.file("w", bufsize=1, encoding="utf-8"),
+            nargs="?",
+            help="output file, default: stdout",
+            default="-",
+        )
+        parser.add_argument(
+            "--log",
+            metavar="pattern",
+            type=argtype.logfile("r", bufsize=1, encoding="utf-8"),
+            nargs="+",
+            help="log file pattern",
+            default=[],
+        )
+        parser.add_argument(
+            "--database",
+            metavar="path",
+            type=str,
+            help="database file where logs are added, default: in memory",
+            default=":memory:",
+        )
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            metavar="number",
+            type=argtype.count,
+            help="number of processes used to parse each log, default: number of CPUs",
+            default=None,
+        )
+        parser.add_argument(
+            "--format",
+            metavar="type",
+            type=str,
+            help="output format choices: 'table', 'csv', 'json' default: table",
+            choices=["table", "csv", "json"],
+            default="table",
+        )
+
+        parser.set_defaults(func=cls())
+
+    def load(self, conn, args):
+        """Load logs into the database."""
+        loader = Loader(conn)
+        for log in args.log:
+            run = loader.add_run(getattr(log, "name", None))
+            QueryLogPipeline(log, loader, run, jobs=args.jobs).run()
+        loader.close()
+
+    def format_table(self, header, rows, output):
+        """Write rows as a text table."""
+        rows = [["" if value is None else str(value) for value in row] for row in rows]
+        widths = [
+            max([len(name)] + [len(row[i]) for row in rows])
+            for i, name in enumerate(header)
+        ]
+        row_format = " | ".join(f"%-{width}s" for width in widths)
+        output.write(row_format % tuple(header) + "\n")
+        output.write(row_format % tuple("-" * width for width in widths) + "\n")
+        for row in rows:
+            output.write(row_format % tuple(row) + "\n")
+
+    def format_csv(self, header, rows, output):
+        """Write rows in CSV format."""
+        writer = csv.writer(output, quoting=csv.QUOTE_NONNUMERIC)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+    def format_json(self, header, rows, output):
+        """Write rows as a JSON array of objects."""
+        output.write("[")
+        for i, row in enumerate(rows):
+            output.write(("," if i else "") + "\n  ")
+            output.write(json.dumps(dict(zip(header, row))))
+        output.write("\n]\n")
+
+    def handle(self, args):
+        try:
+            import sqlite3
+        except ImportError:
+            raise ExitWithError("sqlite3 module is not available")
+
+        conn = sqlite3.connect(args.database)
+        try:
+            self.load(conn, args)
+            try:
+                cursor = conn.execute(args.query)
+            except sqlite3.Error as e:
+                raise ExitWithError(f"query failed: {e}")
+            header = [column[0] for column in cursor.description or ()]
+            getattr(self, f"format_{args.format}")(header, cursor, args.output)
+        finally:
+            conn.close()
@@ -15,10 +15,12 @@
 import re
 import os
 import sys
+import io
 import json
 import time
 import base64
-import threading
+import multiprocessing
+import concurrent.futures
 
 from datetime import datetime
 
@@ -32,6 +34,7 @@ from testflows._core.cli.arg.common import epilog
 from testflows._core.cli.arg.common import HelpFormatter
 from testflows._core.cli.arg.handlers.report.copyright import copyright
 from testflows._core.transform.log.pipeline import ResultsLogPipeline
+from testflows._core.compress import CompressedFile
 from testflows._core.utils.sort import human
 from testflows._core.utils.timefuncs import localfromtimestamp, strftimedelta
 from testflows._core.filters import The
@@ -57,6 +60,78 @@ Generated by {testflows} Open-Source Test Framework
 """
 
 
+def compared(test):
+    """Return True if the test is included in the comparison.
+
+    :param test: test message
+    """
+    if getattr(TestType, test["test_type"]) < TestType.Test:
+        return False
+    if test.get("test_parent_type"):
+        if getattr(TestType, test["test_parent_type"]) < TestType.Suite:
+            return False
+    if Flags(test["test_cflags"]) & RETRY:
+        return False
+    return True
+
+
+def summary(results):
+    """Return summary of the log results that only includes
+    the tests and the fields that are used by the comparison report.
+    Attributes are only included for the first test.
+
+    :param results: log results
+    """
+    tests = {}
+    for uname, test in results["tests"].items():
+        first = not tests
+        if not first and not compared(test["test"]):
+            continue
+        _test = {
+            "test_name": test["test"]["test_name"],
+            "test_type": test["test"]["test_type"],
+            "test_parent_type": test["test"].get("test_parent_type"),
+            "test_cflags": test["test"]["test_cflags"],
+            "attributes": (),
+        }
+        if first:
+            _test["attributes"] = [
+                {
+                    "attribute_name": attr["attribute_name"],
+                    "attribute_value": attr["attribute_value"],
+                }
+                for attr in test["test"]["attributes"]
+            ]
+        _result = {
+            name: test["result"][name]
+            for name in ("result_type", "message_rtime")
+            if name in test["result"]
+        }
+        _result["metrics"] = [
+            {
+                "metric_name": metric["metric_name"],
+                "metric_value": metric["metric_value"],
+                "metric_units": metric["metric_units"],
+            }
+            for metric in test["result"]["metrics"]
+        ]
+        tests[uname] = {"test": _test, "result": _result}
+
+    return {"started": results.get("started", 0), "tests": tests}
+
+
+def log_summary(name):
+    """Process log file in a worker process
+    and return summary of its results.
+
+    :param name: log file name
+    """
+    results = {}
+    with io.TextIOWrapper(CompressedFile(name, jobs=1), encoding="utf-8") as log:
+        ResultsLogPipeline(log, results, jobs=1).run()
+    return summary(results)
+
+
 class Formatter:
     def format_logo(self, data):
         if not data["company"].get("logo"):
@@ -229,6 +304,14 @@ class Handler(HandlerBase):
             help="log file pattern",
             required=True,
         )
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            metavar="number",
+            type=argtype.count,
+            help="number of processes, default: number of CPUs",
+            default=None,
+        )
         parser.add_argument(
             "--log-link",
             metavar="attribute",
@@ -381,15 +464,7 @@ class Handler(HandlerBase):
         tests = []
         for r in results.values():
             for uname, test in r["tests"].items():
-                if getattr(TestType, test["test"]["test_type"]) < TestType.Test:
-                    continue
-                if test["test"].get("test_parent_type"):
-                    if (
-                        getattr(TestType, test["test"]["test_parent_type"])
-                        < TestType.Suite
-                    ):
-                        continue
-                if Flags(test["test"]["test_cflags"]) & RETRY:
+                if not compared(test["test"]):
                     continue
                 tests.append(uname)
         return human(list(set(tests)))
@@ -465,22 +540,27 @@ class Handler(HandlerBase):
         output.write("\n")
 
     def handle(self, args):
-        results = {}
-        threads = []
+        jobs = args.jobs if args.jobs is not None else (os.cpu_count() or 1)
+        results = {log.name: None for log in args.log}
+        # log files that are processed in worker processes
+        names = [name for name in results if os.path.isfile(name)]
 
-        def thread_worker(log, results):
-            ResultsLogPipeline(log, results).run()
+        if jobs < 2 or len(names) < 2:
+            names = []
 
         for log in args.log:
-            log_results = {}
-            threads.append(
-                threading.Thread(target=thread_worker, args=(log, log_results))
-            )
-            results[log.name] = log_results
-            threads[-1].start()
-
-        for thread in threads:
-            thread.join()
+            if log.name not in names:
+                log_results = {}
+                ResultsLogPipeline(log, log_results).run()
+                results[log.name] = summary(log_results)
+
+        if names:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=min(jobs, len(names)),
+                mp_context=multiprocessing.get_context("fork"),
+            ) as executor:
+                for name, log_results in zip(names, executor.map(log_summary, names)):
+                    results[name] = log_results
 
         formatter = self.Formatter()
         self.generate(formatter, results, args)
@@ -18,6 +18,7 @@ import math
 import base64
 
 from json import JSONEncoder
+from collections.abc import Mapping
 
 import testflows.settings as settings
 import testflows._core.cli.arg.type as argtype
@@ -71,6 +72,8 @@ class JSONFormatter:
 
     class Encoder(JSONEncoder):
         def default(self, o):
+            if isinstance(o, Mapping):
+                return dict(o)
             return vars(o)
 
     def format(self, data):
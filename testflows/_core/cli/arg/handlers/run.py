@@ -24,6 +24,7 @@ import testflows._core.cli.arg.type as argtype
 from testflows._core.cli.arg.common import epilog
 from testflows._core.cli.arg.common import HelpFormatter
 from testflows._core.cli.arg.handlers.handler import Handler as HandlerBase
+from testflows._core.utils.watch import FileWatcher
 
 description = """Run test program.
 
@@ -92,7 +93,9 @@ class Handler(HandlerBase):
 
     def _reader(self, filename, out, process, flush=True, timeout=0.1):
         """Read contents of file and write to the specified output."""
-        with open(filename, "r") as fd:
+        with open(filename, "r") as fd, FileWatcher(
+            filename, interval=timeout, timeout=timeout
+        ) as watcher:
             while True:
                 try:
                     out.write(fd.read())
@@ -101,7 +104,7 @@ class Handler(HandlerBase):
                 finally:
                     if process.returncode is not None:
                         break
-                    time.sleep(timeout)
+                    watcher.wait()
 
     def handle(self, args):
         command = ["python3", os.path.abspath(args.program)]
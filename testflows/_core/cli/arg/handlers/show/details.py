@@ -65,13 +65,14 @@ class Handler(HandlerBase):
         def __init__(self, name, input, output, tail=False):
             stop_event = threading.Event()
 
-            command = (
-                'grep -E \'"message_object":1,.+"test_name":"%s"\''
-                % name.replace("'", r"'\''")
-            )
             steps = [
                 read_and_filter_transform(
-                    input, command=command, tail=tail, stop=stop_event
+                    input,
+                    test_name=name,
+                    exact=True,
+                    message_object=1,
+                    tail=tail,
+                    stop=stop_event,
                 ),
                 parse_transform(),
                 flat_transform(),
@@ -81,4 +82,6 @@ class Handler(HandlerBase):
             super(Handler.Pipeline, self).__init__(steps, stop=stop_event)
 
     def handle(self, args):
+        argtype.seek_test(args.log, args.name, exact=True)
+
         self.Pipeline(args.name, args.log, args.output, tail=True).run()
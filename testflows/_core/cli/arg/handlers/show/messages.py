@@ -77,11 +77,9 @@ class Handler(HandlerBase):
     class Pipeline(PipelineBase):
         def __init__(self, name, input, output, format=None, tail=False):
             stop_event = threading.Event()
-            command = f'grep -E \',"test_name":"%s\'' % name
-
             steps = [
                 read_and_filter_transform(
-                    input, command=command, stop=stop_event, tail=tail
+                    input, test_name=name, stop=stop_event, tail=tail
                 )
             ]
 
@@ -97,6 +95,6 @@ class Handler(HandlerBase):
             super(Handler.Pipeline, self).__init__(steps, stop=stop_event)
 
     def handle(self, args):
-        self.Pipeline(
-            args.name.replace("'", r"'\''"), args.log, args.output, args.format
-        ).run()
+        argtype.seek_test(args.log, args.name)
+
+        self.Pipeline(args.name, args.log, args.output, args.format).run()
@@ -68,12 +68,13 @@ class Handler(HandlerBase):
 
             message_types = [Message.METRIC.name]
 
-            command = 'grep -E \'^\\{"message_keyword":"'
-            command = f"{command}({'|'.join(message_types)})\""
-            command += '.+,"test_name":"%s.*?",\'' % name.replace("'", r"'\''")
             steps = [
                 read_and_filter_transform(
-                    input, command=command, stop=stop_event, tail=tail
+                    input,
+                    keywords=message_types,
+                    test_name=name,
+                    stop=stop_event,
+                    tail=tail,
                 ),
                 parse_transform(),
                 flat_transform(),
@@ -83,4 +84,6 @@ class Handler(HandlerBase):
             super(Handler.Pipeline, self).__init__(steps, stop=stop_event)
 
     def handle(self, args):
+        argtype.seek_test(args.log, args.name)
+
         self.Pipeline(args.name, args.log, args.output, tail=True).run()
@@ -12,11 +12,14 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import sys
+
 import testflows._core.cli.arg.type as argtype
 
 from testflows._core.cli.arg.common import epilog
 from testflows._core.cli.arg.common import HelpFormatter
 from testflows._core.cli.arg.handlers.handler import Handler as HandlerBase
+from testflows._core.compress import CompressedFile, get_codec
 from testflows._core.transform.log.pipeline import ReadRawLogPipeline
 
 
@@ -42,14 +45,30 @@ class Handler(HandlerBase):
         parser.add_argument(
             "output",
             metavar="output",
-            type=argtype.logfile("wb"),
+            type=argtype.file("wb"),
             nargs="?",
             help="output file, default: stdout",
             default="-",
         )
+        parser.add_argument(
+            "--codec",
+            metavar=argtype.codec.metavar,
+            type=argtype.codec,
+            help="compression codec and optional level, default: lzma",
+            default="lzma",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="print compression ratio and throughput to stderr",
+            default=False,
+        )
 
         parser.set_defaults(func=cls())
 
     def handle(self, args):
-        with args.output:
-            ReadRawLogPipeline(args.input, args.output, encoding=None).run()
+        codec = get_codec(args.codec)
+        with args.output, CompressedFile(args.output, "wb", codec=codec) as output:
+            ReadRawLogPipeline(args.input, output, encoding=None).run()
+        if args.stats:
+            sys.stderr.write(f"{codec.stats()}\n")
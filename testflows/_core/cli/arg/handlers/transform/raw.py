@@ -47,8 +47,14 @@ class Handler(HandlerBase):
             help="output file, default: stdout",
             default="-",
         )
+        parser.add_argument(
+            "--expand",
+            action="store_true",
+            help="expand compact (TFSPv3) messages into full messages",
+            default=False,
+        )
 
         parser.set_defaults(func=cls())
 
     def handle(self, args):
-        RawLogPipeline(args.input, args.output).run()
+        RawLogPipeline(args.input, args.output, expand=args.expand).run()
@@ -25,11 +25,13 @@ from .handlers.requirement.handler import Handler as requirement_handler
 from .handlers.report.handler import Handler as report_handler
 from .handlers.show.handler import Handler as show_handler
 from .handlers.ssl.handler import Handler as ssl_handler
-from .handlers.log import Handler as log_handler
+from .handlers.log.handler import Handler as log_handler
 from .handlers.run import Handler as run_handler
+from .handlers.query import Handler as query_handler
 
 
 from .type import onoff as onoff_type
+from testflows._core.results_cache import default_directory as results_cache_directory
 
 try:
     from .handlers.snapshot.handler import Handler as snapshot_handler
@@ -98,6 +100,15 @@ parser.add_argument(
     metavar=onoff_type.metavar,
     default="on",
 )
+parser.add_argument(
+    "--results-cache",
+    dest="results_cache",
+    type=onoff_type,
+    help=f"""enable or disable caching of the results of large log files
+        in '{results_cache_directory}', default: off""",
+    metavar=onoff_type.metavar,
+    default="off",
+)
 parser.add_argument("-v", "--version", action="version", version=f"{__version__}")
 parser.add_argument(
     "--license",
@@ -124,6 +135,7 @@ run_handler.add_command(commands)
 log_handler.add_command(commands)
 show_handler.add_command(commands)
 report_handler.add_command(commands)
+query_handler.add_command(commands)
 transform_handler.add_command(commands)
 requirement_handler.add_command(commands)
 if snapshot_handler:
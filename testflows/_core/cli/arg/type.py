@@ -14,6 +14,7 @@
 # limitations under the License.
 import os
 import io
+import re
 import sys
 import csv
 import argparse
@@ -21,7 +22,7 @@ import argparse
 from argparse import ArgumentTypeError
 from collections import namedtuple
 from testflows._core.exceptions import exception
-from testflows._core.compress import CompressedFile
+from testflows._core.compress import CompressedFile, get_codec, codecs
 from testflows._core.objects import Repeat, Retry
 from testflows._core.tracing import logging
 
@@ -137,6 +138,27 @@ def logfile(*args, **kwargs):
     return LogFileType(*args, **kwargs)
 
 
+def seek_test(log, name, exact=False):
+    """Seek log file opened using the log file type
+    to the messages of the tests whose name matches the pattern
+    so that only they are read if the log file has an index.
+
+    Returns False if the log file can't be seeked.
+
+    :param log: log file
+    :param name: test name regex pattern
+    :param exact: pattern must match the whole test name, default: False
+    """
+    fp = getattr(log, "buffer", log)
+    if not hasattr(fp, "seek_test"):
+        return False
+    try:
+        return fp.seek_test(name, exact=exact)
+    except re.error:
+        # invalid pattern is reported when messages are filtered
+        return False
+
+
 def rsa_private_key_pem_file(p):
     """RSA private key PEM file type."""
     with open(p, mode="rb") as pem_file:
@@ -237,6 +259,18 @@ onoff.metavar = (
 )
 
 
+def codec(value):
+    """Log file codec type in the form name[:level]."""
+    try:
+        get_codec(value)
+    except ValueError as e:
+        raise ArgumentTypeError(str(e))
+    return value
+
+
+codec.metavar = "{" + ",".join(codecs) + "}[:level]"
+
+
 def trace_level(value):
     if value.lower() in ["debug", "info", "warning", "error", "critical"]:
         return getattr(logging, value.upper())
@@ -14,29 +14,415 @@
 # limitations under the License.
 import io
 import os
+import re
 import sys
+import mmap
 import time
+import gzip
+import zlib
+import collections
+import multiprocessing
+import concurrent.futures
 import testflows._core.contrib.lzma as lzma
 import builtins
 import _compression
 
+import testflows.settings as settings
+
 from testflows._core.contrib.lzma import compress, decompress
+from testflows._core.index import BlockIndex, BlockFile
+from testflows._core.log_index import LogIndex, RangeFile
+from testflows._core.utils.watch import FileWatcher
+
+try:
+    from compression import zstd
+except ImportError:
+    zstd = None
 
 Compressor = lzma.LZMACompressor
 Decompressor = lzma.LZMADecompressor
 
+# uncompressed data is a sequence of messages each starting with
+# one of the following markers
+UNCOMPRESSED_MARKERS = b"{["
+
+
+class Codec(object):
+    """Log file codec that compresses each block
+    of messages into a self-contained stream.
+
+    :param level: compression level (or preset), default: None
+    """
+
+    name = None
+    #: stream magic used to detect the codec
+    magic = None
+    #: stream has a checksum that is verified on decompression
+    checksum = True
+
+    def __init__(self, level=None):
+        self.level = level
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+        self.seconds = 0.0
+
+    def __str__(self):
+        return self.name + (f":{self.level}" if self.level is not None else "")
+
+    @classmethod
+    def match(cls, data):
+        """Return True if data starts with a stream of this codec."""
+        return data.startswith(cls.magic)
+
+    def compress(self, data):
+        """Compress data into a new stream and
+        keep compression statistics.
+
+        :param data: bytes
+        """
+        start_time = time.time()
+        compressed = self._compress(data)
+        self.seconds += time.time() - start_time
+        self.raw_bytes += len(data)
+        self.compressed_bytes += len(compressed)
+        return compressed
+
+    def _compress(self, data):
+        raise NotImplementedError
+
+    def compressor(self):
+        """Return new incremental compressor
+        that keeps compression statistics.
+        """
+        return CodecCompressor(self, self._compressor())
+
+    def _compressor(self):
+        raise NotImplementedError
+
+    @classmethod
+    def decompressor(cls):
+        """Return new decompressor for one stream."""
+        raise NotImplementedError
+
+    @property
+    def ratio(self):
+        """Compression ratio."""
+        if not self.compressed_bytes:
+            return 0.0
+        return self.raw_bytes / self.compressed_bytes
+
+    @property
+    def throughput(self):
+        """Compression throughput in bytes per second."""
+        if not self.seconds:
+            return 0.0
+        return self.raw_bytes / self.seconds
+
+    def stats(self):
+        """Return compression statistics as a string."""
+        return (
+            f"codec {self} compressed {self.raw_bytes} bytes into "
+            f"{self.compressed_bytes} bytes, ratio {self.ratio:.2f}, "
+            f"throughput {self.throughput / 1048576:.2f} MiB/s"
+        )
+
+
+class CodecCompressor(object):
+    """Incremental compressor that updates codec statistics.
+
+    :param codec: codec
+    :param compressor: incremental compressor
+    """
+
+    def __init__(self, codec, compressor):
+        self.codec = codec
+        self._compressor = compressor
+
+    def _update(self, raw_bytes, compressed, start_time):
+        self.codec.seconds += time.time() - start_time
+        self.codec.raw_bytes += raw_bytes
+        self.codec.compressed_bytes += len(compressed)
+        return compressed
+
+    def compress(self, data):
+        start_time = time.time()
+        return self._update(len(data), self._compressor.compress(data), start_time)
+
+    def flush(self):
+        start_time = time.time()
+        return self._update(0, self._compressor.flush(), start_time)
+
+
+class LZMACodec(Codec):
+    name = "lzma"
+    magic = b"\xfd\x37\x7a\x58\x5a\x00"
+
+    def _compress(self, data):
+        return lzma.compress(data, preset=self.level)
+
+    def _compressor(self):
+        return lzma.LZMACompressor(preset=self.level)
+
+    @classmethod
+    def decompressor(cls):
+        return lzma.LZMADecompressor()
+
+
+class ZlibDecompressor(object):
+    """Adapts zlib decompress object to the LZMADecompressor API.
+
+    :param wbits: window bits
+    """
+
+    def __init__(self, wbits=zlib.MAX_WBITS):
+        self._decompressor = zlib.decompressobj(wbits)
+
+    @property
+    def eof(self):
+        return self._decompressor.eof
+
+    @property
+    def unused_data(self):
+        return self._decompressor.unused_data
+
+    @property
+    def needs_input(self):
+        return not self._decompressor.unconsumed_tail
+
+    def decompress(self, data, max_length=-1):
+        data = self._decompressor.unconsumed_tail + data
+        return self._decompressor.decompress(data, max(max_length, 0))
+
+
+class ZlibCodec(Codec):
+    name = "zlib"
+
+    @classmethod
+    def match(cls, data):
+        return (
+            len(data) > 1
+            and data[0] & 0x0F == zlib.DEFLATED
+            and (data[0] << 8 | data[1]) % 31 == 0
+        )
+
+    def _compress(self, data):
+        return zlib.compress(data, -1 if self.level is None else self.level)
+
+    def _compressor(self):
+        return zlib.compressobj(-1 if self.level is None else self.level)
+
+    @classmethod
+    def decompressor(cls):
+        return ZlibDecompressor()
+
+
+class GzipCodec(Codec):
+    name = "gzip"
+    magic = b"\x1f\x8b"
+
+    def _compress(self, data):
+        return gzip.compress(data, 9 if self.level is None else self.level, mtime=0)
+
+    def _compressor(self):
+        return zlib.compressobj(9 if self.level is None else self.level, wbits=31)
+
+    @classmethod
+    def decompressor(cls):
+        return ZlibDecompressor(wbits=31)
+
+
+class ZstdCodec(Codec):
+    name = "zstd"
+    magic = b"\x28\xb5\x2f\xfd"
+
+    def _options(self):
+        options = {zstd.CompressionParameter.checksum_flag: 1}
+        if self.level is not None:
+            options[zstd.CompressionParameter.compression_level] = self.level
+        return options
+
+    def _compress(self, data):
+        return zstd.compress(data, options=self._options())
+
+    def _compressor(self):
+        return zstd.ZstdCompressor(options=self._options())
+
+    @classmethod
+    def decompressor(cls):
+        return zstd.ZstdDecompressor()
+
+
+class NoneDecompressor(object):
+    """Pass through decompressor for uncompressed messages
+    that ends the stream at the first line that does not start
+    with an uncompressed marker.
+    """
+
+    _end = re.compile(b"\n[^" + re.escape(UNCOMPRESSED_MARKERS) + b"]")
+
+    def __init__(self):
+        self._eof = False
+        self._newline = True
+        self._pending = b""
+        self.unused_data = b""
+
+    @property
+    def eof(self):
+        return self._eof and not self._pending
+
+    @property
+    def needs_input(self):
+        return not self._eof and not self._pending
+
+    def decompress(self, data, max_length=-1):
+        if data and not self._eof:
+            if self._newline and data[0] not in UNCOMPRESSED_MARKERS:
+                self._eof, self.unused_data, data = True, data, b""
+            else:
+                match = self._end.search(data)
+                if match:
+                    end = match.start() + 1
+                    self._eof, self.unused_data, data = True, data[end:], data[:end]
+            if data:
+                self._newline = data[-1:] == b"\n"
+                self._pending += data
+
+        if max_length < 0:
+            data, self._pending = self._pending, b""
+        else:
+            data, self._pending = (
+                self._pending[:max_length],
+                self._pending[max_length:],
+            )
+        return data
+
+
+class NoneCompressor(object):
+    def compress(self, data):
+        return data
+
+    def flush(self):
+        return b""
+
+
+class NoneCodec(Codec):
+    name = "none"
+    checksum = False
+
+    @classmethod
+    def match(cls, data):
+        return data[:1] != b"" and data[0] in UNCOMPRESSED_MARKERS
+
+    def _compress(self, data):
+        return data
+
+    def _compressor(self):
+        return NoneCompressor()
+
+    @classmethod
+    def decompressor(cls):
+        return NoneDecompressor()
+
+
+#: available log file codecs
+codecs = {
+    codec.name: codec
+    for codec in (LZMACodec, ZlibCodec, GzipCodec, ZstdCodec, NoneCodec)
+    if codec is not ZstdCodec or zstd is not None
+}
+
+
+def get_codec(spec):
+    """Return new codec instance given codec
+    specification in the form name[:level].
+
+    :param spec: codec specification
+    """
+    if isinstance(spec, Codec):
+        return spec
+    name, _, level = str(spec).partition(":")
+    if name not in codecs:
+        raise ValueError(
+            f"unknown codec '{name}', available codecs are {list(codecs)}"
+        )
+    return codecs[name](level=int(level) if level else None)
+
+
+class AutoDecompressor(object):
+    """Decompressor that detects the codec of a stream
+    using the first bytes of the stream.
+    """
+
+    #: minimum number of bytes needed to detect the codec
+    min_detect_size = 6
+
+    def __init__(self):
+        self._decompressor = None
+        self._data = b""
+        #: codec of the stream or None if not detected yet
+        self.codec = None
+
+    @property
+    def eof(self):
+        return self._decompressor.eof if self._decompressor else False
+
+    @property
+    def needs_input(self):
+        return self._decompressor.needs_input if self._decompressor else True
+
+    @property
+    def unused_data(self):
+        return self._decompressor.unused_data if self._decompressor else self._data
+
+    def decompress(self, data, max_length=-1):
+        if self._decompressor is None:
+            self._data += data
+            for codec in codecs.values():
+                if codec.match(self._data):
+                    break
+            else:
+                if len(self._data) < self.min_detect_size:
+                    return b""
+                raise lzma.LZMAError("Input format not supported by decoder")
+            data, self._data = self._data, b""
+            self._decompressor = codec.decompressor()
+            self.codec = codec
+        return self._decompressor.decompress(data, max_length)
+
 
 class TailingDecompressReader(_compression.DecompressReader):
     def __init__(self, *args, **kwargs):
         self._tail = kwargs.pop("tail", True)
         self._tail_sleep = float(kwargs.pop("tail_sleep", 0.15))
-        # default compressed file marker '.7zXZ'
-        self._COMPRESSED_FILE_MARKER = b"\xfd\x37\x7a\x58\x5a"
+        self._watcher = None
+        # compressed file markers of the codecs that have stream magic
+        self._COMPRESSED_FILE_MARKERS = [
+            codec.magic for codec in codecs.values() if codec.magic
+        ]
         # default uncompressed file marker is start of the message
-        self._UNCOMPRESSED_FILE_MARKER = '{"message_keyword"'.encode("utf-8")
+        self._UNCOMPRESSED_FILE_MARKERS = [
+            '{"message_keyword"'.encode("utf-8"),
+            '["PROTOCOL",'.encode("utf-8"),
+        ]
 
         super(TailingDecompressReader, self).__init__(*args, **kwargs)
 
+    def _wait(self):
+        """Wait for more data to be written to the file being tailed."""
+        if self._watcher is None:
+            # check for data written before the watch was added
+            self._watcher = FileWatcher(
+                getattr(self._fp, "name", None), interval=self._tail_sleep
+            )
+            return
+        self._watcher.wait()
+
+    def close(self):
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+        return super(TailingDecompressReader, self).close()
+
     def read(self, size=-1, _tail_sleep=0.15):
         if size < 0:
             return self.readall()
@@ -54,7 +440,7 @@ class TailingDecompressReader(_compression.DecompressReader):
                 if not self.rawblock:
                     if not self._tail:
                         break
-                    time.sleep(self._tail_sleep)
+                    self._wait()
                     continue
                 # Continue to next stream.
                 self._decompressor = self._decomp_factory(**self._decomp_args)
@@ -69,7 +455,7 @@ class TailingDecompressReader(_compression.DecompressReader):
                     if not self.rawblock:
                         if not self._tail:
                             break
-                        time.sleep(self._tail_sleep)
+                        self._wait()
                         continue
                 else:
                     self.rawblock = b""
@@ -85,10 +471,20 @@ class TailingDecompressReader(_compression.DecompressReader):
                             if not raw_data:
                                 if not self._tail:
                                     raise
+                                self._wait()
+                                continue
                             self.rawblock += raw_data
                             # try to find compressed file marker
-                            compressed_file_marker_idx = self.rawblock.find(
-                                self._COMPRESSED_FILE_MARKER
+                            compressed_file_marker_idx = min(
+                                [
+                                    idx
+                                    for idx in (
+                                        self.rawblock.find(marker)
+                                        for marker in self._COMPRESSED_FILE_MARKERS
+                                    )
+                                    if idx >= 0
+                                ]
+                                or [-1]
                             )
                             if compressed_file_marker_idx >= 0:
                                 self.rawblock = self.rawblock[
@@ -96,8 +492,16 @@ class TailingDecompressReader(_compression.DecompressReader):
                                 ]
                                 break
                             # try to find uncompressed file marker
-                            uncompressed_file_marker_idx = self.rawblock.find(
-                                self._UNCOMPRESSED_FILE_MARKER
+                            uncompressed_file_marker_idx = min(
+                                [
+                                    idx
+                                    for idx in (
+                                        self.rawblock.find(marker)
+                                        for marker in self._UNCOMPRESSED_FILE_MARKERS
+                                    )
+                                    if idx >= 0
+                                ]
+                                or [-1]
                             )
                             if uncompressed_file_marker_idx >= 0:
                                 self.rawblock = self.rawblock[
@@ -118,7 +522,98 @@ class TailingDecompressReader(_compression.DecompressReader):
         return data
 
 
+def decompress_chunk(filename, offset, size):
+    """Decompress chunk of a log file that contains
+    one or more complete compressed streams.
+
+    :param filename: log file name
+    :param offset: chunk offset
+    :param size: chunk size
+    """
+    with builtins.open(filename, "rb") as fd:
+        fd.seek(offset)
+        data = fd.read(size)
+
+    chunks = []
+    while data:
+        decompressor = AutoDecompressor()
+        chunks.append(decompressor.decompress(data))
+        if not decompressor.eof:
+            raise lzma.LZMAError(
+                f"incomplete compressed stream in chunk at offset {offset}"
+            )
+        data = decompressor.unused_data
+    return b"".join(chunks)
+
+
+class ParallelDecompressReader(io.RawIOBase):
+    """Reader that decompresses chunks of complete compressed
+    streams of a finished log file in a process pool and returns
+    decompressed data in the original order. At most `jobs * 2`
+    chunks are decompressed ahead of the reader.
+
+    The reader is not seekable, see `CompressedFile.seek()`.
+
+    :param filename: log file name
+    :param chunks: list of (offset, size) of each chunk
+    :param jobs: number of processes
+    :param codec: codec of the streams, default: None
+    """
+
+    def __init__(self, filename, chunks, jobs, codec=None):
+        self._filename = filename
+        self.codec = codec
+        self._chunks = iter(chunks)
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs, mp_context=multiprocessing.get_context("fork")
+        )
+        self._pending = collections.deque()
+        self._data = memoryview(b"")
+        self._pos = 0
+        for i in range(jobs * 2):
+            self._submit()
+
+    def _submit(self):
+        chunk = next(self._chunks, None)
+        if chunk is not None:
+            self._pending.append(
+                self._executor.submit(decompress_chunk, self._filename, *chunk)
+            )
+
+    def readable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def readinto(self, b):
+        while not self._data:
+            if not self._pending:
+                return 0
+            self._data = memoryview(self._pending.popleft().result())
+            self._submit()
+        size = min(len(b), len(self._data))
+        b[:size] = self._data[:size]
+        self._data = self._data[size:]
+        self._pos += size
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        super(ParallelDecompressReader, self).close()
+
+
 class CompressedFile(lzma.LZMAFile):
+    #: minimum size of the log file that is decompressed in parallel
+    parallel_min_size = 16 * 1048576
+    #: target uncompressed size of a chunk when using block index
+    chunk_size = 16 * 1048576
+    #: target compressed size of a chunk when not using block index
+    compressed_chunk_size = 1048576
+    #: xz stream footer magic followed by the header magic of the next stream
+    xz_stream_boundary = b"YZ" + LZMACodec.magic
+
     def __init__(
         self,
         filename=None,
@@ -128,13 +623,17 @@ class CompressedFile(lzma.LZMAFile):
         check=-1,
         preset=None,
         filters=None,
-        tail=False
+        tail=False,
+        codec=None,
+        jobs=None
     ):
         self._fp = None
         self._closefp = False
         self._mode = lzma._MODE_CLOSED
         self._raw_mode = False
         self._tail = tail
+        self._jobs = jobs
+        self._parallel = False
 
         if mode in ("r", "rb"):
             if check != -1:
@@ -154,9 +653,12 @@ class CompressedFile(lzma.LZMAFile):
             if format is None:
                 format = lzma.FORMAT_XZ
             mode_code = lzma._MODE_WRITE
-            self._compressor = lzma.LZMACompressor(
-                format=format, check=check, preset=preset, filters=filters
-            )
+            if codec is not None:
+                self._compressor = get_codec(codec).compressor()
+            else:
+                self._compressor = lzma.LZMACompressor(
+                    format=format, check=check, preset=preset, filters=filters
+                )
             self._pos = 0
         else:
             raise ValueError("Invalid mode: {!r}".format(mode))
@@ -178,19 +680,260 @@ class CompressedFile(lzma.LZMAFile):
             raise TypeError("filename must be a str, bytes, file or PathLike object")
 
         if self._mode == lzma._MODE_READ:
+            if format == lzma.FORMAT_AUTO and filters is None:
+                self.raw = TailingDecompressReader(
+                    self._fp,
+                    AutoDecompressor,
+                    trailing_error=lzma.LZMAError,
+                    tail=self._tail,
+                )
+                self._parallel = not self._tail
+            else:
+                self.raw = TailingDecompressReader(
+                    self._fp,
+                    lzma.LZMADecompressor,
+                    trailing_error=lzma.LZMAError,
+                    format=format,
+                    filters=filters,
+                    tail=self._tail,
+                )
+            self._buffer = io.BufferedReader(self.raw)
+
+    @property
+    def name(self):
+        return getattr(self._fp, "name", None)
+
+    @property
+    def codec(self):
+        """Codec of the stream that was read last or None if unknown."""
+        decompressor = getattr(self.raw, "_decompressor", None)
+        return getattr(decompressor, "codec", getattr(self.raw, "codec", None))
+
+    def _check_can_read(self):
+        super(CompressedFile, self)._check_can_read()
+        if self._parallel:
+            self._parallel = False
+            self._start_parallel()
+
+    def _start_parallel(self):
+        """Switch to parallel decompression if the file is a large
+        regular compressed log file that has not been read yet.
+        """
+        jobs = self._jobs
+        if jobs is None:
+            jobs = settings.read_jobs
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        if jobs < 2 or not isinstance(self.name, str):
+            return
+
+        try:
+            if self._fp.tell() != 0:
+                return
+            size = os.fstat(self._fp.fileno()).st_size
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return
+
+        if size < self.parallel_min_size:
+            return
+
+        header = self._fp.read(8)
+        self._fp.seek(0)
+        for codec in codecs.values():
+            if codec.magic and codec.match(header):
+                break
+        else:
+            return
+
+        chunks = self._chunks(size)
+        if chunks is None or len(chunks) < 2:
+            return
+
+        self.raw = ParallelDecompressReader(
+            self.name, chunks, min(jobs, len(chunks)), codec=codec
+        )
+        self._buffer = io.BufferedReader(self.raw)
+
+    def _chunks(self, size):
+        """Return list of (offset, size) chunks of complete
+        compressed streams using the block index of the log file
+        or, for xz streams, by locating stream boundaries.
+
+        :param size: file size
+        """
+        chunks = []
+        index = self.index()
+
+        if index is not None and index.blocks:
+            start, end, usize = 0, 0, 0
+            for block in index.blocks:
+                if block["offset"] != end:
+                    return None
+                end = block["offset"] + block["size"]
+                usize += block["usize"]
+                if usize >= self.chunk_size:
+                    chunks.append((start, end - start))
+                    start, usize = end, 0
+            if size > start:
+                chunks.append((start, size - start))
+            return chunks
+
+        if not LZMACodec.match(self._fp.read(len(LZMACodec.magic))):
+            self._fp.seek(0)
+            return None
+        self._fp.seek(0)
+
+        with mmap.mmap(self._fp.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start = 0
+            while True:
+                boundary = data.find(
+                    self.xz_stream_boundary, start + self.compressed_chunk_size
+                )
+                if boundary < 0:
+                    break
+                end = boundary + 2
+                chunks.append((start, end - start))
+                start = end
+        chunks.append((start, size - start))
+        return chunks
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """Seek to the offset in the uncompressed data.
+        If the file is decompressed in parallel then it falls back
+        to sequential decompression of the file as the parallel
+        reader can only read the file once from the start.
+        """
+        self._parallel = False
+        if isinstance(self.raw, ParallelDecompressReader):
+            if whence == io.SEEK_CUR:
+                offset, whence = self.tell() + offset, io.SEEK_SET
+            self.raw.close()
+            self._fp.seek(0)
             self.raw = TailingDecompressReader(
                 self._fp,
-                lzma.LZMADecompressor,
+                AutoDecompressor,
                 trailing_error=lzma.LZMAError,
-                format=format,
-                filters=filters,
-                tail=self._tail,
+                tail=False,
             )
             self._buffer = io.BufferedReader(self.raw)
+        return super(CompressedFile, self).seek(offset, whence)
 
-    @property
-    def name(self):
-        return getattr(self._fp, "name", None)
+    def select(self, blocks):
+        """Only read the specified blocks of the log file.
+
+        :param blocks: list of block index records
+        """
+        self._parallel = False
+        self._check_can_read()
+        self._fp = BlockFile(self._fp, blocks)
+        self.raw = TailingDecompressReader(
+            self._fp,
+            AutoDecompressor,
+            trailing_error=lzma.LZMAError,
+            tail=False,
+        )
+        self._buffer = io.BufferedReader(self.raw)
+
+    def select_ranges(self, ranges):
+        """Only read the specified byte ranges of the uncompressed
+        data of the log file. Uncompressed log files are read
+        by seeking to each range. For compressed log files, only
+        the blocks that contain the ranges are decompressed
+        if the log file has a block index and the data
+        before each range is skipped otherwise.
+
+        :param ranges: sorted list of non-overlapping (offset, size) tuples
+        """
+        self._parallel = False
+        self._check_can_read()
+
+        index = self.index()
+        selected = None
+        if index is not None and index.blocks:
+            selected = index.select_ranges(ranges)
+
+        if selected is not None:
+            blocks, ranges = selected
+            self.select(blocks)
+        elif self._fp.seekable():
+            header = self._fp.read(1)
+            self._fp.seek(0)
+            if NoneCodec.match(header):
+                self._fp = RangeFile(self._fp, ranges)
+                self.raw = TailingDecompressReader(
+                    self._fp,
+                    AutoDecompressor,
+                    trailing_error=lzma.LZMAError,
+                    tail=False,
+                )
+                self._buffer = io.BufferedReader(self.raw)
+                return
+
+        # detach the reader so that it is not closed with the replaced buffer
+        self._buffer = io.BufferedReader(RangeFile(self._buffer.detach(), ranges))
+
+    def seek_test(self, pattern=None, test_ids=None, exact=False):
+        """Seek to the messages of the tests whose name matches
+        the pattern or that have the specified ids.
+
+        If the log file has a log index (see `testflows._core.log_index`),
+        only the messages of the tests whose name matches the pattern
+        are read. Otherwise, the block index of the log file is used
+        so that only the blocks that contain the tests,
+        including their sub-tests, are decompressed.
+
+        Returns False if the log file does not have an index.
+
+        :param pattern: test name regex pattern, default: None
+        :param test_ids: test ids, default: None
+        :param exact: pattern must match the whole test name, default: False
+        """
+        if pattern is not None and not test_ids:
+            log_index = self.log_index()
+            if log_index is not None:
+                with log_index:
+                    self.select_ranges(log_index.ranges(pattern, exact=exact))
+                return True
+
+        index = self.index()
+        if index is None:
+            return False
+        if pattern is not None:
+            test_ids = index.test_ids(pattern) | set(test_ids or [])
+        self.select(index.select(test_ids=test_ids))
+        return True
+
+    def seek_time(self, start_time=None, end_time=None):
+        """Seek to the messages within the specified time range using
+        the block index of the log file so that only the blocks
+        that contain the time range are decompressed.
+
+        Returns False if the log file does not have a block index.
+
+        :param start_time: start time, default: None
+        :param end_time: end time, default: None
+        """
+        index = self.index()
+        if index is None:
+            return False
+        self.select(index.select(start_time=start_time, end_time=end_time))
+        return True
+
+    def index(self):
+        """Return block index of the log file or None
+        if the file does not have one.
+        """
+        if self._tail or not isinstance(self.name, str):
+            return None
+        return BlockIndex.load(self.name)
+
+    def log_index(self):
+        """Return log index of the log file or None
+        if the file does not have one.
+        """
+        if self._tail or not isinstance(self.name, str):
+            return None
+        return LogIndex.load(self.name)
 
     def read(self, size=-1):
         self._check_can_read()
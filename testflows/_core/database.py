@@ -0,0 +1,117 @@
+# Copyright 2024 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+
+from argparse import ArgumentTypeError
+
+import testflows.settings as settings
+
+from testflows._core.cli.arg.type import key_value as key_value_type
+from testflows._core.compress import CompressedFile
+from testflows._core.transform.log.pipeline import QueryLogPipeline
+from testflows._core.transform.log.query import Loader
+
+#: default database file
+default_file = "testflows.db"
+#: database handler options
+options = ("file",)
+#: number of rows inserted in one transaction
+batch_size = 8192
+#: maximum time in seconds before pending rows are committed
+commit_interval = 1.0
+#: time in seconds to wait for the database that is locked
+#: by another writer
+busy_timeout = 60.0
+
+
+def option_type(value):
+    """Database handler option type."""
+    option = key_value_type(value)
+    if option.key not in options:
+        raise ArgumentTypeError(
+            f"unknown option '{option.key}', valid options: {', '.join(options)}"
+        )
+    return option
+
+
+def argparser(parser):
+    """Add database handler options to the argument parser.
+
+    :param parser: argument parser
+    """
+    parser.add_argument(
+        "--database",
+        dest="_database",
+        metavar="name=value",
+        nargs="*",
+        help=f"""database output handler options, default handler: built-in SQLite.
+            The following options can be specified:
+                'file=<path>' database file, default: '{default_file}'.
+            For example: '--database file=results.db'
+            or just '--database' to use the default file
+            """,
+        type=option_type,
+        required=False,
+    )
+
+
+def connect(filename):
+    """Connect to the database file and enable
+    write-ahead logging so that readers do not block the writer.
+
+    :param filename: database file name
+    """
+    try:
+        import sqlite3
+    except ImportError:
+        raise RuntimeError("sqlite3 module is not available")
+
+    conn = sqlite3.connect(filename, timeout=busy_timeout)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def database_handler():
+    """Handler to write output messages to the SQLite database.
+    Used when the `testflows.database` package is not installed.
+
+    Each test program run is added to the database file as a new run
+    using the same tables as the `tfs query` command
+    (see `testflows._core.transform.log.query`) so that the results
+    of all the runs can be queried using
+    `tfs query --database <file> "<query>"`.
+    """
+    values = {option.key: option.value for option in settings.database}
+    unknown = [key for key in values if key not in options]
+    if unknown:
+        raise ValueError(
+            f"unknown database option(s): {', '.join(unknown)},"
+            f" valid options: {', '.join(options)}"
+        )
+    filename = values.get("file", default_file)
+
+    conn = connect(filename)
+    try:
+        loader = Loader(conn, batch=batch_size, interval=commit_interval)
+        run = loader.add_run(os.path.abspath(settings.read_logfile))
+
+        with CompressedFile(settings.read_logfile, tail=True) as log:
+            log.seek(0)
+            QueryLogPipeline(log, loader, run, tail=True).run()
+
+        loader.close()
+    finally:
+        conn.close()
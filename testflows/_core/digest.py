@@ -0,0 +1,71 @@
+# Copyright 2024 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import zlib
+import hashlib
+
+
+class crc32(object):
+    """CRC-32 message hash with a hashlib compatible interface.
+
+    :param data: bytes, default: b""
+    """
+
+    name = "crc32"
+    digest_size = 4
+
+    def __init__(self, data=b""):
+        self.value = zlib.crc32(data)
+
+    def update(self, data):
+        self.value = zlib.crc32(data, self.value)
+
+    def digest(self):
+        return self.value.to_bytes(self.digest_size, "big")
+
+    def hexdigest(self):
+        return f"{self.value:08x}"
+
+
+def blake2b(data=b""):
+    """BLAKE2b message hash with a small (8 bytes) digest.
+
+    :param data: bytes, default: b""
+    """
+    return hashlib.blake2b(data, digest_size=8)
+
+
+#: message hash functions, where None means that individual
+#: messages are not hashed and for 'block' log integrity relies
+#: on the checksum of each compressed block of messages
+hash_funcs = {
+    "sha1": hashlib.sha1,
+    "blake2b": blake2b,
+    "crc32": crc32,
+    "block": None,
+    "none": None,
+}
+
+
+def get_hash_func(name):
+    """Return message hash function by name.
+
+    :param name: hash name
+    """
+    try:
+        return hash_funcs[name]
+    except KeyError:
+        raise ValueError(
+            f"unknown hash '{name}', valid values are: {', '.join(hash_funcs)}"
+        ) from None
@@ -0,0 +1,316 @@
+# Copyright 2024 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import re
+import json
+
+from .message import compact_keys
+
+#: block index sidecar file extension
+extension = ".idx"
+
+#: message time and test id of a message
+message_re = re.compile(
+    rb'^\{"message_keyword":"[A-Z]+",.*?,"message_time":([^,]+),.*?,"test_id":"([^"]*)"'
+)
+#: message time, test handle and optional
+#: test prefix of a compact (TFSPv3) message
+compact_message_re = re.compile(
+    rb'^\["[A-Z]+","[^"]*",\d+,\d+,(?:null|"(?:[^"\\]|\\.)*"),\d+,([^,]+),[^,]+,"([^"]+)",(\{"0":)?'
+)
+#: test name of a message
+test_name_re = re.compile(rb',"test_name":("(?:[^"\\]|\\.)*")')
+
+
+def filename(logfile):
+    """Return block index file name of the log file.
+
+    :param logfile: log file name
+    """
+    return f"{logfile}{extension}"
+
+
+class BlockIndexer(object):
+    """Collects metadata of each block of messages
+    that is written to the log file by the log writer.
+    """
+
+    def __init__(self):
+        self.tests = set()
+        # compact protocol test handles
+        self.handles = {}
+
+    def meta(self, lines):
+        """Return block metadata.
+
+        :param lines: list of serialized messages (bytes)
+        """
+        start_time = None
+        end_time = None
+        tests = set()
+        names = {}
+
+        for line in lines:
+            if line[:1] == b"[":
+                match = compact_message_re.match(line)
+                if match is None:
+                    continue
+                msg_time, handle, prefix = match.groups()
+                if prefix is not None:
+                    payload = json.loads(line[match.start(3) : line.rindex(b"]")])
+                    test_id = payload[compact_keys["test_id"]]
+                    self.handles[handle] = test_id
+                    if test_id not in self.tests:
+                        self.tests.add(test_id)
+                        names[test_id] = payload[compact_keys["test_name"]]
+                else:
+                    test_id = self.handles.get(handle)
+                    if test_id is None:
+                        continue
+            else:
+                match = message_re.match(line)
+                if match is None:
+                    continue
+                msg_time, test_id = match.groups()
+                test_id = test_id.decode("utf-8")
+                if test_id not in self.tests:
+                    self.tests.add(test_id)
+                    name = test_name_re.search(line, match.end())
+                    if name is not None:
+                        names[test_id] = json.loads(name.group(1))
+
+            tests.add(test_id)
+            msg_time = float(msg_time)
+            if start_time is None or msg_time < start_time:
+                start_time = msg_time
+            if end_time is None or msg_time > end_time:
+                end_time = msg_time
+
+        return {
+            "messages": len(lines),
+            "usize": sum(len(line) for line in lines),
+            "start_time": start_time,
+            "end_time": end_time,
+            "tests": tests,
+            "names": names,
+        }
+
+
+class BlockIndex(object):
+    """Log file block index.
+
+    Each block record has the following fields:
+
+    * offset: block byte offset in the log file
+    * size: compressed block size in bytes
+    * uoffset: uncompressed offset of the block
+    * usize: uncompressed block size in bytes
+    * first: number of the first message in the block
+    * last: number of the last message in the block
+    * start_time: time of the earliest message in the block
+    * end_time: time of the latest message in the block
+    * tests: numbers of the tests that have messages in the block
+    * new_tests: list of [test id, test name] of the tests that
+      first appear in the block in the order of their numbers
+
+    :param blocks: list of block records
+    """
+
+    def __init__(self, blocks):
+        self.blocks = blocks
+        self.tests = []
+        self.names = {}
+        # number of the block where each test first appears
+        self.first_blocks = []
+        for i, block in enumerate(self.blocks):
+            for test_id, name in block["new_tests"]:
+                self.tests.append(test_id)
+                self.names[test_id] = name
+                self.first_blocks.append(i)
+
+    @classmethod
+    def load(cls, logfile):
+        """Load block index of the log file.
+        Returns None if log file does not have an index.
+
+        :param logfile: log file name
+        """
+        try:
+            with open(filename(logfile), "r", encoding="utf-8") as fd:
+                blocks = []
+                for line in fd:
+                    if not line.endswith("\n"):
+                        break
+                    blocks.append(json.loads(line))
+        except FileNotFoundError:
+            return None
+        return cls(blocks)
+
+    def test_ids(self, pattern):
+        """Return ids of the tests whose name matches the pattern.
+
+        :param pattern: test name regex pattern
+        """
+        pattern = re.compile(pattern)
+        return {
+            test_id
+            for test_id, name in self.names.items()
+            if name is not None and pattern.match(name)
+        }
+
+    def select(self, test_ids=None, start_time=None, end_time=None):
+        """Return blocks that contain messages of the specified tests,
+        including their sub-tests, within the specified time range.
+        The first block is always selected as it contains
+        protocol and version messages. The blocks where the tests
+        of the selected blocks first appear are also selected,
+        recursively, as in compact (TFSPv3) logs only the first message
+        of a test has the test prefix that is needed to decode
+        its other messages.
+
+        :param test_ids: test ids, default: None (all tests)
+        :param start_time: start time, default: None
+        :param end_time: end time, default: None
+        """
+        if test_ids is not None:
+            test_ids = set(test_ids)
+            prefixes = tuple(test_id + "/" for test_id in test_ids)
+            tests = {
+                num
+                for num, test_id in enumerate(self.tests)
+                if test_id in test_ids or test_id.startswith(prefixes)
+            }
+
+        selected = set()
+        for i, block in enumerate(self.blocks):
+            if i > 0:
+                if start_time is not None and (
+                    block["end_time"] is None or block["end_time"] < start_time
+                ):
+                    continue
+                if end_time is not None and (
+                    block["start_time"] is None or block["start_time"] > end_time
+                ):
+                    continue
+                if test_ids is not None and tests.isdisjoint(block["tests"]):
+                    continue
+            selected.add(i)
+
+        pending = list(selected)
+        while pending:
+            for num in self.blocks[pending.pop()]["tests"]:
+                first_block = self.first_blocks[num]
+                if first_block not in selected:
+                    selected.add(first_block)
+                    pending.append(first_block)
+
+        return [self.blocks[i] for i in sorted(selected)]
+
+    def select_ranges(self, ranges):
+        """Return blocks that contain the specified byte ranges
+        of the uncompressed log together with the ranges translated
+        to the offsets in the uncompressed data of the selected blocks.
+        Returns None if the blocks do not cover the ranges.
+
+        :param ranges: sorted list of non-overlapping (offset, size) tuples
+        """
+        end = 0
+        for block in self.blocks:
+            if block.get("uoffset") != end:
+                return None
+            end += block["usize"]
+
+        selected = []
+        translated = []
+        # offsets of the selected blocks in their uncompressed data
+        offsets = {}
+        size = 0
+        i = 0
+
+        for offset, range_size in ranges:
+            while i < len(self.blocks) and (
+                self.blocks[i]["uoffset"] + self.blocks[i]["usize"] <= offset
+            ):
+                i += 1
+            j = i
+            while True:
+                if j >= len(self.blocks):
+                    return None
+                block = self.blocks[j]
+                if j not in offsets:
+                    offsets[j] = size
+                    size += block["usize"]
+                    selected.append(block)
+                if block["uoffset"] + block["usize"] >= offset + range_size:
+                    break
+                j += 1
+            translated.append(
+                (offsets[i] + offset - self.blocks[i]["uoffset"], range_size)
+            )
+
+        return selected, translated
+
+
+class BlockFile(object):
+    """Read-only file that only contains specified blocks
+    of the log file.
+
+    :param fp: log file object
+    :param blocks: list of block records
+    """
+
+    def __init__(self, fp, blocks):
+        self._fp = fp
+        self._blocks = [(block["offset"], block["size"]) for block in blocks]
+        self._block = 0
+        self._remaining = None
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            return b"".join(iter(lambda: self.read1(1 << 20), b""))
+        return self.read1(size)
+
+    def read1(self, size=-1):
+        while self._block < len(self._blocks):
+            offset, block_size = self._blocks[self._block]
+            if self._remaining is None:
+                self._fp.seek(offset)
+                self._remaining = block_size
+            if self._remaining > 0:
+                if size is None or size < 0:
+                    size = self._remaining
+                data = self._fp.read(min(size, self._remaining))
+                if data:
+                    self._remaining -= len(data)
+                    return data
+            self._block += 1
+            self._remaining = None
+        return b""
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if offset != 0 or whence != os.SEEK_SET:
+            raise OSError("only seeking to the start is supported")
+        self._block = 0
+        self._remaining = None
+        return 0
+
+    def close(self):
+        self._fp.close()
@@ -18,6 +18,7 @@ import glob
 import atexit
 import signal
 import threading
+import contextlib
 
 import testflows.settings as settings
 
@@ -36,6 +37,7 @@ from .transform.log.pipeline import FailsLogPipeline
 from .transform.log.pipeline import ManualLogPipeline
 from .transform.log.pipeline import QuietLogPipeline
 from .temp import glob as temp_glob, parser as temp_parser, dirname as temp_dirname
+from .io import LogWriter
 from .parallel import top
 from .objects import Error
 from .jupyter_notebook import is_jupyter_notebook
@@ -80,7 +82,7 @@ def cleanup():
             return True
 
     for file in glob.glob(os.path.join(temp_dirname(), temp_glob)):
-        match = temp_parser(extension="*").match(file)
+        match = temp_parser(extension=".+").match(file)
         if not match:
             continue
         pid = int(match.groupdict()["pid"])
@@ -95,12 +97,28 @@ def cleanup():
                 raise
 
 
+@contextlib.contextmanager
+def output_log():
+    """Open log that is read by the output handler.
+
+    If live output is enabled then messages are read directly
+    from the in-process message queue of the log writer
+    otherwise the log file is tailed.
+    """
+    if settings.live_output and LogWriter.instance.local_live is not None:
+        with LogWriter.instance.local_live.open() as log:
+            yield log
+    else:
+        with CompressedFile(settings.read_logfile, tail=True) as log:
+            log.seek(0)
+            yield log
+
+
 def stdout_raw_handler():
     """Handler to output messages to sys.stdout
     using "raw" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         RawLogPipeline(log, sys.stdout, tail=True).run()
 
 
@@ -108,8 +126,7 @@ def stdout_slick_handler():
     """Handler to output messages to sys.stdout
     using "slick" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         SlickLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
 
@@ -117,8 +134,7 @@ def stdout_classic_handler():
     """Handler to output messages to sys.stdout
     using "classic" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         ClassicLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
 
@@ -126,8 +142,7 @@ def stdout_fails_handler():
     """Handler to output messages to sys.stdout
     using "fails" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         FailsLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
 
@@ -135,8 +150,7 @@ def stdout_new_fails_handler():
     """Handler to output messages to sys.stdout
     using "fails" format that shows only new fails.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         FailsLogPipeline(
             log, sys.stdout, tail=True, only_new=True, show_input=False
         ).run()
@@ -146,8 +160,7 @@ def stdout_brisk_fails_handler():
     """Handler to output messages to sys.stdout
     using "fails" format with brisk dump.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         FailsLogPipeline(log, sys.stdout, tail=True, brisk=True, show_input=False).run()
 
 
@@ -155,8 +168,7 @@ def stdout_brisk_new_fails_handler():
     """Handler to output messages to sys.stdout
     using "fails" format that shows only new fails with brisk dump.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         FailsLogPipeline(
             log, sys.stdout, tail=True, brisk=True, only_new=True, show_input=False
         ).run()
@@ -166,8 +178,7 @@ def stdout_plain_fails_handler():
     """Handler to output messages to sys.stdout
     using "fails" format with plain dump.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         FailsLogPipeline(log, sys.stdout, tail=True, plain=True, show_input=False).run()
 
 
@@ -175,8 +186,7 @@ def stdout_plain_new_fails_handler():
     """Handler to output messages to sys.stdout
     using "fails" format that shows only new fails with plain dump.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         FailsLogPipeline(
             log, sys.stdout, tail=True, plain=True, only_new=True, show_input=False
         ).run()
@@ -186,8 +196,7 @@ def stdout_nice_fails_handler():
     """Handler to output messages to sys.stdout
     using "fails" format with nice dump.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         FailsLogPipeline(log, sys.stdout, tail=True, nice=True, show_input=False).run()
 
 
@@ -195,8 +204,7 @@ def stdout_nice_new_fails_handler():
     """Handler to output messages to sys.stdout
     using "fails" format that shows only new fails with nice dump.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         FailsLogPipeline(
             log, sys.stdout, tail=True, nice=True, only_new=True, show_input=False
         ).run()
@@ -206,8 +214,7 @@ def stdout_pnice_fails_handler():
     """Handler to output messages to sys.stdout
     using "fails" format with parallel nice dump.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         FailsLogPipeline(log, sys.stdout, tail=True, pnice=True, show_input=False).run()
 
 
@@ -215,8 +222,7 @@ def stdout_pnice_new_fails_handler():
     """Handler to output messages to sys.stdout
     using "fails" format that shows only new fails with parallel nice dump.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         FailsLogPipeline(
             log, sys.stdout, tail=True, pnice=True, only_new=True, show_input=False
         ).run()
@@ -226,8 +232,7 @@ def stdout_short_handler():
     """Handler to output messages to sys.stdout
     using "short" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         ShortLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
 
@@ -235,8 +240,7 @@ def stdout_nice_handler():
     """Handler to output messages to sys.stdout
     using "nice" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         NiceLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
 
@@ -244,8 +248,7 @@ def stdout_pnice_handler():
     """Handler to output messages to sys.stdout
     using "pnice" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         ParallelNiceLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
 
@@ -253,8 +256,7 @@ def stdout_brisk_handler():
     """Handler to output messages to sys.stdout
     using "brisk" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         BriskLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
 
@@ -262,8 +264,7 @@ def stdout_plain_handler():
     """Handler to output messages to sys.stdout
     using "plain" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         PlainLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
 
@@ -271,8 +272,7 @@ def stdout_manual_handler():
     """Handler to output messages to sys.stdout
     using "manual" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         ManualLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
 
@@ -280,8 +280,7 @@ def stdout_dots_handler():
     """Handler to output messages to sys.stdout
     using "dots" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         DotsLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
 
@@ -289,8 +288,7 @@ def stdout_progress_handler():
     """Handler to output messages to sys.stdout
     using "progress" format.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         ProgressLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
 
@@ -298,8 +296,7 @@ def stdout_quiet_handler():
     """Handler that prints no output to sys.stdout unless
     top level test fails.
     """
-    with CompressedFile(settings.read_logfile, tail=True) as log:
-        log.seek(0)
+    with output_log() as log:
         QuietLogPipeline(log, sys.stdout, tail=True, show_input=False).run()
 
 
@@ -336,10 +333,14 @@ def start_output_handler():
 
 
 def start_database_handler():
-    if not settings.database:
+    # empty list of options means that the default options are used
+    if settings.database is None:
         return
 
-    from testflows.database import database_handler
+    try:
+        from testflows.database import database_handler
+    except ImportError:
+        from .database import database_handler
 
     handler = threading.Thread(target=database_handler)
     handler.name = "tfs-database"
@@ -12,18 +12,26 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import os
+import json
 import time
+import heapq
+import logging
+import queue
+import itertools
 import threading
 
+from collections import deque
 from multiprocessing.dummy import Pool
 
 import testflows.settings as settings
 import testflows._core.tracing as tracing
 
-from .compress import compress
+from .compress import get_codec, AutoDecompressor
+from .index import BlockIndexer, filename as index_filename
 from .constants import id_sep, end_of_message
 from .exceptions import exception as get_exception
-from .message import Message, MessageObjectType, dumps
+from .message import Message, MessageObjectType, dumps, loads, compact_keys
 from .objects import Tag, ExamplesRow
 from . import __version__
 from .parallel.service import BaseServiceObject
@@ -52,6 +60,7 @@ class TestOutput(object):
     """
 
     protocol_version = "TFSPv2.1"
+    _keyword_fragments = {}
 
     def __init__(self, test, io):
         self.io = io
@@ -74,34 +83,22 @@ class TestOutput(object):
                 else None
             ),
         }
+        self.prefix_fragment = dumps(self.prefix)[1:-1]
 
-    def message(self, keyword, message, object_type=0, stream=None):
-        """Output message.
+    def message_level(self, keyword):
+        """Return message level.
 
         :param keyword: keyword
-        :param message: message
         """
-        msg_time = time.time()
+        if keyword in (Message.TEST, Message.RESULT, Message.PROTOCOL, Message.VERSION):
+            return len(self.test.id)
+        return len(self.test.id) + 1
 
-        msg = {
-            "message_keyword": str(keyword),
-            "message_hash": self.msg_hash,
-            "message_object": object_type,
-            "message_num": self.msg_count,
-            "message_stream": stream,
-            "message_level": (
-                len(self.test.id) + 1
-                if keyword
-                not in (Message.TEST, Message.RESULT, Message.PROTOCOL, Message.VERSION)
-                else len(self.test.id)
-            ),
-            "message_time": round(msg_time, settings.time_resolution),
-            "message_rtime": round(
-                msg_time - self.test.start_time, settings.time_resolution
-            ),
-        }
-        msg.update(self.prefix)
+    def filter_secrets(self, message):
+        """Filter secrets from message fields.
 
+        :param message: message
+        """
         if settings.secrets_registry:
             if not settings.secrets_registry.is_empty():
                 if "message" in message and message["message"]:
@@ -121,19 +118,63 @@ class TestOutput(object):
                         message["argument_value"]
                     )
 
-        msg.update(message)
-        self.test.tracer.debug("test message", extra={"test_message": msg})
+    def keyword_fragment(self, keyword):
+        """Return serialized message keyword fragment.
 
-        msg = dumps(msg)
-
-        self.msg_hash = settings.hash_func(msg.encode("utf-8")).hexdigest()[
-            : settings.hash_length
-        ]
+        :param keyword: keyword
+        """
+        fragment = self._keyword_fragments.get(keyword)
+        if fragment is None:
+            fragment = f'{{"message_keyword":{dumps(str(keyword))},"message_hash":"'
+            self._keyword_fragments[keyword] = fragment
+        return fragment
+
+    def write_message(self, head, tail):
+        """Hash and write message that is assembled from
+        the head and tail fragments which surround the message hash.
+
+        :param head: message fragment before the hash
+        :param tail: message fragment after the hash
+        """
+        if settings.hash_func is not None:
+            self.msg_hash = settings.hash_func(
+                f"{head}{self.msg_hash}{tail}".encode("utf-8")
+            ).hexdigest()[: settings.hash_length]
         self.msg_count += 1
+        self.io.write(f"{head}{self.msg_hash}{tail}{end_of_message}")
 
-        parts = msg.split(",", 2)
-        parts[1] = f'"message_hash":"{self.msg_hash}"'
-        self.io.write(f"{parts[0]},{parts[1]},{parts[2]}{end_of_message}")
+    def message(self, keyword, message, object_type=0, stream=None):
+        """Output message.
+
+        :param keyword: keyword
+        :param message: message
+        """
+        msg_time = time.time()
+
+        self.filter_secrets(message)
+
+        if message.keys() & self.prefix.keys():
+            fields = dumps({**self.prefix, **message})[1:-1]
+        elif message:
+            fields = f"{self.prefix_fragment},{dumps(message)[1:-1]}"
+        else:
+            fields = self.prefix_fragment
+
+        head = self.keyword_fragment(keyword)
+        tail = (
+            f'","message_object":{int(object_type)},"message_num":{self.msg_count},'
+            f'"message_stream":{dumps(stream)},"message_level":{self.message_level(keyword)},'
+            f'"message_time":{round(msg_time, settings.time_resolution)!r},'
+            f'"message_rtime":{round(msg_time - self.test.start_time, settings.time_resolution)!r},'
+            f"{fields}}}"
+        )
+        if self.test.tracer.isEnabledFor(logging.DEBUG):
+            self.test.tracer.debug(
+                "test message",
+                extra={"test_message": loads(f"{head}{self.msg_hash}{tail}")},
+            )
+
+        self.write_message(head, tail)
 
     def stop(self):
         """Output stop message."""
@@ -141,7 +182,10 @@ class TestOutput(object):
 
     def protocol(self):
         """Output protocol version message."""
-        msg = {"protocol_version": self.protocol_version}
+        msg = {
+            "protocol_version": self.protocol_version,
+            "protocol_hash": settings.hash_name,
+        }
         self.message(Message.PROTOCOL, msg)
 
     def version(self):
@@ -296,6 +340,81 @@ class TestOutput(object):
         self.message(Message.TRACE, msg)
 
 
+class CompactTestOutput(TestOutput):
+    """Compact test output protocol (TFSPv3).
+
+    Test prefix is only included in the first message
+    of the test and later messages refer to it using
+    test handle. Message fields are stored by position
+    and payload keys are replaced using the compact field table.
+
+    :param io: message IO
+    """
+
+    protocol_version = "TFSPv3"
+    _keyword_fragments = {}
+    _handle_counter = itertools.count()
+
+    def __init__(self, test, io):
+        super(CompactTestOutput, self).__init__(test, io)
+        self.handle = f"{os.getpid():x}.{next(self._handle_counter):x}"
+        self.prefix_sent = False
+        self.compact_prefix = {compact_keys.get(k, k): v for k, v in self.prefix.items()}
+        self.prefix_fragment = dumps(self.compact_prefix)[1:-1]
+
+    def keyword_fragment(self, keyword):
+        """Return serialized message keyword fragment.
+
+        :param keyword: keyword
+        """
+        fragment = self._keyword_fragments.get(keyword)
+        if fragment is None:
+            fragment = f'[{dumps(str(keyword))},"'
+            self._keyword_fragments[keyword] = fragment
+        return fragment
+
+    def message(self, keyword, message, object_type=0, stream=None):
+        """Output message.
+
+        :param keyword: keyword
+        :param message: message
+        """
+        msg_time = time.time()
+
+        self.filter_secrets(message)
+
+        payload = {compact_keys.get(k, k): v for k, v in message.items()}
+
+        if self.prefix_sent:
+            fields = dumps(payload)
+        elif payload.keys() & self.compact_prefix.keys():
+            fields = dumps({**self.compact_prefix, **payload})
+            self.prefix_sent = True
+        else:
+            fields = (
+                f"{{{self.prefix_fragment},{dumps(payload)[1:]}"
+                if payload
+                else f"{{{self.prefix_fragment}}}"
+            )
+            self.prefix_sent = True
+
+        head = self.keyword_fragment(keyword)
+        tail = (
+            f'",{int(object_type)},{self.msg_count},{dumps(stream)},'
+            f"{self.message_level(keyword)},"
+            f"{round(msg_time, settings.time_resolution)!r},"
+            f"{round(msg_time - self.test.start_time, settings.time_resolution)!r},"
+            f'"{self.handle}",{fields}]'
+        )
+        if self.test.tracer.isEnabledFor(logging.DEBUG):
+            self.test.tracer.debug(
+                "test message",
+                extra={"test_message": loads(f"{head}{self.msg_hash}{tail}")},
+            )
+
+        self.write_message(head, tail)
+
+
 class TestInput(object):
     """Test input."""
 
@@ -309,7 +428,10 @@ class TestIO(object):
 
     def __init__(self, test):
         self.io = MessageIO(LogIO())
-        self.output = TestOutput(test, self.io)
+        if settings.protocol == "v3":
+            self.output = CompactTestOutput(test, self.io)
+        else:
+            self.output = TestOutput(test, self.io)
         self.input = TestInput(test, self.io)
 
     def message_io(self, name=None):
@@ -428,16 +550,61 @@ class NamedMessageIO(MessageIO):
 
 
 class ProtectedFile:
-    """Thread lock wrapped file descriptor."""
+    """Thread lock wrapped file descriptor.
 
-    def __init__(self, fd):
+    :param fd: file descriptor
+    :param index: block index file descriptor, default: None
+    """
+
+    def __init__(self, fd, index=None):
         self.fd = fd
+        self.index = index
+        self.uoffset = 0
+        self.messages = 0
+        self.tests = {}
         self.lock = threading.Lock()
 
     def write(self, *args, **kwargs):
         with self.lock:
             return self.fd.write(*args, **kwargs)
 
+    def write_block(self, data, meta):
+        """Write compressed block of messages and
+        add it to the block index.
+
+        :param data: compressed block
+        :param meta: block metadata
+        """
+        with self.lock:
+            offset = self.fd.tell()
+            written = self.fd.write(data)
+            if self.index is not None:
+                tests = []
+                new_tests = []
+                for test_id in meta["tests"]:
+                    num = self.tests.get(test_id)
+                    if num is None:
+                        num = self.tests[test_id] = len(self.tests)
+                        new_tests.append([test_id, meta["names"].get(test_id)])
+                    tests.append(num)
+                record = {
+                    "offset": offset,
+                    "size": len(data),
+                    "uoffset": self.uoffset,
+                    "usize": meta["usize"],
+                    "first": self.messages,
+                    "last": self.messages + meta["messages"] - 1,
+                    "start_time": meta["start_time"],
+                    "end_time": meta["end_time"],
+                    "tests": sorted(tests),
+                    "new_tests": new_tests,
+                }
+                self.index.write(dumps(record) + "\n")
+                self.index.flush()
+            self.uoffset += meta["usize"]
+            self.messages += meta["messages"]
+            return written
+
     def read(self, *args, **kwargs):
         with self.lock:
             return self.fd.read(*args, **kwargs)
@@ -448,6 +615,8 @@ class ProtectedFile:
 
     def close(self, *args, **kwargs):
         with self.lock:
+            if self.index is not None:
+                self.index.close()
             return self.fd.close(*args, **kwargs)
 
     def tell(self, *args, **kwargs):
@@ -459,6 +628,220 @@ class ProtectedFile:
             return self.fd.seek(*args, **kwargs)
 
 
+class LogSegment(object):
+    """Log segment file written by a worker process
+    that is read by the log segments merger.
+
+    :param filename: segment file name
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.fd = None
+        self.index = None
+        self.buffer = b""
+        # test ids and names in the order of segment test numbers
+        self.tests = []
+        self.names = {}
+
+    def read(self):
+        """Return list of (data, meta) of the new complete blocks."""
+        if self.index is None:
+            try:
+                self.index = open(index_filename(self.filename), "rb")
+                self.fd = open(self.filename, "rb")
+            except FileNotFoundError:
+                self.close()
+                return []
+
+        self.buffer += self.index.read()
+        lines = self.buffer.split(b"\n")
+        # last line is incomplete
+        self.buffer = lines.pop()
+
+        blocks = []
+        for line in lines:
+            record = json.loads(line)
+            for test_id, name in record["new_tests"]:
+                self.tests.append(test_id)
+                self.names[test_id] = name
+            tests = [self.tests[num] for num in record["tests"]]
+            self.fd.seek(record["offset"])
+            data = self.fd.read(record["size"])
+            meta = {
+                "messages": record["last"] - record["first"] + 1,
+                "usize": record["usize"],
+                "start_time": record["start_time"],
+                "end_time": record["end_time"],
+                "tests": tests,
+                "names": {test_id: self.names.get(test_id) for test_id in tests},
+            }
+            blocks.append((data, meta))
+        return blocks
+
+    def close(self):
+        if self.index is not None:
+            self.index.close()
+            self.index = None
+        if self.fd is not None:
+            self.fd.close()
+            self.fd = None
+
+    def remove(self):
+        """Close and remove segment files."""
+        self.close()
+        for filename in (self.filename, index_filename(self.filename)):
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                pass
+
+
+class LogSegments(object):
+    """Log segments written locally by the worker processes
+    that are merged into the log file by the parent process.
+
+    Workers write compressed blocks into their own segment
+    files instead of sending each block to the parent.
+    New complete blocks of all segments are merged with the blocks
+    of the parent in message time order on each flush of the parent
+    and when requested by a worker at the end of a remote test.
+
+    :param fd: log file
+    :param prefix: segment file name prefix
+    :param live: live message queue, default: None
+    """
+
+    def __init__(self, fd, prefix, live=None):
+        self.fd = fd
+        self.prefix = prefix
+        self.live = live
+        self.segments = {}
+        self.lock = threading.Lock()
+
+    def open(self, pid):
+        """Open new segment for the worker process
+        and return segment file name.
+
+        :param pid: worker process id
+        """
+        filename = f"{self.prefix}.{pid}"
+        with self.lock:
+            if filename not in self.segments:
+                self.segments[filename] = LogSegment(filename)
+        return filename
+
+    def merge(self, blocks=None):
+        """Merge new blocks of all segments with the blocks
+        of the parent, if any, into the log file.
+
+        :param blocks: list of (data, meta) of the parent blocks, default: None
+        """
+        with self.lock:
+            sources = [[(data, meta, False) for data, meta in blocks or []]]
+            for segment in self.segments.values():
+                sources.append([(data, meta, True) for data, meta in segment.read()])
+
+            written = False
+            for data, meta, from_segment in heapq.merge(
+                *sources, key=lambda block: block[1]["start_time"] or 0
+            ):
+                self.fd.write_block(data, meta)
+                written = True
+                if from_segment and self.live is not None:
+                    self.live.put(AutoDecompressor().decompress(data).decode("utf-8"))
+
+            if written:
+                self.fd.flush()
+
+    def close(self):
+        """Close and remove all segments."""
+        with self.lock:
+            for segment in self.segments.values():
+                segment.remove()
+            self.segments = {}
+
+
+class MessageQueue(object):
+    """Bounded in-process queue of serialized messages
+    that is used to pass messages from the log writer
+    directly to the output handler.
+
+    :param maxsize: maximum number of queued chunks, default: 10000
+    """
+
+    def __init__(self, maxsize=10000):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.closed = False
+
+    def put(self, data):
+        """Put one or more serialized messages into the queue.
+        Blocks while the queue is full unless the queue is closed.
+
+        :param data: one or more messages each terminated by a new line
+        """
+        while not self.closed:
+            try:
+                self.queue.put(data, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def get(self):
+        return self.queue.get()
+
+    def open(self):
+        """Open queue for reading and return queue reader."""
+        self.closed = False
+        return MessageQueueReader(self)
+
+    def close(self):
+        """Close queue and discard any unread messages."""
+        self.closed = True
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+
+
+class MessageQueueReader(object):
+    """File-like reader of the message queue.
+
+    :param queue: message queue
+    """
+
+    def __init__(self, queue):
+        self.queue = queue
+        self.lines = deque()
+
+    def readline(self):
+        while not self.lines:
+            data = self.queue.get()
+            if data.count("\n") == 1:
+                self.lines.append(data)
+            else:
+                self.lines.extend(
+                    f"{line}\n" for line in data.split("\n")[:-1] if line
+                )
+        return self.lines.popleft()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.readline()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def close(self):
+        self.queue.close()
+
+
 class LogReader(object):
     """Read messages from the log."""
 
@@ -494,22 +877,60 @@ class LogReader(object):
 
 
 class LogWriter(object):
-    """Singleton log file writer."""
+    """Singleton log file writer.
+
+    Messages are appended to the current buffer that is swapped
+    with an empty one on each flush so that the buffered messages
+    are compressed by the flushing thread without holding the lock
+    needed by `write()`.
+
+    In worker processes, blocks are written into a local log segment
+    that is merged into the log file by the parent process.
+    """
 
     lock = threading.Lock()
     instance = None
     auto_flush_interval = 0.15
+    max_block_size = 1048576
 
     def __new__(cls, *args, **kwargs):
         fd = kwargs.pop("fd", None)
+        live = kwargs.pop("live", None)
+        segments = kwargs.pop("segments", None)
 
         with cls.lock:
             if not cls.instance:
                 self = object.__new__(LogWriter)
+                if segments is not None:
+                    # worker writes its own segment of the log
+                    filename = segments.open(os.getpid())
+                    fd = ProtectedFile(
+                        open(filename, "ab", buffering=0),
+                        index=open(index_filename(filename), "a", encoding="utf-8"),
+                    )
                 self.fd = fd or ProtectedFile(
-                    open(settings.write_logfile, "ab", buffering=0)
+                    open(settings.write_logfile, "ab", buffering=0),
+                    index=open(
+                        index_filename(settings.write_logfile), "a", encoding="utf-8"
+                    ),
                 )
+                self.indexer = BlockIndexer()
+                # messages are passed to a remote live queue once per flush
+                # while local live queue gets each message as soon as it is written
+                self.live = live
+                self.local_live = None
+                if fd is None and settings.live_output:
+                    self.local_live = MessageQueue()
+                self.segments = segments
+                if fd is None:
+                    self.segments = LogSegments(
+                        self.fd,
+                        prefix=f"{settings.write_logfile}.segment",
+                        live=self.local_live,
+                    )
+                self.codec = get_codec(settings.log_codec)
                 self.lock = threading.Lock()
+                self.flush_lock = threading.Lock()
                 self.buffer = []
                 self.pool = Pool(1)
                 self.cancel = False
@@ -524,9 +945,32 @@ class LogWriter(object):
 
     def write(self, msg):
         with self.lock:
+            # put into live queue under the same lock so that
+            # the order of messages is the same as in the log file
+            if self.local_live is not None:
+                self.local_live.put(msg)
             self.buffer.append(msg.encode("utf-8"))
             return len(msg)
 
+    def blocks(self, buffer):
+        """Split buffered messages into blocks that are
+        at most `max_block_size` bytes long so that readers can
+        use the block index to decompress only the blocks they need.
+
+        :param buffer: list of messages
+        """
+        block = []
+        size = 0
+        for msg in buffer:
+            if block and size + len(msg) > self.max_block_size:
+                yield block
+                block = []
+                size = 0
+            block.append(msg)
+            size += len(msg)
+        if block:
+            yield block
+
     def flush(self, force=False, final=False, sleep=None):
         if not force:
             return
@@ -534,15 +978,34 @@ class LogWriter(object):
         if sleep:
             time.sleep(sleep)
 
-        if self.cancel:
+        if self.cancel and not final:
             return
 
-        with self.lock:
+        with self.flush_lock:
+            if self.cancel and not final:
+                return
             self.cancel = True
-            if self.buffer:
-                self.fd.write(compress(b"".join(self.buffer)))
+
+            with self.lock:
+                buffer, self.buffer = self.buffer, []
+
+            blocks = [
+                (self.codec.compress(b"".join(block)), self.indexer.meta(block))
+                for block in self.blocks(buffer)
+            ]
+
+            if isinstance(self.segments, LogSegments):
+                self.segments.merge(blocks)
+            elif blocks:
+                for data, meta in blocks:
+                    self.fd.write_block(data, meta)
                 self.fd.flush()
-                del self.buffer[:]
+
+            if buffer and self.live is not None:
+                self.live.put(b"".join(buffer).decode("utf-8"))
+
+            if final:
+                tracer.debug(self.codec.stats())
 
             if not final and threading.main_thread().is_alive():
                 self.cancel = False
@@ -554,10 +1017,17 @@ class LogWriter(object):
         if final:
             self.pool.close()
             self.flush(force=True, final=True)
+            if isinstance(self.segments, LogSegments):
+                self.segments.close()
             self.fd.close()
             self.pool.join()
         elif flush:
             self.flush(force=True)
+            if self.segments is not None and not isinstance(
+                self.segments, LogSegments
+            ):
+                # make sure parent has merged the segment
+                self.segments.merge()
 
 
 class LogIO(object):
@@ -568,8 +1038,17 @@ class LogIO(object):
     """
 
     def __init__(self):
-        if isinstance(settings.write_logfile, BaseServiceObject):
-            self.writer = LogWriter(fd=settings.write_logfile)
+        if isinstance(settings.log_segments, BaseServiceObject):
+            self.writer = LogWriter(segments=settings.log_segments)
+        elif isinstance(settings.write_logfile, BaseServiceObject):
+            self.writer = LogWriter(
+                fd=settings.write_logfile,
+                live=(
+                    settings.live_output
+                    if isinstance(settings.live_output, BaseServiceObject)
+                    else None
+                ),
+            )
         else:
             self.writer = LogWriter()
 
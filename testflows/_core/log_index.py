@@ -0,0 +1,395 @@
+# Copyright 2024 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import os
+import re
+import json
+import urllib.parse
+
+from .name import parentname
+from .message import (
+    CompactMessageDecoder,
+    message_keyword_prefix,
+    compact_message_re,
+)
+
+#: log index file extension
+extension = ".db"
+#: log index format version, must be incremented
+#: when the schema of the index changes
+version = 1
+
+#: test id of a message
+test_id_re = re.compile(r',"test_id":"([^"]*)"')
+#: characters that have special meaning in a regex pattern
+special_chars = frozenset(".^$*+?{}[]\\|()")
+
+schema = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value
+);
+CREATE TABLE tests (
+    num INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT,
+    type TEXT,
+    subtype TEXT,
+    parent TEXT,
+    flags INTEGER,
+    result_type TEXT,
+    start_time REAL,
+    end_time REAL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    messages INTEGER NOT NULL,
+    tags TEXT NOT NULL
+);
+CREATE INDEX tests_name ON tests (name);
+CREATE INDEX tests_parent ON tests (parent);
+"""
+
+
+def filename(logfile):
+    """Return log index file name of the log file.
+
+    :param logfile: log file name
+    """
+    return f"{logfile}{extension}"
+
+
+def literal_prefix(pattern):
+    """Return literal prefix of the regex pattern
+    that every string matching the pattern starts with.
+
+    :param pattern: regex pattern
+    """
+    if "|" in pattern:
+        return ""
+    for i, c in enumerate(pattern):
+        if c in special_chars:
+            if c in "*?{":
+                # preceding character is optional
+                i -= 1
+            return pattern[: max(i, 0)]
+    return pattern
+
+
+class Indexer(object):
+    """Collects test records from the messages of the log.
+
+    Each test record has the following fields:
+
+    * num: number of the test in the order the tests first appear in the log
+    * id: test id
+    * name: test name
+    * type: test type
+    * subtype: test subtype
+    * parent: parent test id
+    * flags: test flags
+    * result_type: test result type
+    * start_time: time of the test message
+    * end_time: time of the result message
+    * start: byte offset of the first message of the test
+    * end: byte offset right after the last message of the test
+    * messages: number of messages of the test
+    * tags: list of tag values of the test
+
+    Byte offsets are offsets in the uncompressed log.
+    """
+
+    def __init__(self):
+        self.tests = {}
+        self.decode = CompactMessageDecoder().decode
+        # compact protocol test handles
+        self.handles = {}
+
+    def add(self, line, offset):
+        """Add message to the record of its test.
+
+        :param line: serialized message
+        :param offset: byte offset of the message
+        """
+        msg = None
+
+        if line.startswith(message_keyword_prefix):
+            start = len(message_keyword_prefix)
+            keyword = line[start : line.find('"', start)]
+            if keyword in ("TEST", "RESULT", "TAG"):
+                msg = json.loads(line)
+                test_id = msg["test_id"]
+            else:
+                match = test_id_re.search(line)
+                if match is None:
+                    return
+                test_id = match.group(1)
+        else:
+            match = compact_message_re.match(line)
+            if match is None:
+                return
+            keyword, handle, prefix = match.groups()
+            if prefix is not None or keyword in ("TEST", "RESULT", "TAG"):
+                msg = self.decode(line)
+                test_id = self.handles[handle] = msg["test_id"]
+            else:
+                test_id = self.handles.get(handle)
+                if test_id is None:
+                    return
+
+        end = offset + (len(line) if line.isascii() else len(line.encode("utf-8")))
+
+        test = self.tests.get(test_id)
+        if test is None:
+            test = self.tests[test_id] = {
+                "num": len(self.tests),
+                "id": test_id,
+                "name": None,
+                "type": None,
+                "subtype": None,
+                "parent": parentname(test_id).rstrip("/") or None,
+                "flags": None,
+                "result_type": None,
+                "start_time": None,
+                "end_time": None,
+                "start": offset,
+                "end": end,
+                "messages": 0,
+                "tags": [],
+            }
+
+        test["end"] = end
+        test["messages"] += 1
+
+        if msg is None:
+            return
+
+        if keyword == "TEST":
+            test["name"] = msg["test_name"]
+            test["type"] = msg["test_type"]
+            test["subtype"] = msg["test_subtype"]
+            test["flags"] = msg["test_flags"]
+            test["start_time"] = msg["message_time"]
+        elif keyword == "RESULT":
+            test["result_type"] = msg["result_type"]
+            test["end_time"] = msg["message_time"]
+        elif keyword == "TAG":
+            test["tags"].append(msg["tag_value"])
+
+
+def build(logfile, messages):
+    """Build log index of the log file and
+    return the number of indexed tests.
+
+    :param logfile: log file name
+    :param messages: iterable of (message, byte offset) tuples
+        of the uncompressed log
+    """
+    try:
+        import sqlite3
+    except ImportError:
+        raise RuntimeError("sqlite3 module is not available")
+
+    stat = os.stat(logfile)
+    indexer = Indexer()
+    for line, offset in messages:
+        indexer.add(line, offset)
+
+    index_file = filename(logfile)
+    tmp_file = f"{index_file}.tmp"
+    if os.path.exists(tmp_file):
+        os.remove(tmp_file)
+
+    conn = sqlite3.connect(tmp_file)
+    try:
+        with conn:
+            conn.executescript(schema)
+            conn.executemany(
+                "INSERT INTO meta VALUES (?, ?)",
+                [
+                    ("version", version),
+                    ("size", stat.st_size),
+                    ("mtime_ns", stat.st_mtime_ns),
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO tests VALUES (:num, :id, :name, :type, :subtype,"
+                " :parent, :flags, :result_type, :start_time, :end_time,"
+                " :start, :end, :messages, :tags)",
+                (
+                    dict(test, tags=json.dumps(test["tags"]))
+                    for test in indexer.tests.values()
+                ),
+            )
+    finally:
+        conn.close()
+
+    os.replace(tmp_file, index_file)
+    return len(indexer.tests)
+
+
+class LogIndex(object):
+    """Log index that is stored in an SQLite database
+    next to the log file and has one record per test
+    (see `Indexer`).
+
+    :param conn: database connection
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    @classmethod
+    def load(cls, logfile):
+        """Load log index of the log file.
+        Returns None if the log file does not have an index
+        or the index is out of date.
+
+        :param logfile: log file name
+        """
+        index_file = filename(logfile)
+        if not os.path.exists(index_file):
+            return None
+
+        try:
+            import sqlite3
+        except ImportError:
+            return None
+
+        try:
+            stat = os.stat(logfile)
+            conn = sqlite3.connect(
+                f"file:{urllib.parse.quote(index_file)}?mode=ro", uri=True
+            )
+        except (OSError, sqlite3.Error):
+            return None
+
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+        except sqlite3.Error:
+            meta = {}
+
+        if meta != {
+            "version": version,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }:
+            conn.close()
+            return None
+
+        return cls(conn)
+
+    def tests(self, pattern=None, exact=False, fields=("name", "start", "end")):
+        """Yield records of the tests whose name matches the pattern
+        in the order they first appear in the log.
+        Each record is a tuple of the specified fields.
+
+        :param pattern: test name regex pattern that must match
+            at the start of the test name, default: None (any)
+        :param exact: pattern must match the whole test name, default: False
+        :param fields: record fields, default: ("name", "start", "end")
+        """
+        columns = ", ".join(("name",) + tuple(fields))
+        query = f"SELECT {columns} FROM tests"
+        params = ()
+
+        if pattern is not None:
+            regex = re.compile(pattern)
+            match = regex.fullmatch if exact else regex.match
+            prefix = literal_prefix(pattern)
+            if prefix:
+                query += " WHERE name >= ?"
+                params = (prefix,)
+                try:
+                    params += (prefix[:-1] + chr(ord(prefix[-1]) + 1),)
+                    query += " AND name < ?"
+                except ValueError:
+                    pass
+
+        for row in self.conn.execute(query + " ORDER BY num", params):
+            if pattern is not None and (row[0] is None or match(row[0]) is None):
+                continue
+            yield row[1:]
+
+    def ranges(self, pattern, exact=False):
+        """Return sorted list of non-overlapping (offset, size) byte ranges
+        of the uncompressed log that contain all the messages
+        of the tests whose name matches the pattern.
+
+        :param pattern: test name regex pattern that must match
+            at the start of the test name
+        :param exact: pattern must match the whole test name, default: False
+        """
+        ranges = []
+        tests = self.tests(pattern, exact=exact, fields=("start", "end"))
+        for start, end in sorted(tests):
+            if ranges and start <= ranges[-1][1]:
+                ranges[-1][1] = max(ranges[-1][1], end)
+            else:
+                ranges.append([start, end])
+        return [(start, end - start) for start, end in ranges]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class RangeFile(io.RawIOBase):
+    """Read-only file that only contains the specified
+    byte ranges of a file.
+
+    :param fp: file object
+    :param ranges: sorted list of non-overlapping (offset, size) tuples
+    """
+
+    def __init__(self, fp, ranges):
+        self._fp = fp
+        self._ranges = list(ranges)
+        self._range = 0
+        self._remaining = None
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        data = self.read1(len(b))
+        b[: len(data)] = data
+        return len(data)
+
+    def read1(self, size=-1):
+        while self._range < len(self._ranges):
+            offset, range_size = self._ranges[self._range]
+            if self._remaining is None:
+                self._fp.seek(offset)
+                self._remaining = range_size
+            if self._remaining > 0:
+                if size is None or size < 0:
+                    size = self._remaining
+                data = self._fp.read(min(size, self._remaining))
+                if data:
+                    self._remaining -= len(data)
+                    return data
+            self._range += 1
+            self._remaining = None
+        return b""
+
+    def close(self):
+        if not self.closed:
+            self._fp.close()
+        super(RangeFile, self).close()
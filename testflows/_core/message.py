@@ -12,6 +12,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import re
 import json
 
 from collections import namedtuple
@@ -72,9 +73,336 @@ MessageMap = namedtuple(
 )
 
 
+_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+
 def dumps(o):
-    return json.dumps(o, separators=(",", ":"), ensure_ascii=False)
+    return _encoder.encode(o)
 
 
 def loads(s):
     return json.loads(s)
+
+
+#: message fields that are always present
+message_fields = (
+    "message_keyword",
+    "message_hash",
+    "message_object",
+    "message_num",
+    "message_stream",
+    "message_level",
+    "message_time",
+    "message_rtime",
+)
+
+#: test fields that are common to all messages of a test
+test_prefix_fields = (
+    "test_type",
+    "test_subtype",
+    "test_id",
+    "test_name",
+    "test_flags",
+    "test_cflags",
+    "test_level",
+    "test_parent_type",
+)
+
+#: compact protocol (TFSPv3) field table,
+#: new fields must only be appended to the end
+compact_fields = (
+    "test_type",
+    "test_subtype",
+    "test_id",
+    "test_name",
+    "test_flags",
+    "test_cflags",
+    "test_level",
+    "test_parent_type",
+    "test_module",
+    "test_uid",
+    "test_description",
+    "message",
+    "result_message",
+    "result_reason",
+    "result_type",
+    "result_test",
+    "protocol_version",
+    "framework_version",
+    "attribute_name",
+    "attribute_value",
+    "attribute_type",
+    "attribute_group",
+    "attribute_uid",
+    "requirement_name",
+    "requirement_version",
+    "requirement_description",
+    "requirement_link",
+    "requirement_priority",
+    "requirement_type",
+    "requirement_group",
+    "requirement_uid",
+    "requirement_level",
+    "requirement_num",
+    "specification_name",
+    "specification_content",
+    "specification_description",
+    "specification_link",
+    "specification_author",
+    "specification_version",
+    "specification_date",
+    "specification_status",
+    "specification_approved_by",
+    "specification_approved_date",
+    "specification_approved_version",
+    "specification_type",
+    "specification_group",
+    "specification_uid",
+    "specification_parent",
+    "specification_children",
+    "specification_headings",
+    "specification_requirements",
+    "argument_name",
+    "argument_value",
+    "argument_type",
+    "argument_group",
+    "argument_uid",
+    "tag_value",
+    "example_row",
+    "example_columns",
+    "example_values",
+    "example_row_format",
+    "node_map",
+    "node_name",
+    "node_module",
+    "node_uid",
+    "node_nexts",
+    "node_ins",
+    "node_outs",
+    "ticket_name",
+    "ticket_link",
+    "ticket_type",
+    "ticket_group",
+    "ticket_uid",
+    "metric_name",
+    "metric_value",
+    "metric_units",
+    "metric_type",
+    "metric_group",
+    "metric_uid",
+    "value_name",
+    "value_value",
+    "value_type",
+    "value_group",
+    "value_uid",
+    "protocol_hash",
+)
+
+compact_keys = {field: str(idx) for idx, field in enumerate(compact_fields)}
+expanded_keys = {str(idx): field for idx, field in enumerate(compact_fields)}
+
+
+#: message keyword prefix of a message
+message_keyword_prefix = '{"message_keyword":"'
+#: message keyword, test handle and optional
+#: test prefix of a compact (TFSPv3) message
+compact_message_re = re.compile(
+    r'^\["([A-Z]+)","[^"]*",\d+,\d+,(?:null|"(?:[^"\\]|\\.)*"),\d+,[^,]+,[^,]+,"([^"]+)",(\{"0":)?'
+)
+
+
+def expand(msg, prefix):
+    """Expand decoded compact message into a dictionary.
+
+    :param msg: decoded compact message (list)
+    :param prefix: test prefix
+    """
+    payload = {expanded_keys.get(k, k): v for k, v in msg[-1].items()}
+    expanded = dict(zip(message_fields, msg))
+    expanded.update(prefix)
+    expanded.update(payload)
+    return expanded
+
+
+class LazyMessage(dict):
+    """Message dictionary that only contains the message keyword
+    and, for compact (TFSPv3) messages, the test prefix
+    until any other field is accessed, at which point
+    the whole message is decoded.
+
+    :param line: serialized message
+    :param keyword: message keyword
+    :param prefix: test prefix of a compact message, default: None
+    """
+
+    __slots__ = ("_line", "_prefix")
+
+    def __init__(self, line, keyword, prefix=None):
+        dict.__setitem__(self, "message_keyword", keyword)
+        if prefix is not None:
+            dict.update(self, prefix)
+        self._line = line
+        self._prefix = prefix
+
+    def _load(self):
+        """Decode the whole message if it was not decoded yet."""
+        if self._line is None:
+            return
+        msg = json.loads(self._line)
+        if self._prefix is not None:
+            msg = expand(msg, self._prefix)
+            # keep the order of the fields the same as in the decoded message
+            dict.clear(self)
+        self._line = None
+        self._prefix = None
+        dict.update(self, msg)
+
+    def __missing__(self, key):
+        if self._line is None:
+            raise KeyError(key)
+        self._load()
+        return dict.__getitem__(self, key)
+
+    def __contains__(self, key):
+        if dict.__contains__(self, key):
+            return True
+        self._load()
+        return dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        if dict.__contains__(self, key):
+            return dict.__getitem__(self, key)
+        self._load()
+        return dict.get(self, key, default)
+
+    def __iter__(self):
+        self._load()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self._load()
+        return dict.__len__(self)
+
+    def __eq__(self, other):
+        self._load()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        self._load()
+        return dict.__ne__(self, other)
+
+    def __repr__(self):
+        self._load()
+        return dict.__repr__(self)
+
+    def __reduce__(self):
+        return (dict, (self.copy(),))
+
+    def __setitem__(self, key, value):
+        self._load()
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self._load()
+        dict.__delitem__(self, key)
+
+    def keys(self):
+        self._load()
+        return dict.keys(self)
+
+    def values(self):
+        self._load()
+        return dict.values(self)
+
+    def items(self):
+        self._load()
+        return dict.items(self)
+
+    def copy(self):
+        self._load()
+        return dict(dict.items(self))
+
+    def pop(self, *args):
+        self._load()
+        return dict.pop(self, *args)
+
+    def popitem(self):
+        self._load()
+        return dict.popitem(self)
+
+    def setdefault(self, key, default=None):
+        self._load()
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        self._load()
+        dict.update(self, *args, **kwargs)
+
+    def clear(self):
+        self._line = None
+        self._prefix = None
+        dict.clear(self)
+
+
+class CompactMessageDecoder(object):
+    """Decoder of compact protocol (TFSPv3) messages.
+
+    Compact message is a JSON array of the values of the `message_fields`
+    followed by the test handle and the payload object whose keys
+    are replaced by their index in the `compact_fields` table.
+    The test prefix is only included in the payload of the first message
+    of each test and all later messages refer to it using the test handle.
+
+    Messages that are not compact are decoded as is.
+    """
+
+    def __init__(self):
+        self.prefixes = {}
+
+    def decode(self, s):
+        """Decode message into a dictionary.
+
+        :param s: serialized message
+        """
+        msg = json.loads(s)
+
+        if type(msg) is dict:
+            return msg
+
+        handle = msg[-2]
+        prefix = self.prefixes.get(handle)
+
+        if prefix is None or compact_keys["test_id"] in msg[-1]:
+            payload = msg[-1]
+            prefix = {
+                field: payload[compact_keys[field]] for field in test_prefix_fields
+            }
+            self.prefixes[handle] = prefix
+
+        return expand(msg, prefix)
+
+    def decode_lazy(self, s):
+        """Decode message into a lazy message dictionary
+        that is only fully decoded when fields other than
+        the message keyword or the test prefix are accessed.
+
+        Messages that can't be decoded lazily are decoded
+        using the `decode` method.
+
+        :param s: serialized message
+        """
+        if s.startswith(message_keyword_prefix):
+            if s.endswith(("}\n", "}")):
+                start = len(message_keyword_prefix)
+                return LazyMessage(s, s[start : s.find('"', start)])
+
+        elif s.endswith(("]\n", "]")):
+            match = compact_message_re.match(s)
+            if match is not None:
+                keyword, handle, test_prefix = match.groups()
+                prefix = self.prefixes.get(handle)
+                # messages that include test prefix are always decoded
+                if test_prefix is None and prefix is not None:
+                    return LazyMessage(s, keyword, prefix)
+
+        return self.decode(s)
@@ -15,17 +15,14 @@
 # to the end flag
 import contextvars
 
+from queue import SimpleQueue
 from collections import namedtuple
 
-from concurrent.futures import CancelledError
-from concurrent.futures import TimeoutError
 from concurrent.futures import Future as ConcurrentFuture
 
 from .asyncio import asyncio, wrap_future, OptionalFuture
 from .asyncio import Future as AsyncFuture
 from .asyncio import is_running_in_event_loop
-from .asyncio import TimeoutError as AsyncTimeoutError
-from .asyncio import CancelledError as AsyncCancelledError
 
 
 def Context(**kwargs):
@@ -123,6 +120,18 @@ def previous(value=None):
     return context.previous.get()
 
 
+def _remove_done_callback(future, fn):
+    """Remove done callback from a concurrent or an asyncio future."""
+    if isinstance(future, ConcurrentFuture):
+        # concurrent futures do not provide remove_done_callback()
+        # and keep the callbacks after they were called
+        with future._condition:
+            if fn in future._done_callbacks:
+                future._done_callbacks.remove(fn)
+        return
+    future.remove_done_callback(fn)
+
+
 def join(
     *future,
     futures=None,
@@ -166,47 +175,57 @@ def join(
     futures = list(future) or futures or test.futures
     tests = []
     exception = None
-    filtered_count = 0
+    # futures that were joined and must be removed from the list of futures
+    joined = set()
+    # futures are put into the queue by their done callbacks
+    # in the order they complete
+    completed = SimpleQueue()
+    # futures with the done callback added by this join
+    registered = []
 
-    while True:
-        if not futures or filtered_count >= len(futures):
-            break
+    try:
+        while True:
+            selected = [
+                f for f in futures if f not in joined and (not filter or filter(f))
+            ]
+            if not selected:
+                break
 
-        future = None
-        try:
-            future = futures.pop(0)
+            for f in selected:
+                f.add_done_callback(completed.put)
+                registered.append(f)
 
-            if filter and not filter(future):
-                futures.append(future)
-                filtered_count += 1
-                continue
+            if cancel_pending:
+                for f in selected:
+                    f.cancel()
 
-            filtered_count = 0
+            for _ in range(len(selected)):
+                future = completed.get()
 
-            if cancel_pending:
-                if future.cancel():
+                if future.cancelled():
+                    joined.add(future)
                     continue
-            try:
-                exc = future.exception(timeout=0.1)
+
+                exc = future.exception()
                 if exc is not None:
                     if exception is None:
                         exception = exc
-                        cancel_pending = True
                         if test:
                             test.terminate()
+                        if all:
+                            for f in selected:
+                                f.cancel()
                     if not all:
                         raise exception
                 else:
-                    tests.append(future.result(timeout=0.1))
-            except CancelledError:
-                continue
-            except TimeoutError:
-                futures.append(future)
-                continue
-        except BaseException:
-            if future is not None:
-                futures.append(future)
-            raise
+                    tests.append(future.result())
+
+                joined.add(future)
+    finally:
+        for f in registered:
+            _remove_done_callback(f, completed.put)
+        if joined:
+            futures[:] = [f for f in futures if f not in joined]
 
     if exception is not None:
         raise exception
@@ -238,52 +257,66 @@ async def _async_join(
     futures = list(future) or futures or test.futures
     tests = []
     exception = None
-    filtered_count = 0
-
-    while True:
-        if not futures or filtered_count >= len(futures):
-            break
-
-        future = None
-        try:
-            future = futures.pop(0)
-
-            if filter and not filter(future):
-                futures.append(future)
-                filtered_count += 1
-                continue
-
-            filtered_count = 0
-
-            try:
-                f = future
-                if isinstance(future, ConcurrentFuture):
-                    f = wrap_future(future, new_future=OptionalFuture())
-
-                if cancel_pending:
-                    if future.cancel():
-                        continue
-
-                tests.append(await asyncio.wait_for(asyncio.shield(f), timeout=0.1))
-            except AsyncCancelledError:
-                continue
-            except AsyncTimeoutError:
-                futures.append(future)
-                continue
-        except BaseException as exc:
-            if future is not None:
-                if future.done():
+    # futures that were joined and must be removed from the list of futures
+    joined = set()
+    # futures are put into the queue by their done callbacks
+    # in the order they complete
+    completed = asyncio.Queue()
+    loop = asyncio.get_event_loop()
+    # futures with the done callback added by this join
+    registered = []
+
+    def put_threadsafe(future):
+        loop.call_soon_threadsafe(completed.put_nowait, future)
+
+    try:
+        while True:
+            selected = [
+                f for f in futures if f not in joined and (not filter or filter(f))
+            ]
+            if not selected:
+                break
+
+            for f in selected:
+                callback = completed.put_nowait
+                if isinstance(f, ConcurrentFuture):
+                    callback = put_threadsafe
+                f.add_done_callback(callback)
+                registered.append((f, callback))
+
+            if cancel_pending:
+                for f in selected:
+                    f.cancel()
+
+            pending = set(selected)
+            for _ in range(len(selected)):
+                future = await completed.get()
+                pending.discard(future)
+
+                if future.cancelled():
+                    joined.add(future)
+                    continue
+
+                exc = future.exception()
+                if exc is not None:
+                    joined.add(future)
                     if test:
                         test.terminate()
                     if not all:
-                        raise
+                        raise exc
                     if exception is None:
                         exception = exc
-                        cancel_pending = True
+                        for f in pending:
+                            f.cancel()
                     continue
-                else:
-                    futures.append(future)
-            raise
+
+                tests.append(future.result())
+                joined.add(future)
+    finally:
+        for f, callback in registered:
+            _remove_done_callback(f, callback)
+        if joined:
+            futures[:] = [f for f in futures if f not in joined]
 
     if exception is not None:
         raise exception
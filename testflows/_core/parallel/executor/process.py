@@ -21,15 +21,21 @@ import queue
 import codecs
 import atexit
 import signal
+import socket
+import select
 import threading
 import traceback
+import copy
 import itertools
 import textwrap
+import collections
 import subprocess
 import contextlib
 import concurrent.futures._base as _base
+import multiprocessing.reduction as reduction
 
 import testflows.settings as settings
+import testflows._core.tracing as tracing
 
 from .future import Future
 
@@ -44,16 +50,21 @@ from ...tracing import logging
 
 _shutdown = False
 _worker_pids = {}
+# settings last applied in the worker process
+_worker_settings = None
 
 WORKER_READY = "_tfs_worker__ready__\n"
 
+tracer = tracing.getLogger(__name__)
+
 
 class Process:
     """Process for asyncio.subprocess_exec."""
 
-    def __init__(self, transport, protocol):
+    def __init__(self, transport, protocol, startup_latency=None):
         self.transport = transport
         self.protocol = protocol
+        self.startup_latency = startup_latency
 
 
 ProcessError = subprocess.SubprocessError
@@ -84,67 +95,233 @@ def _atexit():
 
 atexit.register(_atexit)
 
-WorkQueue = ServiceObjectType("WorkQueue", auto_expose(queue.Queue()))
-WorkQueue.Empty = queue.Empty
+
+class WorkDispatcher:
+    """Work queue that pushes work items to the inboxes
+    of the subscribed workers instead of workers polling for them.
+
+    Each worker subscribes with its inbox and the number of credits
+    which is the number of work items that can be pushed to it
+    before they are acknowledged. Worker acknowledges each work item
+    by calling `task_done()` that returns the credit back.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.unfinished_tasks = 0
+        self._worker_ids = itertools.count(1)
+        self._pending = collections.deque()
+        self._credits = collections.deque()
+        self._inboxes = {}
+        # settings version last pushed to each worker
+        self._settings_versions = {}
+
+    def put(self, item):
+        """Put work item into the queue. `None` work item
+        makes the worker that receives it to exit.
+        """
+        with self._lock:
+            self.unfinished_tasks += 1
+            self._pending.append(item)
+            pushes = self._dispatch()
+        self._push(pushes)
+
+    put_nowait = put
+
+    def subscribe(self, inbox, credits=1):
+        """Subscribe worker's inbox to receive work items.
+        Returns worker id.
+        """
+        with self._lock:
+            worker_id = next(self._worker_ids)
+            self._inboxes[worker_id] = inbox
+            self._credits.extend([worker_id] * credits)
+            pushes = self._dispatch()
+        self._push(pushes)
+        return worker_id
+
+    def task_done(self, worker_id=None):
+        """Acknowledge work item pushed to the worker
+        and return its credit.
+        """
+        with self._lock:
+            if self.unfinished_tasks <= 0:
+                raise ValueError("task_done() called too many times")
+            self.unfinished_tasks -= 1
+            if worker_id in self._inboxes:
+                self._credits.append(worker_id)
+            pushes = self._dispatch()
+        self._push(pushes)
+
+    def _dispatch(self):
+        """Match pending work items with available credits.
+        Must be called with the lock held.
+        """
+        pushes = []
+        while self._pending and self._credits:
+            worker_id = self._credits.popleft()
+            inbox = self._inboxes.get(worker_id)
+            if inbox is None:
+                continue
+            item = self._pending.popleft()
+            payload = item
+            if item is None:
+                # worker exits after receiving None
+                del self._inboxes[worker_id]
+                self._settings_versions.pop(worker_id, None)
+            elif getattr(item, "settings", None) is not None:
+                # only send settings that the worker does not have yet
+                version = item.settings.version
+                if self._settings_versions.get(worker_id) == version:
+                    payload = item.without_settings()
+                self._settings_versions[worker_id] = version
+            pushes.append((worker_id, inbox, item, payload))
+        return pushes
+
+    def _push(self, pushes):
+        """Push work items to the worker inboxes without waiting."""
+        for worker_id, inbox, item, payload in pushes:
+            asyncio.run_coroutine_threadsafe(
+                inbox.__async_proxy_call__(
+                    inbox.oid,
+                    inbox.address,
+                    inbox.identity,
+                    "put",
+                    (payload,),
+                    _tracer=inbox._tracer,
+                ),
+                loop=process_service().loop,
+            ).add_done_callback(
+                lambda future, worker_id=worker_id, item=item: self._pushed(
+                    future, worker_id, item
+                )
+            )
+
+    def _pushed(self, future, worker_id, item):
+        """Requeue work item if it could not be pushed to the worker."""
+        if future.cancelled() or future.exception() is None:
+            return
+        with self._lock:
+            self._inboxes.pop(worker_id, None)
+            self._settings_versions.pop(worker_id, None)
+            if item is None:
+                # worker is already gone
+                self.unfinished_tasks -= 1
+            else:
+                self._pending.appendleft(item)
+            pushes = self._dispatch()
+        self._push(pushes)
+
+
+WorkQueue = ServiceObjectType("WorkQueue", auto_expose(WorkDispatcher()))
 
 
 class WorkerSettings:
     """Remote service object that is used to pass settings
     to the worker process.
+
+    Settings are a snapshot of the current state that is stamped
+    with a version so that workers apply them only when they change.
     """
 
-    def __init__(self):
-        self.debug = settings.debug
-        self.time_resolution = settings.time_resolution
-        self.hash_length = settings.hash_length
-        self.hash_func = settings.hash_func
-        self.no_colors = settings.no_colors
-        self.test_id = settings.test_id
-        self.output_format = settings.output_format
-        self.write_logfile = self._set_service_object(current().io.io.io.writer.fd)
-        self.read_logfile = self._set_service_object(current().io.io.io.reader.fd)
-        self.database = settings.database
-        self.show_skipped = settings.show_skipped
-        self.show_retries = settings.show_retries
-        self.trim_results = settings.trim_results
-        self.random_order = settings.random_order
-        self.global_thread_pool = (
-            (
-                settings.global_thread_pool.__class__,
-                settings.global_thread_pool.initargs,
-            )
-            if settings.global_thread_pool is not None
-            else None
-        )
-        self.global_async_pool = (
-            (settings.global_async_pool.__class__, settings.global_async_pool.initargs)
-            if settings.global_async_pool is not None
-            else None
+    # settings that are passed as service objects
+    service_objects = (
+        "write_logfile",
+        "read_logfile",
+        "log_segments",
+        "live_output",
+        "global_process_pool",
+    )
+
+    def __init__(self, state=None, version=0):
+        if state is None:
+            state = self.state()
+        self.__dict__.update(state)
+        self.version = version
+
+        names = [
+            name
+            for name in self.service_objects
+            if state[name] is not None
+            and not isinstance(state[name], BaseServiceObject)
+        ]
+        objs = process_service().register_many(
+            [state[name] for name in names], sync=True, awaited=False
         )
-        self.global_process_pool = self._set_service_object(
-            settings.global_process_pool
-        )
-        self.service_timeout = settings.service_timeout
-        self.secrets_registry = settings.secrets_registry
-        self.trace = settings.trace
-        self.profile = settings.profile
-        self.license_key = settings.license_key
+        for name, obj in zip(names, objs):
+            setattr(self, name, obj)
 
-    def _set_service_object(self, obj):
-        if obj is None:
-            return obj
-        if not isinstance(obj, BaseServiceObject):
-            obj = process_service().register(obj, sync=True, awaited=False)
-        return obj
+    @staticmethod
+    def state():
+        """Return current state of the settings that are passed
+        to the worker process.
+        """
+        writer = current().io.io.io.writer
+        return {
+            "debug": settings.debug,
+            "time_resolution": settings.time_resolution,
+            "hash_length": settings.hash_length,
+            "hash_name": settings.hash_name,
+            "hash_func": settings.hash_func,
+            "no_colors": settings.no_colors,
+            "test_id": settings.test_id,
+            "output_format": settings.output_format,
+            "write_logfile": writer.fd,
+            "read_logfile": current().io.io.io.reader.fd,
+            "log_segments": writer.segments,
+            "protocol": settings.protocol,
+            "log_codec": settings.log_codec,
+            "live_output": (
+                writer.local_live if writer.local_live is not None else writer.live
+            ),
+            "database": settings.database,
+            "show_skipped": settings.show_skipped,
+            "show_retries": settings.show_retries,
+            "trim_results": settings.trim_results,
+            "random_order": settings.random_order,
+            "global_thread_pool": (
+                (
+                    settings.global_thread_pool.__class__,
+                    settings.global_thread_pool.initargs,
+                )
+                if settings.global_thread_pool is not None
+                else None
+            ),
+            "global_async_pool": (
+                (
+                    settings.global_async_pool.__class__,
+                    settings.global_async_pool.initargs,
+                )
+                if settings.global_async_pool is not None
+                else None
+            ),
+            "global_process_pool": settings.global_process_pool,
+            "service_timeout": settings.service_timeout,
+            "trace": settings.trace,
+            "profile": settings.profile,
+            "license_key": settings.license_key,
+        }
 
 
 class _WorkItem(object):
     """Work item for the remote worker."""
 
     def __init__(
-        self, settings, current_test, previous_test, top_test, future, fn, args, kwargs
+        self,
+        settings,
+        secrets_registry,
+        current_test,
+        previous_test,
+        top_test,
+        future,
+        fn,
+        args,
+        kwargs,
     ):
         self.settings = settings
+        self.settings_version = settings.version
+        # secrets registry is mutable so it is sent with each work item
+        self.secrets_registry = secrets_registry
         self.current_test = current_test
         self.previous_test = previous_test
         self.top_test = top_test
@@ -153,6 +330,14 @@ class _WorkItem(object):
         self.args = args
         self.kwargs = kwargs
 
+    def without_settings(self):
+        """Return copy of the work item without the settings
+        for the worker that already has them.
+        """
+        work_item = copy.copy(self)
+        work_item.settings = None
+        return work_item
+
     def run(self, local=False):
         """This function will be run in worker process."""
         if not self.future.set_running_or_notify_cancel():
@@ -161,21 +346,37 @@ class _WorkItem(object):
         ctx = _get_parallel_context()
 
         def set_settings(work_settings):
-            """Set global test settings for this work item."""
+            """Set global test settings for the work items."""
+            global _worker_settings
+
             settings.debug = work_settings.debug
             settings.time_resolution = work_settings.time_resolution
             settings.hash_length = work_settings.hash_length
+            settings.hash_name = work_settings.hash_name
             settings.hash_func = work_settings.hash_func
             settings.no_colors = work_settings.no_colors
             settings.test_id = work_settings.test_id
             settings.output_format = work_settings.output_format
             settings.write_logfile = work_settings.write_logfile
             settings.read_logfile = work_settings.read_logfile
+            settings.log_segments = work_settings.log_segments
+            settings.protocol = work_settings.protocol
+            settings.log_codec = work_settings.log_codec
+            settings.live_output = work_settings.live_output
             settings.database = work_settings.database
             settings.show_skipped = work_settings.show_skipped
             settings.trim_results = work_settings.trim_results
             settings.random_order = work_settings.random_order
             settings.service_timeout = work_settings.service_timeout
+            # set shared global process pool
+            settings.global_process_pool = work_settings.global_process_pool
+            # trace
+            settings.trace = work_settings.trace
+
+            _worker_settings = work_settings
+
+        def set_pools(work_settings):
+            """Set global thread and async pools for this work item."""
             # set global thread pool
             settings.global_thread_pool = None
             if work_settings.global_thread_pool is not None:
@@ -186,11 +387,6 @@ class _WorkItem(object):
             if work_settings.global_async_pool is not None:
                 cls, initargs = work_settings.global_async_pool
                 settings.global_async_pool = cls(*initargs)
-            # set shared global process pool
-            settings.global_process_pool = work_settings.global_process_pool
-            settings.secrets_registry = work_settings.secrets_registry
-            # trace
-            settings.trace = work_settings.trace
 
         def runner(self):
             try:
@@ -199,7 +395,19 @@ class _WorkItem(object):
                     previous(self.previous_test)
                     current(self.current_test)
 
-                    set_settings(self.settings)
+                    # settings are only sent when they have changed
+                    if self.settings is not None:
+                        set_settings(self.settings)
+                    elif (
+                        _worker_settings is None
+                        or _worker_settings.version != self.settings_version
+                    ):
+                        raise RuntimeError(
+                            f"worker settings version {self.settings_version} is missing"
+                        )
+
+                    set_pools(_worker_settings)
+                    settings.secrets_registry = self.secrets_registry
 
                     # global thread and async pool are local to each work item
                     with settings.global_thread_pool or contextlib.nullcontext(), (
@@ -285,6 +493,273 @@ class WorkerProtocol(asyncio.SubprocessProtocol):
             self.ready_future.set_result(True)
 
 
+class ForkedWorkerPipeProtocol(asyncio.Protocol):
+    """Protocol for stdout or stderr pipe of the worker process
+    forked by the fork server.
+    """
+
+    def __init__(self, transport, fd):
+        self.transport = transport
+        self.fd = fd
+
+    def data_received(self, data):
+        self.transport.pipe_data_received(self.fd, data)
+
+    def connection_lost(self, exc):
+        self.transport.pipe_connection_lost(self.fd)
+
+
+class ForkedWorkerTransport:
+    """Transport of the worker process forked by the fork server
+    that provides the same interface to the WorkerProtocol as the
+    transport returned by asyncio.subprocess_exec.
+    """
+
+    def __init__(self, protocol):
+        self.protocol = protocol
+        self.pid = None
+        self.returncode = None
+        self.connected = False
+        self.finished = False
+        self.pending_calls = []
+        self.pipes = {}
+        self.lost_pipes = set()
+
+    def get_pid(self):
+        return self.pid
+
+    def get_returncode(self):
+        return self.returncode
+
+    async def connect(self, loop, stdout, stderr):
+        """Connect stdout and stderr pipes of the worker process."""
+        for fd, pipe in ((1, stdout), (2, stderr)):
+            self.pipes[fd], _ = await loop.connect_read_pipe(
+                lambda fd=fd: ForkedWorkerPipeProtocol(self, fd),
+                os.fdopen(pipe, "rb", 0),
+            )
+        self.protocol.connection_made(self)
+        self.connected = True
+        for fd, data in self.pending_calls:
+            self.protocol.pipe_data_received(fd, data)
+        self.pending_calls = []
+        self._try_finish()
+
+    def pipe_data_received(self, fd, data):
+        if not self.connected:
+            self.pending_calls.append((fd, data))
+            return
+        self.protocol.pipe_data_received(fd, data)
+
+    def pipe_connection_lost(self, fd):
+        self.lost_pipes.add(fd)
+        self._try_finish()
+
+    def process_exited(self, returncode):
+        self.returncode = returncode
+        self._try_finish()
+
+    def _try_finish(self):
+        if self.finished or not self.connected:
+            return
+        if self.returncode is None or len(self.lost_pipes) < len(self.pipes):
+            return
+        self.finished = True
+        self.protocol.process_exited()
+
+
+class ForkServer:
+    """Fork server that forks worker processes from a template
+    `tfs-worker` process that has already imported all the modules
+    needed by the worker.
+
+    Each fork request sends the write ends of the stdout and stderr
+    pipes for the new worker over a Unix socket. The fork server
+    replies with `forked <pid>` once the worker is forked
+    and with `exited <pid> <returncode>` once the worker exits.
+    """
+
+    def __init__(self, command, test_io, io_prefix, loop):
+        self.command = command
+        self.test_io = test_io
+        self.io_prefix = io_prefix
+        self.loop = loop
+        self.process = None
+        self.socket = None
+        self.reader = None
+        self.forking = collections.deque()
+        self.workers = {}
+
+    async def start(self):
+        """Start fork server process."""
+        parent_socket, child_socket = socket.socketpair()
+        try:
+            transport, protocol = await self.loop.subprocess_exec(
+                lambda: WorkerProtocol(
+                    test_io=self.test_io,
+                    io_prefix=f"{self.io_prefix}-fork-server",
+                    loop=self.loop,
+                ),
+                *self.command,
+                "--fork-server",
+                str(child_socket.fileno()),
+                pass_fds=(child_socket.fileno(),),
+                start_new_session=True,
+            )
+        except BaseException:
+            parent_socket.close()
+            raise
+        finally:
+            child_socket.close()
+
+        self.process = Process(transport, protocol)
+        self.socket = parent_socket
+        self.socket.setblocking(False)
+
+        await protocol.ready_future
+
+        returncode = transport.get_returncode()
+        if returncode is not None:
+            self.socket.close()
+            output = textwrap.indent(protocol.buffer, prefix="  ")
+            raise ProcessError(
+                f"failed to start fork server process {transport.get_pid()} return code {returncode}\n{output}"
+            )
+
+        self.reader = self.loop.create_task(self._read())
+
+    async def _read(self):
+        """Read fork server replies."""
+        buffer = b""
+        try:
+            while True:
+                data = await self.loop.sock_recv(self.socket, 4096)
+                if not data:
+                    break
+                *lines, buffer = (buffer + data).split(b"\n")
+                for line in lines:
+                    event, pid, *returncode = line.decode().split()
+                    if event == "forked":
+                        future, transport = self.forking.popleft()
+                        transport.pid = int(pid)
+                        self.workers[transport.pid] = transport
+                        future.set_result(transport)
+                    elif event == "exited":
+                        transport = self.workers.pop(int(pid), None)
+                        if transport is not None:
+                            transport.process_exited(int(returncode[0]))
+        finally:
+            while self.forking:
+                future, _ = self.forking.popleft()
+                if not future.done():
+                    future.set_exception(ProcessError("fork server exited"))
+
+    async def fork(self, protocol_factory):
+        """Fork new worker process and return its transport and protocol."""
+        stdout_r, stdout_w = os.pipe()
+        stderr_r, stderr_w = os.pipe()
+        try:
+            try:
+                reduction.sendfds(self.socket, [stdout_w, stderr_w])
+            finally:
+                os.close(stdout_w)
+                os.close(stderr_w)
+            future = self.loop.create_future()
+            transport = ForkedWorkerTransport(protocol_factory())
+            self.forking.append((future, transport))
+            await future
+        except BaseException:
+            os.close(stdout_r)
+            os.close(stderr_r)
+            raise
+        await transport.connect(self.loop, stdout_r, stderr_r)
+        return transport, transport.protocol
+
+    async def close(self):
+        """Close fork server which makes the fork server process exit."""
+        if self.reader is not None:
+            self.reader.cancel()
+        if self.socket is not None:
+            self.socket.close()
+        for pid in self.workers:
+            _worker_pids.pop(pid, None)
+        self.workers = {}
+
+
+def fork_worker_processes(fd):
+    """Run fork server loop in the template worker process.
+
+    A new worker process is forked for each pair of stdout and stderr
+    file descriptors received over the fork server socket.
+    Returns `True` in the forked worker process and `False`
+    in the fork server process once the socket is closed.
+    """
+    sock = socket.socket(fileno=fd)
+    wakeup_r, wakeup_w = os.pipe()
+    os.set_blocking(wakeup_r, False)
+    os.set_blocking(wakeup_w, False)
+    sigchld_handler = signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+    signal.set_wakeup_fd(wakeup_w)
+
+    def reply(message):
+        sock.sendall(f"{message}\n".encode())
+
+    def reap():
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            if os.WIFEXITED(status):
+                returncode = os.WEXITSTATUS(status)
+            else:
+                returncode = -os.WTERMSIG(status)
+            reply(f"exited {pid} {returncode}")
+
+    try:
+        while True:
+            readable, _, _ = select.select([sock, wakeup_r], [], [])
+
+            if wakeup_r in readable:
+                while True:
+                    try:
+                        os.read(wakeup_r, 512)
+                    except BlockingIOError:
+                        break
+                reap()
+
+            if sock in readable:
+                try:
+                    stdout, stderr = reduction.recvfds(sock, 2)
+                except EOFError:
+                    return False
+
+                pid = os.fork()
+                if pid == 0:
+                    signal.set_wakeup_fd(-1)
+                    signal.signal(signal.SIGCHLD, sigchld_handler)
+                    sock.close()
+                    os.close(wakeup_r)
+                    os.close(wakeup_w)
+                    os.setsid()
+                    stdin = os.open(os.devnull, os.O_RDONLY)
+                    os.dup2(stdin, 0)
+                    os.dup2(stdout, 1)
+                    os.dup2(stderr, 2)
+                    for _fd in (stdin, stdout, stderr):
+                        os.close(_fd)
+                    return True
+
+                os.close(stdout)
+                os.close(stderr)
+                reply(f"forked {pid}")
+
+    except (BrokenPipeError, ConnectionResetError):
+        return False
+
+
 class RemotePoolExecutor(_base.Executor):
     """Remote pool executor."""
 
@@ -302,12 +777,14 @@ class ProcessPoolExecutor(RemotePoolExecutor):
         process_name_prefix="",
         _check_max_workers=True,
         join_on_shutdown=True,
+        warm=False,
+        fork_server=False,
     ):
         if _check_max_workers and int(max_workers) <= 0:
             raise ValueError("max_workers must be greater than 0")
         self._open = False
         self._max_workers = max_workers
-        self._raw_work_queue = queue.Queue()
+        self._raw_work_queue = WorkDispatcher()
         self._work_queue = process_service().register(
             self._raw_work_queue, sync=True, awaited=False
         )
@@ -320,16 +797,40 @@ class ProcessPoolExecutor(RemotePoolExecutor):
         )
         self._uid = str(uuid.uuid1())
         self._join_on_shutdown = join_on_shutdown
+        self._warm = warm
+        self._use_fork_server = fork_server
+        self._fork_server = None
+        self._settings = None
+        self._settings_state = None
+        self._settings_version = itertools.count(1)
 
     @property
     def open(self):
         """Return if pool is opened."""
         return bool(self._open)
 
+    @property
+    def startup_latency(self):
+        """Return startup latency in seconds of each worker process
+        keyed by the process id.
+        """
+        return {
+            proc.transport.get_pid(): proc.startup_latency for proc in self._processes
+        }
+
     def __enter__(self):
         self._open = True
+        if self._warm:
+            self._warm_up()
         return self
 
+    def _warm_up(self):
+        """Start all worker processes concurrently.
+        Startup latency of each worker process is available
+        using the `startup_latency` property.
+        """
+        self._start_processes(self._max_workers - len(self._processes))
+
     def map(self, fn, *iterables, timeout=None, chunksize=1):
         raise NotImplementedError()
 
@@ -349,19 +850,22 @@ class ProcessPoolExecutor(RemotePoolExecutor):
                     "cannot schedule new futures after " "interpreter shutdown"
                 )
 
-            service = process_service()
-
             _raw_future = Future()
             _raw_future._executor_uid = self._uid
 
-            future = service.register(_raw_future, sync=True, awaited=False)
-
-            current_test = service.register(current(), sync=True, awaited=False)
-            previous_test = service.register(previous(), sync=True, awaited=False)
-            top_test = service.register(top(), sync=True, awaited=False)
+            # register all service objects of the work item in one call
+            (
+                future,
+                current_test,
+                previous_test,
+                top_test,
+            ) = process_service().register_many(
+                [_raw_future, current(), previous(), top()], sync=True, awaited=False
+            )
 
             work_item = _WorkItem(
-                WorkerSettings(),
+                self._worker_settings(),
+                settings.secrets_registry,
                 current_test,
                 previous_test,
                 top_test,
@@ -384,6 +888,24 @@ class ProcessPoolExecutor(RemotePoolExecutor):
 
         return _raw_future
 
+    def _worker_settings(self):
+        """Return worker settings creating new version
+        only if the settings have changed.
+        """
+        state = WorkerSettings.state()
+        if self._settings_state is None or any(
+            # service objects are compared by identity
+            value is not self._settings_state[name]
+            and (
+                name in WorkerSettings.service_objects
+                or value != self._settings_state[name]
+            )
+            for name, value in state.items()
+        ):
+            self._settings = WorkerSettings(state, version=next(self._settings_version))
+            self._settings_state = state
+        return self._settings
+
     def _adjust_process_count(self):
         """Increase worker count up to max_workers if needed.
         Return `True` if worker is immediately available to handle
@@ -395,59 +917,120 @@ class ProcessPoolExecutor(RemotePoolExecutor):
         num_procs = len(self._processes)
 
         if num_procs < self._max_workers:
-            command = [
-                "tfs-worker",
-                "--oid",
-                str(self._work_queue.oid),
-                "--identity",
-                str(self._work_queue.identity.hex()),
-                "--hostname",
-                str(self._work_queue.address.hostname),
-                "--port",
-                str(self._work_queue.address.port),
-                "--secret-key",
-                str(settings.secret_key.hex()),
-                "--ssl-dir",
-                str(settings.ssl_dir),
-            ]
-
-            if settings.debug:
-                command.append("--debug")
-            if settings.no_colors:
-                command.append("--no-colors")
-            if settings.trace:
-                command.append("--trace")
-                command.append(f"{logging.getLevelName(settings.trace).lower()}")
-
-            loop = process_service().loop
-
-            proc = Process(
-                *asyncio.run_coroutine_threadsafe(
-                    loop.subprocess_exec(
-                        lambda: WorkerProtocol(
-                            test_io=current(),
-                            io_prefix=self._process_name_prefix,
-                            loop=loop,
-                        ),
-                        *command,
-                        start_new_session=True,
-                    ),
-                    loop=loop,
-                ).result()
-            )
+            self._start_processes(1)
+            return True
 
-            async_wait_for(proc.protocol.ready_future, loop=loop)
+        return False
+
+    def _worker_command(self):
+        """Return command to start worker process."""
+        command = [
+            "tfs-worker",
+            "--oid",
+            str(self._work_queue.oid),
+            "--identity",
+            str(self._work_queue.identity.hex()),
+            "--hostname",
+            str(self._work_queue.address.hostname),
+            "--port",
+            str(self._work_queue.address.port),
+            "--secret-key",
+            str(settings.secret_key.hex()),
+            "--ssl-dir",
+            str(settings.ssl_dir),
+        ]
+
+        if settings.debug:
+            command.append("--debug")
+        if settings.no_colors:
+            command.append("--no-colors")
+        if settings.trace:
+            command.append("--trace")
+            command.append(f"{logging.getLevelName(settings.trace).lower()}")
+
+        return command
+
+    def _start_processes(self, count):
+        """Start worker processes concurrently and wait
+        for all of them to be ready.
+        Returns list of started processes.
+        """
+        loop = process_service().loop
+
+        results = asyncio.run_coroutine_threadsafe(
+            self._async_start_processes(count, test_io=current(), loop=loop),
+            loop=loop,
+        ).result()
 
+        procs = []
+        error = None
+
+        for proc in results:
+            if isinstance(proc, BaseException):
+                error = error or proc
+                continue
             returncode = proc.transport.get_returncode()
             if returncode:
                 output = textwrap.indent(proc.protocol.buffer, prefix="  ")
-                raise ProcessError(
+                error = error or ProcessError(
                     f"failed to start worker process {proc.transport.get_pid()} return code {returncode}\n{output}"
                 )
+                continue
+            tracer.debug(
+                f"started worker process {proc.transport.get_pid()} in {proc.startup_latency:.3f}s"
+            )
             self._processes.add(proc)
-            return True
+            procs.append(proc)
 
-        return False
+        if error is not None:
+            raise error
+
+        return procs
+
+    async def _async_start_processes(self, count, test_io, loop):
+        if self._use_fork_server and self._fork_server is None:
+            fork_server = ForkServer(
+                command=self._worker_command(),
+                test_io=test_io,
+                io_prefix=self._process_name_prefix,
+                loop=loop,
+            )
+            await fork_server.start()
+            self._fork_server = fork_server
+
+        # limit the number of concurrently starting interpreters
+        # as each one is busy importing modules until it is ready
+        spawning = asyncio.Semaphore(os.cpu_count() or 1)
+
+        return await asyncio.gather(
+            *(
+                self._async_start_process(test_io=test_io, loop=loop, spawning=spawning)
+                for _ in range(count)
+            ),
+            return_exceptions=True,
+        )
+
+    async def _async_start_process(self, test_io, loop, spawning):
+        def protocol_factory():
+            return WorkerProtocol(
+                test_io=test_io, io_prefix=self._process_name_prefix, loop=loop
+            )
+
+        if self._fork_server is not None:
+            start_time = time.time()
+            transport, protocol = await self._fork_server.fork(protocol_factory)
+            await protocol.ready_future
+        else:
+            async with spawning:
+                start_time = time.time()
+                transport, protocol = await loop.subprocess_exec(
+                    protocol_factory,
+                    *self._worker_command(),
+                    start_new_session=True,
+                )
+                await protocol.ready_future
+
+        return Process(transport, protocol, startup_latency=time.time() - start_time)
 
     def shutdown(self, wait=True, test=None):
         with self._shutdown_lock:
@@ -476,13 +1059,33 @@ class ProcessPoolExecutor(RemotePoolExecutor):
                     while is_running(proc.transport.get_pid()):
                         time.sleep(0.1)
                 self._processes = set()
+                if self._fork_server is not None:
+                    fork_server, self._fork_server = self._fork_server, None
+                    asyncio.run_coroutine_threadsafe(
+                        fork_server.close(), loop=fork_server.loop
+                    ).result()
+                    while is_running(fork_server.process.transport.get_pid()):
+                        time.sleep(0.1)
 
 
 class SharedProcessPoolExecutor(ProcessPoolExecutor):
     """Shared process pool executor."""
 
-    def __init__(self, max_workers, process_name_prefix="", join_on_shutdown=True):
-        self.initargs = (max_workers, process_name_prefix, join_on_shutdown)
+    def __init__(
+        self,
+        max_workers,
+        process_name_prefix="",
+        join_on_shutdown=True,
+        warm=False,
+        fork_server=False,
+    ):
+        self.initargs = (
+            max_workers,
+            process_name_prefix,
+            join_on_shutdown,
+            warm,
+            fork_server,
+        )
 
         if int(max_workers) < 0:
             raise ValueError("max_workers must be positive or 0")
@@ -491,6 +1094,8 @@ class SharedProcessPoolExecutor(ProcessPoolExecutor):
             process_name_prefix=process_name_prefix,
             _check_max_workers=False,
             join_on_shutdown=join_on_shutdown,
+            warm=warm,
+            fork_server=fork_server,
         )
 
     def submit(self, fn, args=None, kwargs=None, block=False):
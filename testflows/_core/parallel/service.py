@@ -175,6 +175,45 @@ class Service:
         else:
             return _async_register(sync=sync)
 
+    def register_many(self, objs, sync=None, expose=None, awaited=True):
+        """Register multiple objects with the service using
+        one call into the service event loop.
+        Returns list of service objects in the same order.
+        """
+        for obj in objs:
+            if isinstance(obj, BaseServiceObject):
+                raise ValueError(f"registering service objects not allowed")
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        def _register(sync: bool = False):
+            return [
+                self.register(obj, sync=sync, expose=expose, awaited=False)
+                for obj in objs
+            ]
+
+        async def _async_register(sync: bool = False):
+            return _register(sync=sync)
+
+        if loop is self.loop and not awaited:
+            return _register(sync=sync)
+
+        if loop is None or not awaited:
+            return asyncio.run_coroutine_threadsafe(
+                _async_register(sync=True), loop=self.loop
+            ).result()
+        elif loop is not self.loop:
+            return asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(
+                    _async_register(sync=sync), loop=self.loop
+                )
+            )
+        else:
+            return _async_register(sync=sync)
+
     async def unregister(self, obj):
         """Unregister object from the service to stop
         providing object to remote services.
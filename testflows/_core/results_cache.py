@@ -0,0 +1,156 @@
+# Copyright 2024 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import pickle
+import hashlib
+import tempfile
+
+import testflows.settings as settings
+
+from . import __version__
+
+#: cache format version, must be incremented
+#: when the format of the results changes
+version = 2
+#: default results cache directory
+default_directory = os.path.join(
+    os.path.expanduser("~"), ".cache", "testflows", "results"
+)
+#: results cache file extension
+extension = ".results"
+#: minimum size of the log file for which results are cached
+min_size = 1048576
+#: size of the head and tail blocks of the log file included in the key
+block_size = 65536
+
+
+def logfile(input):
+    """Return name of the log file if the input is a regular
+    file that is large enough for its results to be cached
+    or None otherwise.
+
+    :param input: open log file
+    """
+    if not settings.results_cache:
+        return None
+    name = getattr(input, "name", None)
+    if not isinstance(name, str) or not os.path.isfile(name):
+        return None
+    if os.path.getsize(name) < min_size:
+        return None
+    return name
+
+
+def key(logfile, steps=True):
+    """Return cache key of the results of the log file
+    that is based on its size, modification time
+    and the hash of the head and tail blocks.
+
+    :param logfile: log file name
+    :param steps: results include steps, default: True
+    """
+    stat = os.stat(logfile)
+    digest = hashlib.sha1(
+        f"{version}:{__version__}:{steps}:{stat.st_size}:{stat.st_mtime_ns}".encode(
+            "utf-8"
+        )
+    )
+    with open(logfile, "rb") as fd:
+        digest.update(fd.read(block_size))
+        if stat.st_size > block_size:
+            fd.seek(max(block_size, stat.st_size - block_size))
+            digest.update(fd.read(block_size))
+    return digest.hexdigest()
+
+
+def filename(key):
+    """Return cache file name for the key.
+
+    :param key: cache key
+    """
+    return os.path.join(settings.results_cache, f"{key}{extension}")
+
+
+def load(key):
+    """Return cached results or None if results
+    are not in the cache or can't be loaded.
+
+    :param key: cache key
+    """
+    name = filename(key)
+    try:
+        with open(name, "rb") as fd:
+            results = pickle.load(fd)
+        # mark as recently used
+        os.utime(name)
+        return results
+    except FileNotFoundError:
+        return None
+    except Exception:
+        try:
+            os.remove(name)
+        except OSError:
+            pass
+        return None
+
+
+def store(key, results):
+    """Store results in the cache and evict least recently
+    used results if the total size of the cache exceeds
+    `settings.results_cache_size`.
+
+    :param key: cache key
+    :param results: results
+    """
+    try:
+        os.makedirs(settings.results_cache, exist_ok=True)
+        fd, name = tempfile.mkstemp(dir=settings.results_cache, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump(results, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(name, filename(key))
+        except BaseException:
+            os.remove(name)
+            raise
+        evict(settings.results_cache_size)
+    except OSError:
+        pass
+
+
+def evict(max_size):
+    """Remove least recently used results until
+    the total size of the cache is below the maximum size.
+
+    :param max_size: maximum total size in bytes
+    """
+    entries = []
+    for entry in os.scandir(settings.results_cache):
+        if entry.name.endswith(extension):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total_size = sum(size for _, size, _ in entries)
+
+    for _, size, path in sorted(entries):
+        if total_size <= max_size:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total_size -= size
@@ -22,6 +22,7 @@ def parser(extension="log"):
     return re.compile(
         r".*testflows\.(?P<ppid>\d+)\.(?P<ts>\d+)\.(?P<tss>\d+)\.(?P<pid>\d+)\."
         + extension
+        + "$"
     )
 
 
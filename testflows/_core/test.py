@@ -24,6 +24,7 @@ import inspect
 import builtins
 import functools
 import threading
+import json
 import importlib
 import cProfile
 
@@ -90,6 +91,9 @@ from .objects import NamedValue, OnlyTags, SkipTags
 from .objects import RSASecret, Secrets
 from .constants import name_sep, id_sep
 from .io import TestIO, LogWriter
+from .digest import hash_funcs, get_hash_func
+from .index import filename as index_filename
+from .log_index import LogIndex
 from .name import join, depth, match, escape, absname, isabs, basename, clean
 from .funcs import exception, pause, result, value, input
 from .init import init, _at_exit
@@ -108,6 +112,7 @@ from .cli.arg.type import (
     NoneValue,
     count as count_type,
     trace_level as trace_level_type,
+    codec as codec_type,
 )
 from .cli.text import danger, warning
 from .exceptions import exception as get_exception
@@ -146,7 +151,7 @@ tracer = tracing.getLogger(__name__)
 try:
     import testflows.database as database_module
 except:
-    database_module = None
+    from . import database as database_module
 
 output_formats = [
     "new-fails",
@@ -1389,6 +1394,46 @@ def cli_argparser(kwargs, argparser=None):
             "default: uses temporary log file"
         ),
     )
+    parser.add_argument(
+        "--protocol",
+        dest="_protocol",
+        metavar="version",
+        type=str,
+        choices=["v2", "v3"],
+        help=(
+            "log message protocol version, where v3 is a compact protocol "
+            "that does not repeat test fields in each message, default: v2"
+        ),
+    )
+    parser.add_argument(
+        "--log-codec",
+        dest="_log_codec",
+        metavar=codec_type.metavar,
+        type=codec_type,
+        help="log file compression codec and optional level, default: lzma",
+    )
+    parser.add_argument(
+        "--hash",
+        dest="_hash",
+        metavar="name",
+        type=str,
+        choices=list(hash_funcs),
+        help=(
+            "message hash function, either 'sha1', 'blake2b', 'crc32', "
+            "'block' to only rely on the checksum of each compressed block of messages "
+            "or 'none' to disable message hashing, default: sha1"
+        ),
+    )
+    parser.add_argument(
+        "--live-output",
+        dest="_live_output",
+        action="store_true",
+        help=(
+            "pass messages to the stdout output handler in-process "
+            "instead of reading them back from the log file, default: False"
+        ),
+        default=None,
+    )
     parser.add_argument(
         "--show-skipped",
         dest="_show_skipped",
@@ -1553,6 +1598,40 @@ def cli_argparser(kwargs, argparser=None):
     return main_parser, test_args_schema
 
 
+def get_reference_tests(reference):
+    """Return list of (name, type, result type, tags) of the tests
+    in the reference log excluding steps. The log index of the
+    reference log is used if it has one (see `tfs log index`).
+
+    :param reference: reference log file
+    """
+    logfile = getattr(reference, "name", None)
+    index = LogIndex.load(logfile) if isinstance(logfile, str) else None
+
+    if index is not None:
+        with index:
+            return [
+                (name, getattr(TestType, test_type), result_type, set(json.loads(tags)))
+                for name, test_type, result_type, tags in index.tests(
+                    fields=("name", "type", "result_type", "tags")
+                )
+                if test_type in ("Module", "Suite", "Test")
+            ]
+
+    results = {}
+    ResultsLogPipeline(reference, results, steps=False).run()
+
+    return [
+        (
+            test["result"]["result_test"],
+            getattr(TestType, test["result"]["test_type"]),
+            test["result"]["result_type"],
+            {tag["tag_value"] for tag in test["test"]["tags"]},
+        )
+        for test in results["tests"].values()
+    ]
+
+
 def parse_cli_args(kwargs, parser_schema):
     """Parse command line arguments.
 
@@ -1600,6 +1679,14 @@ def parse_cli_args(kwargs, parser_schema):
                 *output_formats, error="key 'output' value is not a valid format"
             ),
             schema.Optional("log"): str,
+            schema.Optional("protocol"): schema.Or(
+                "v2", "v3", error="key 'protocol' value is not a valid version"
+            ),
+            schema.Optional("log-codec"): schema.Use(codec_type),
+            schema.Optional("hash"): schema.Or(
+                *hash_funcs, error="key 'hash' value is not a valid hash"
+            ),
+            schema.Optional("live-output"): bool,
             schema.Optional("show-skipped"): bool,
             schema.Optional("show-retries"): bool,
             schema.Optional("repeat"): [schema.Use(repeat_type)],
@@ -1708,6 +1795,21 @@ def parse_cli_args(kwargs, parser_schema):
         settings.read_logfile = settings.write_logfile
         if os.path.exists(settings.write_logfile):
             os.remove(settings.write_logfile)
+        if os.path.exists(index_filename(settings.write_logfile)):
+            os.remove(index_filename(settings.write_logfile))
+        settings.protocol = get(
+            args.pop("_protocol", None), get(settings.protocol, "v2")
+        )
+        settings.log_codec = get(
+            args.pop("_log_codec", None), get(settings.log_codec, "lzma")
+        )
+        hash_name = args.pop("_hash", None)
+        if hash_name is not None:
+            settings.hash_name = hash_name
+            settings.hash_func = get_hash_func(hash_name)
+        settings.live_output = get(
+            args.pop("_live_output", None), get(settings.live_output, False)
+        )
 
         settings.output_format = get(
             args.pop("_output", None), get(settings.output_format, "nice")
@@ -1848,8 +1950,7 @@ def parse_cli_args(kwargs, parser_schema):
             if not args.get("_reference"):
                 raise ExitWithError(f"--reference argument must be specified")
 
-            results = {}
-            ResultsLogPipeline(args.pop("_reference"), results, steps=False).run()
+            reference_tests = get_reference_tests(args.pop("_reference"))
 
             if kwargs.get("only") is None:
                 kwargs["only"] = []
@@ -1887,14 +1988,9 @@ def parse_cli_args(kwargs, parser_schema):
                 elif r == "skip":
                     result_types += ["Skip"]
 
-            for test in results["tests"].values():
-                result = test["result"]
-                test_type = getattr(TestType, result["test_type"])
-                test_name = result["result_test"]
-                test_tags = {tag["tag_value"] for tag in test["test"]["tags"]}
-
+            for test_name, test_type, result_type, test_tags in reference_tests:
                 if test_type >= TestType.Test:
-                    if result["result_type"] in result_types:
+                    if result_type in result_types:
                         found = False
                         for rerun_test in rerun_tests:
                             if rerun_test.name.startswith(test_name):
@@ -26,6 +26,7 @@ from testflows._core.utils.timefuncs import strftime, strftimedelta
 from testflows._core.utils.timefuncs import localfromtimestamp
 from testflows._core.name import split, basename, parentname, sep
 from testflows._core.cli.colors import color, cursor_up
+from testflows._core.transform.log.subscribe import subscribe
 
 strip_nones = re.compile(r"( None)+$")
 indent = " " * 2
@@ -559,6 +560,7 @@ formatters = {
 }
 
 
+@subscribe(*formatters)
 def transform(show_input=True):
     """Transform parsed log line into a brisk format
     that is similar to nice but excludes step definitions
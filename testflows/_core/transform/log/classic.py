@@ -23,6 +23,7 @@ from testflows._core.name import split
 from testflows._core.utils.timefuncs import strftime, strftimedelta
 from testflows._core.utils.timefuncs import localfromtimestamp
 from testflows._core.cli.colors import color, cursor_up
+from testflows._core.transform.log.subscribe import subscribe
 
 indent = " " * 2
 
@@ -161,6 +162,7 @@ formatters = {
 }
 
 
+@subscribe(*formatters)
 def transform(show_input=True):
     """Transform parsed log line into a classic format."""
     line = None
@@ -18,6 +18,7 @@ from testflows._core.flags import Flags, SKIP
 from testflows._core.cli.colors import color
 from testflows._core.message import Message
 from testflows._core.testtype import TestType
+from testflows._core.transform.log.subscribe import subscribe
 
 width = 70
 count = 0
@@ -90,6 +91,7 @@ formatters = {
 }
 
 
+@subscribe(*formatters)
 def transform(stop_event, show_input=True):
     """Transform parsed log line into a short format."""
     line = None
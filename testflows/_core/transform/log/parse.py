@@ -15,15 +15,32 @@
 import testflows.settings as settings
 
 from testflows._core.constants import id_sep
-from testflows._core.message import Message, loads
+from testflows._core.message import Message, CompactMessageDecoder
 
 
-def transform():
-    """Transform log line by parsing it."""
+def transform(lazy=False):
+    """Transform log line or a list of log lines by parsing it.
+
+    :param lazy: return lazy messages that are only fully decoded
+        when fields other than the message keyword are accessed,
+        use when most messages are ignored by the next steps, default: False
+    """
     msg = None
     parsed_msg = None
+    decoder = CompactMessageDecoder()
+    loads = decoder.decode_lazy if lazy else decoder.decode
 
     while True:
+        if type(msg) is list:
+            parsed_msg = []
+            for line in msg:
+                try:
+                    parsed_msg.append(loads(line))
+                except (IndexError, Exception):
+                    pass
+            msg = yield parsed_msg or None
+            continue
+
         if msg is not None:
             try:
                 parsed_msg = loads(msg)
@@ -16,6 +16,7 @@ import threading
 
 from testflows._core.message import Message
 from testflows._core.testtype import TestType
+from testflows._core import results_cache
 from .read import transform as read_transform
 from .read_raw import transform as read_raw_transform
 from .parse import transform as parse_transform
@@ -34,6 +35,7 @@ from .fails import transform as fails_transform
 from .manual import transform as manual_transform
 from .quiet import transform as quiet_transform
 from .read_and_filter import transform as read_and_filter_transform
+from .read_and_parse import transform as read_and_parse_transform, parse_jobs
 from .report.passing import transform as passing_report_transform
 from .report.fails import transform as fails_report_transform
 from .report.unstable import transform as unstable_report_transform
@@ -42,6 +44,12 @@ from .report.version import transform as version_report_transform
 from .report.coverage import transform as coverage_report_transform
 from .report.metrics import transform as metrics_transform
 from .report.results import transform as results_transform
+from .query import transform as query_transform, keywords as query_keywords
+
+
+# default number of log lines processed at once
+# by pipelines that support batched execution
+batch_size = 4096
 
 
 class Pipeline(object):
@@ -77,19 +85,81 @@ def fanout(*steps):
     multiple steps and produces
     a list of outputs from each step.
 
+    Steps that subscribe to specific message keywords
+    only receive messages with these keywords
+    while STOP message and None are sent to all steps.
+
+    If input is a list of messages then each message
+    is fed to the steps in order and the outputs
+    for all the messages are combined into one list.
+
     :param *steps: fan out steps
     """
+    sends = [step.send for step in steps]
+    stop_keyword = Message.STOP.name
+    # steps that receive messages with a given keyword
+    routes = {stop_keyword: sends}
+
+    def route(keyword):
+        targets = routes[keyword] = [
+            step.send
+            for step in steps
+            if getattr(step, "keywords", None) is None or keyword in step.keywords
+        ]
+        return targets
+
     item = None
     outputs = []
     while True:
-        for step in steps:
-            output = step.send(item)
+        if item is None:
+            targets = sends
+        elif type(item) is list:
+            for msg in item:
+                keyword = msg["message_keyword"]
+                targets = routes.get(keyword)
+                if targets is None:
+                    targets = route(keyword)
+                for send in targets:
+                    output = send(msg)
+                    if output is not None:
+                        outputs.append(output)
+            targets = ()
+        else:
+            keyword = item["message_keyword"]
+            targets = routes.get(keyword)
+            if targets is None:
+                targets = route(keyword)
+        for send in targets:
+            output = send(item)
             if output is not None:
                 outputs.append(output)
         item = yield outputs or None
         outputs = []
 
 
+def batched(step, combinator="".join):
+    """Single step of pipeline that
+    feeds each item of an input list to the step
+    and combines the outputs using the combinator.
+    Any other input is passed to the step as is.
+
+    :param step: step
+    :param combinator: combinator, default: "".join
+    """
+    next(step)
+    item = yield None
+    while True:
+        if type(item) is list:
+            outputs = []
+            for msg in item:
+                output = step.send(msg)
+                if output is not None:
+                    outputs.append(output)
+            item = yield combinator(outputs) or None
+        else:
+            item = yield step.send(item)
+
+
 def fanin(combinator):
     """Combine multiple outputs into one.
     using the combinator
@@ -102,12 +172,12 @@ def fanin(combinator):
 
 
 class RawLogPipeline(Pipeline):
-    def __init__(self, input, output, tail=False):
+    def __init__(self, input, output, tail=False, expand=False):
         stop_event = threading.Event()
 
         steps = [
             read_transform(input, tail=tail, stop=stop_event),
-            raw_transform(),
+            raw_transform(expand=expand),
             write_transform(output),
             stop_transform(stop_event),
         ]
@@ -127,13 +197,13 @@ class ReadRawLogPipeline(Pipeline):
 
 
 class QuietLogPipeline(Pipeline):
-    def __init__(self, input, output, tail=False, show_input=True):
+    def __init__(self, input, output, tail=False, show_input=True, batch=batch_size):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
-            parse_transform(),
-            quiet_transform(show_input=show_input),
+            read_transform(input, tail=tail, stop=stop_event, batch=batch),
+            parse_transform(lazy=True),
+            batched(quiet_transform(show_input=show_input)),
             write_transform(output),
             stop_transform(stop_event),
         ]
@@ -141,12 +211,12 @@ class QuietLogPipeline(Pipeline):
 
 
 class ShortLogPipeline(Pipeline):
-    def __init__(self, input, output, tail=False, show_input=True):
+    def __init__(self, input, output, tail=False, show_input=True, batch=batch_size):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
-            parse_transform(),
+            read_transform(input, tail=tail, stop=stop_event, batch=batch),
+            parse_transform(lazy=True),
             fanout(
                 short_transform(show_input=show_input),
                 passing_report_transform(stop_event),
@@ -164,12 +234,25 @@ class ShortLogPipeline(Pipeline):
 
 
 class NiceLogPipeline(Pipeline):
-    def __init__(self, input, output, tail=False, show_input=True):
+    def __init__(
+        self, input, output, tail=False, show_input=True, batch=batch_size, jobs=None
+    ):
         stop_event = threading.Event()
 
+        if batch and not tail and parse_jobs(jobs) > 1:
+            parse_steps = [
+                read_and_parse_transform(
+                    input, stop=stop_event, batch=batch, jobs=jobs
+                ),
+            ]
+        else:
+            parse_steps = [
+                read_transform(input, tail=tail, stop=stop_event, batch=batch),
+                parse_transform(),
+            ]
+
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
-            parse_transform(),
+            *parse_steps,
             fanout(
                 nice_transform(show_input=show_input),
                 passing_report_transform(stop_event),
@@ -187,11 +270,11 @@ class NiceLogPipeline(Pipeline):
 
 
 class ParallelNiceLogPipeline(Pipeline):
-    def __init__(self, input, output, tail=False, show_input=True):
+    def __init__(self, input, output, tail=False, show_input=True, batch=batch_size):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
+            read_transform(input, tail=tail, stop=stop_event, batch=batch),
             parse_transform(),
             fanout(
                 nice_transform(show_input=show_input, add_test_name_prefix=True),
@@ -210,11 +293,11 @@ class ParallelNiceLogPipeline(Pipeline):
 
 
 class BriskLogPipeline(Pipeline):
-    def __init__(self, input, output, tail=False, show_input=True):
+    def __init__(self, input, output, tail=False, show_input=True, batch=batch_size):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
+            read_transform(input, tail=tail, stop=stop_event, batch=batch),
             parse_transform(),
             fanout(
                 brisk_transform(show_input=show_input),
@@ -233,11 +316,11 @@ class BriskLogPipeline(Pipeline):
 
 
 class PlainLogPipeline(Pipeline):
-    def __init__(self, input, output, tail=False, show_input=True):
+    def __init__(self, input, output, tail=False, show_input=True, batch=batch_size):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
+            read_transform(input, tail=tail, stop=stop_event, batch=batch),
             parse_transform(),
             fanout(
                 plain_transform(show_input=show_input),
@@ -256,12 +339,12 @@ class PlainLogPipeline(Pipeline):
 
 
 class SlickLogPipeline(Pipeline):
-    def __init__(self, input, output, tail=False, show_input=True):
+    def __init__(self, input, output, tail=False, show_input=True, batch=batch_size):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
-            parse_transform(),
+            read_transform(input, tail=tail, stop=stop_event, batch=batch),
+            parse_transform(lazy=True),
             fanout(
                 slick_transform(show_input=show_input),
                 passing_report_transform(stop_event),
@@ -279,11 +362,11 @@ class SlickLogPipeline(Pipeline):
 
 
 class ManualLogPipeline(Pipeline):
-    def __init__(self, input, output, tail=False, show_input=True):
+    def __init__(self, input, output, tail=False, show_input=True, batch=batch_size):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
+            read_transform(input, tail=tail, stop=stop_event, batch=batch),
             parse_transform(),
             fanout(
                 manual_transform(show_input=show_input),
@@ -302,12 +385,12 @@ class ManualLogPipeline(Pipeline):
 
 
 class ClassicLogPipeline(Pipeline):
-    def __init__(self, input, output, tail=False, show_input=True):
+    def __init__(self, input, output, tail=False, show_input=True, batch=batch_size):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
-            parse_transform(),
+            read_transform(input, tail=tail, stop=stop_event, batch=batch),
+            parse_transform(lazy=True),
             fanout(
                 classic_transform(show_input=show_input),
                 passing_report_transform(stop_event),
@@ -336,12 +419,13 @@ class FailsLogPipeline(Pipeline):
         pnice=False,
         only_new=False,
         show_input=True,
+        batch=batch_size,
     ):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
-            parse_transform(),
+            read_transform(input, tail=tail, stop=stop_event, batch=batch),
+            parse_transform(lazy=True),
             fanout(
                 fails_transform(
                     brisk=brisk,
@@ -364,12 +448,12 @@ class FailsLogPipeline(Pipeline):
 
 
 class DotsLogPipeline(Pipeline):
-    def __init__(self, input, output, tail=False, show_input=True):
+    def __init__(self, input, output, tail=False, show_input=True, batch=batch_size):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
-            parse_transform(),
+            read_transform(input, tail=tail, stop=stop_event, batch=batch),
+            parse_transform(lazy=True),
             fanout(
                 dots_transform(stop_event, show_input=show_input),
                 passing_report_transform(stop_event),
@@ -387,12 +471,12 @@ class DotsLogPipeline(Pipeline):
 
 
 class ProgressLogPipeline(Pipeline):
-    def __init__(self, input, output, tail=False, show_input=True):
+    def __init__(self, input, output, tail=False, show_input=True, batch=batch_size):
         stop_event = threading.Event()
 
         steps = [
-            read_transform(input, tail=tail, stop=stop_event),
-            parse_transform(),
+            read_transform(input, tail=tail, stop=stop_event, batch=batch),
+            parse_transform(lazy=True),
             fanout(
                 progress_transform(stop_event, show_input=show_input),
                 passing_report_transform(stop_event),
@@ -414,11 +498,9 @@ class MetricsLogPipeline(Pipeline):
         stop_event = threading.Event()
 
         message_types = [Message.METRIC.name, Message.STOP.name]
-        grep = 'grep -E \'^\\{"message_keyword":"'
-        command = f"{grep}({'|'.join(message_types)})\"'"
 
         steps = [
-            read_and_filter_transform(input, command=command, stop=stop_event),
+            read_and_filter_transform(input, keywords=message_types, stop=stop_event),
             parse_transform(),
             metrics_transform(metrics),
             stop_transform(stop_event),
@@ -427,15 +509,15 @@ class MetricsLogPipeline(Pipeline):
 
 
 class ResultsReportLogPipeline(Pipeline):
-    def __init__(self, input, output):
+    def __init__(self, input, output, batch=batch_size):
         stop_event = threading.Event()
 
         message_types = [Message.TEST.name, Message.RESULT.name, Message.STOP.name]
-        grep = 'grep -E \'^\\{"message_keyword":"'
-        command = f"{grep}({'|'.join(message_types)})\"'"
 
         steps = [
-            read_and_filter_transform(input, command=command, stop=stop_event),
+            read_and_filter_transform(
+                input, keywords=message_types, stop=stop_event, batch=batch
+            ),
             parse_transform(),
             fanout(
                 passing_report_transform(stop_event),
@@ -453,15 +535,15 @@ class ResultsReportLogPipeline(Pipeline):
 
 
 class TotalsReportLogPipeline(Pipeline):
-    def __init__(self, input, output):
+    def __init__(self, input, output, batch=batch_size):
         stop_event = threading.Event()
 
         message_types = [Message.TEST.name, Message.RESULT.name, Message.STOP.name]
-        grep = 'grep -E \'^\\{"message_keyword":"'
-        command = f"{grep}({'|'.join(message_types)})\"'"
 
         steps = [
-            read_and_filter_transform(input, command=command, stop=stop_event),
+            read_and_filter_transform(
+                input, keywords=message_types, stop=stop_event, batch=batch
+            ),
             parse_transform(),
             fanout(
                 totals_report_transform(stop_event, divider=""),
@@ -474,15 +556,15 @@ class TotalsReportLogPipeline(Pipeline):
 
 
 class FailsReportLogPipeline(Pipeline):
-    def __init__(self, input, output, only_new=False):
+    def __init__(self, input, output, only_new=False, batch=batch_size):
         stop_event = threading.Event()
 
         message_types = [Message.RESULT.name, Message.STOP.name]
-        grep = 'grep -E \'^\\{"message_keyword":"'
-        command = f"{grep}({'|'.join(message_types)})\"'"
 
         steps = [
-            read_and_filter_transform(input, command=command, stop=stop_event),
+            read_and_filter_transform(
+                input, keywords=message_types, stop=stop_event, batch=batch
+            ),
             parse_transform(),
             fanout(
                 fails_report_transform(stop_event, divider="", only_new=only_new),
@@ -495,14 +577,14 @@ class FailsReportLogPipeline(Pipeline):
 
 
 class PassingReportLogPipeline(Pipeline):
-    def __init__(self, input, output):
+    def __init__(self, input, output, batch=batch_size):
         stop_event = threading.Event()
 
         message_types = [Message.RESULT.name, Message.STOP.name]
-        grep = 'grep -E \'^\\{"message_keyword":"'
-        command = f"{grep}({'|'.join(message_types)})\"'"
         steps = [
-            read_and_filter_transform(input, command=command, stop=stop_event),
+            read_and_filter_transform(
+                input, keywords=message_types, stop=stop_event, batch=batch
+            ),
             parse_transform(),
             fanout(
                 passing_report_transform(stop_event, divider=""),
@@ -515,14 +597,14 @@ class PassingReportLogPipeline(Pipeline):
 
 
 class UnstableReportLogPipeline(Pipeline):
-    def __init__(self, input, output):
+    def __init__(self, input, output, batch=batch_size):
         stop_event = threading.Event()
 
         message_types = [Message.RESULT.name, Message.STOP.name]
-        grep = 'grep -E \'^\\{"message_keyword":"'
-        command = f"{grep}({'|'.join(message_types)})\"'"
         steps = [
-            read_and_filter_transform(input, command=command, stop=stop_event),
+            read_and_filter_transform(
+                input, keywords=message_types, stop=stop_event, batch=batch
+            ),
             parse_transform(),
             fanout(
                 unstable_report_transform(stop_event, divider=""),
@@ -535,7 +617,7 @@ class UnstableReportLogPipeline(Pipeline):
 
 
 class CoverageReportLogPipeline(Pipeline):
-    def __init__(self, input, output):
+    def __init__(self, input, output, batch=batch_size):
         stop_event = threading.Event()
 
         message_types = [
@@ -545,11 +627,11 @@ class CoverageReportLogPipeline(Pipeline):
             Message.SPECIFICATION.name,
             Message.STOP.name,
         ]
-        grep = 'grep -E \'^\\{"message_keyword":"'
-        command = f"{grep}({'|'.join(message_types)})\"'"
 
         steps = [
-            read_and_filter_transform(input, command=command, stop=stop_event),
+            read_and_filter_transform(
+                input, keywords=message_types, stop=stop_event, batch=batch
+            ),
             parse_transform(),
             fanout(
                 coverage_report_transform(stop_event, divider=""),
@@ -562,14 +644,18 @@ class CoverageReportLogPipeline(Pipeline):
 
 
 class VersionReportLogPipeline(Pipeline):
-    def __init__(self, input, output):
+    def __init__(self, input, output, batch=batch_size):
         stop_event = threading.Event()
 
         message_types = [Message.VERSION.name, Message.STOP.name]
-        grep = 'grep -m2 -E \'^{"message_keyword":"'
-        command = f"{grep}({'|'.join(message_types)})\"'"
         steps = [
-            read_and_filter_transform(input, command=command, stop=stop_event),
+            read_and_filter_transform(
+                input,
+                keywords=message_types,
+                max_count=2,
+                stop=stop_event,
+                batch=batch,
+            ),
             parse_transform(),
             fanout(
                 version_report_transform(stop_event, divider=""),
@@ -582,8 +668,23 @@ class VersionReportLogPipeline(Pipeline):
 
 
 class ResultsLogPipeline(Pipeline):
-    def __init__(self, input, results, steps=True):
+    """Pipeline that processes log into results.
+
+    Results of large log files are stored in and loaded from
+    the results cache (see `testflows._core.results_cache`)
+    unless `cache` is False.
+    """
+
+    def __init__(
+        self, input, results, steps=True, batch=batch_size, jobs=None, cache=True
+    ):
         stop_event = threading.Event()
+        self.results = results
+        self.cache_key = None
+        if cache:
+            logfile = results_cache.logfile(input)
+            if logfile is not None:
+                self.cache_key = results_cache.key(logfile, steps=steps)
         message_types = [
             Message.PROTOCOL.name,
             Message.VERSION.name,
@@ -602,19 +703,95 @@ class ResultsLogPipeline(Pipeline):
             Message.STOP.name,
         ]
         test_types = [TestType.Module.name, TestType.Suite.name, TestType.Test.name]
-        command = 'grep -E \'^\\{"message_keyword":"'
-        command = (
-            f"{command}({'|'.join(message_types)})\""
-            + (('.+"test_type":"' + f"({'|'.join(test_types)})\"") if not steps else "")
-            + "'"
-        )
-        steps = [
-            read_and_filter_transform(input, command=command, stop=stop_event),
-            parse_transform(),
-            results_transform(results),
+
+        if batch and parse_jobs(jobs) > 1:
+            steps = [
+                read_and_parse_transform(
+                    input,
+                    keywords=message_types,
+                    test_types=test_types if not steps else None,
+                    stop=stop_event,
+                    batch=batch,
+                    jobs=jobs,
+                ),
+                batched(results_transform(results), combinator=list),
+                stop_transform(stop_event),
+            ]
+        else:
+            steps = [
+                read_and_filter_transform(
+                    input,
+                    keywords=message_types,
+                    test_types=test_types if not steps else None,
+                    stop=stop_event,
+                ),
+                parse_transform(),
+                results_transform(results),
+                stop_transform(stop_event),
+            ]
+        super(ResultsLogPipeline, self).__init__(steps, stop=stop_event)
+
+    def run(self):
+        """Execute pipeline or load results from the cache."""
+        if self.cache_key is not None:
+            cached = results_cache.load(self.cache_key)
+            if cached is not None:
+                self.results.update(cached)
+                return
+
+        super(ResultsLogPipeline, self).run()
+
+        if self.cache_key is not None:
+            results_cache.store(self.cache_key, self.results)
+
+
+class QueryLogPipeline(Pipeline):
+    """Pipeline that loads log into the query database
+    (see `testflows._core.transform.log.query`).
+
+    :param input: input log
+    :param loader: query database loader
+    :param run: run number of the log
+    :param tail: tail mode, default: False
+    """
+
+    def __init__(
+        self, input, loader, run, tail=False, batch=batch_size, jobs=None
+    ):
+        stop_event = threading.Event()
+        self.loader = loader
+
+        if batch and not tail and parse_jobs(jobs) > 1:
+            steps = [
+                read_and_parse_transform(
+                    input,
+                    keywords=query_keywords,
+                    stop=stop_event,
+                    batch=batch,
+                    jobs=jobs,
+                ),
+            ]
+        else:
+            steps = [
+                read_and_filter_transform(
+                    input,
+                    keywords=query_keywords,
+                    tail=tail,
+                    stop=stop_event,
+                    batch=batch,
+                ),
+                parse_transform(),
+            ]
+        steps += [
+            query_transform(loader, run),
             stop_transform(stop_event),
         ]
-        super(ResultsLogPipeline, self).__init__(steps, stop=stop_event)
+        super(QueryLogPipeline, self).__init__(steps, stop=stop_event)
+
+    def run(self):
+        """Execute pipeline and insert pending rows."""
+        super(QueryLogPipeline, self).run()
+        self.loader.flush()
 
 
 class CompactRawLogPipeline(Pipeline):
@@ -637,14 +814,13 @@ class CompactRawLogPipeline(Pipeline):
             Message.STOP.name,
         ]
         test_types = [TestType.Module.name, TestType.Suite.name, TestType.Test.name]
-        command = 'grep -E \'^\\{"message_keyword":"'
-        command = (
-            f"{command}({'|'.join(message_types)})\""
-            + (('.+"test_type":"' + f"({'|'.join(test_types)})\"") if not steps else "")
-            + "'"
-        )
         steps = [
-            read_and_filter_transform(input, command=command, stop=stop_event),
+            read_and_filter_transform(
+                input,
+                keywords=message_types,
+                test_types=test_types if not steps else None,
+                stop=stop_event,
+            ),
             raw_transform(),
             write_transform(output),
             stop_transform(stop_event),
@@ -24,6 +24,7 @@ from testflows._core.message import Message
 from testflows._core.objects import ExamplesTable
 from testflows._core.name import split, basename, parentname, sep
 from testflows._core.cli.colors import color
+from testflows._core.transform.log.subscribe import subscribe
 
 strip_nones = re.compile(r"( None)+$")
 indent = " " * 2
@@ -505,6 +506,7 @@ formatters = {
 }
 
 
+@subscribe(*formatters)
 def transform(show_input=True):
     """Transform parsed log line into a plain format
     that is similar to nice but does not have indentation and
@@ -20,6 +20,7 @@ from testflows._core.message import Message
 from testflows._core.testtype import TestType
 from .report.totals import Counts
 from .short import format_result as format_failing_result
+from .subscribe import subscribe
 
 progress = [
     color("Executing", "white", attrs=["dim"]),
@@ -107,6 +108,7 @@ formatters = {
 }
 
 
+@subscribe(*formatters)
 def transform(stop_event, show_input=True):
     """Transform parsed log line into a progress format."""
     line = None
@@ -0,0 +1,305 @@
+# Copyright 2024 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import time
+
+from testflows._core.message import Message, dumps
+
+#: query database tables that are loaded from the messages
+#: with the specified keyword as (table name, columns),
+#: where columns are message fields, every table
+#: also has the `run` column that refers to the `runs` table
+tables = {
+    Message.TEST.name: (
+        "tests",
+        (
+            "test_id",
+            "test_name",
+            "test_type",
+            "test_subtype",
+            "test_flags",
+            "test_cflags",
+            "test_level",
+            "test_parent_type",
+            "test_module",
+            "test_uid",
+            "test_description",
+            "message_time",
+        ),
+    ),
+    Message.RESULT.name: (
+        "results",
+        (
+            "test_id",
+            "test_name",
+            "test_type",
+            "test_subtype",
+            "result_type",
+            "result_message",
+            "result_reason",
+            "result_test",
+            "message_time",
+            "message_rtime",
+        ),
+    ),
+    Message.ATTRIBUTE.name: (
+        "attributes",
+        (
+            "test_id",
+            "test_name",
+            "attribute_name",
+            "attribute_value",
+            "attribute_type",
+            "attribute_group",
+            "attribute_uid",
+        ),
+    ),
+    Message.TAG.name: (
+        "tags",
+        (
+            "test_id",
+            "test_name",
+            "tag_value",
+        ),
+    ),
+    Message.REQUIREMENT.name: (
+        "requirements",
+        (
+            "test_id",
+            "test_name",
+            "requirement_name",
+            "requirement_version",
+            "requirement_description",
+            "requirement_link",
+            "requirement_priority",
+            "requirement_type",
+            "requirement_group",
+            "requirement_uid",
+            "requirement_level",
+            "requirement_num",
+        ),
+    ),
+    Message.METRIC.name: (
+        "metrics",
+        (
+            "test_id",
+            "test_name",
+            "metric_name",
+            "metric_value",
+            "metric_units",
+            "metric_type",
+            "metric_group",
+            "metric_uid",
+            "message_time",
+        ),
+    ),
+    Message.VALUE.name: (
+        "values",
+        (
+            "test_id",
+            "test_name",
+            "value_name",
+            "value_value",
+            "value_type",
+            "value_group",
+            "value_uid",
+            "message_time",
+        ),
+    ),
+}
+
+#: message keywords that are loaded into the query database
+keywords = [
+    Message.PROTOCOL.name,
+    Message.VERSION.name,
+    Message.STOP.name,
+] + list(tables)
+
+#: columns of the runs table that has one record per log
+run_columns = ("log", "protocol_version", "framework_version", "started")
+
+
+def schema():
+    """Return SQL script that creates the tables
+    of the query database if they do not exist.
+    """
+    script = [
+        "CREATE TABLE IF NOT EXISTS runs"
+        f" (run INTEGER PRIMARY KEY, {', '.join(run_columns)});"
+    ]
+    for table, columns in tables.values():
+        script.append(
+            f'CREATE TABLE IF NOT EXISTS "{table}" (run, {", ".join(columns)});'
+        )
+    return "\n".join(script)
+
+
+def indexes():
+    """Return SQL script that creates the indexes
+    of the query database if they do not exist.
+    """
+    script = []
+    for table, columns in tables.values():
+        script.append(
+            f'CREATE INDEX IF NOT EXISTS "{table}_test_id"'
+            f' ON "{table}" (run, test_id);'
+        )
+    script.append(
+        "CREATE INDEX IF NOT EXISTS tests_test_name ON tests (test_name, run);"
+    )
+    return "\n".join(script)
+
+
+#: columns whose values can be other than strings and numbers
+adapted_columns = frozenset(
+    (
+        "attribute_value",
+        "tag_value",
+        "metric_value",
+        "value_value",
+    )
+)
+
+
+def adapt(value):
+    """Return value that can be stored in the database
+    by serializing values other than strings and numbers.
+    """
+    if value is None or type(value) in (str, int, float, bool):
+        return value
+    return dumps(value)
+
+
+class Loader(object):
+    """Loads messages of one or more logs into the tables
+    of the query database using batched inserts
+    where each batch is inserted in one transaction.
+
+    :param conn: database connection
+    :param batch: number of rows in a batch, default: 4096
+    :param interval: maximum time in seconds pending rows are kept
+        before they are inserted when messages keep arriving,
+        default: None (no limit)
+    """
+
+    def __init__(self, conn, batch=4096, interval=None):
+        self.conn = conn
+        self.batch = batch
+        self.interval = interval
+        self.flushed = time.monotonic()
+        self.rows = {table: [] for table, _ in tables.values()}
+        self.count = 0
+        # indexes of the row values that must be adapted
+        self.adapted = {
+            table: [
+                i + 1 for i, column in enumerate(columns) if column in adapted_columns
+            ]
+            for table, columns in tables.values()
+        }
+        self.inserts = {
+            table: f'INSERT INTO "{table}" VALUES ({", ".join(["?"] * (len(columns) + 1))})'
+            for table, columns in tables.values()
+        }
+        with self.conn:
+            self.conn.executescript(schema())
+
+    def add_run(self, log):
+        """Add log to the runs table and return its run number.
+
+        :param log: log file name
+        """
+        with self.conn:
+            return self.conn.execute(
+                "INSERT INTO runs (log) VALUES (?)", (log,)
+            ).lastrowid
+
+    def add(self, run, msg):
+        """Add message to the table of its keyword.
+
+        :param run: run number
+        :param msg: message
+        """
+        keyword = msg["message_keyword"]
+        table = tables.get(keyword)
+
+        if table is None:
+            if keyword == Message.PROTOCOL.name:
+                self.update_run(run, protocol_version=msg["protocol_version"])
+            elif keyword == Message.VERSION.name:
+                self.update_run(
+                    run,
+                    framework_version=msg["framework_version"],
+                    started=msg["message_time"],
+                )
+            return
+
+        table, columns = table
+        get = msg.get
+        row = [run] + [get(column) for column in columns]
+        for i in self.adapted[table]:
+            row[i] = adapt(row[i])
+        self.rows[table].append(row)
+        self.count += 1
+        if self.count >= self.batch or (
+            self.interval is not None
+            and time.monotonic() - self.flushed >= self.interval
+        ):
+            self.flush()
+
+    def update_run(self, run, **fields):
+        """Update fields of the run.
+
+        :param run: run number
+        :param **fields: fields
+        """
+        with self.conn:
+            self.conn.execute(
+                f"UPDATE runs SET {', '.join(f'{name} = ?' for name in fields)}"
+                " WHERE run = ?",
+                tuple(fields.values()) + (run,),
+            )
+
+    def flush(self):
+        """Insert pending rows in one transaction."""
+        with self.conn:
+            for table, rows in self.rows.items():
+                if rows:
+                    self.conn.executemany(self.inserts[table], rows)
+                    rows.clear()
+        self.count = 0
+        self.flushed = time.monotonic()
+
+    def close(self):
+        """Insert pending rows and create indexes."""
+        self.flush()
+        with self.conn:
+            self.conn.executescript(indexes())
+
+
+def transform(loader, run):
+    """Transform parsed log by loading messages
+    or lists of messages into the query database.
+
+    :param loader: query database loader
+    :param run: run number of the log
+    """
+    msg = None
+    while True:
+        if msg is not None:
+            if type(msg) is list:
+                for m in msg:
+                    loader.add(run, m)
+            else:
+                loader.add(run, msg)
+        msg = yield msg
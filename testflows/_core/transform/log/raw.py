@@ -12,12 +12,26 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-def transform():
-    """Transform raw message into raw format."""
+from testflows._core.message import CompactMessageDecoder, dumps
+
+
+def transform(expand=False):
+    """Transform raw message into raw format.
+
+    :param expand: expand compact messages, default: False
+    """
     msg = None
+    decode = CompactMessageDecoder().decode
     while True:
         if msg is not None:
-            if msg[0] != "{" and msg[-1] != "}":
+            if msg[0] == "[":
+                if expand:
+                    try:
+                        msg = dumps(decode(msg)) + "\n"
+                    except Exception:
+                        msg = None
+                        continue
+            elif msg[0] != "{" and msg[-1] != "}":
                 msg = None
                 continue
         msg = yield msg
@@ -12,46 +12,148 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import time
+import itertools
 
 from testflows._core.message import Message
+from testflows._core.utils.watch import FileWatcher
 
 
-def transform(file, tail=False, offset=False, stop=None):
+def batches(file, batch, stop=None):
+    """Read lists of lines from a file-like object.
+    STOP message is always returned in a list of its own
+    and the stop event is set right before it is returned.
+
+    :param file: open file handle
+    :param batch: maximum number of lines in a list
+    :param stop: stop event
+    """
+    stop_keywords = (
+        '{"message_keyword":"%s"' % str(Message.STOP),
+        '["%s"' % str(Message.STOP),
+    )
+
+    while True:
+        lines = list(itertools.islice(file, batch))
+
+        if not lines:
+            break
+
+        if type(lines[0]) is bytes:
+            lines = [line.decode("utf-8") for line in lines]
+
+        if not lines[-1].endswith("\n"):
+            # incomplete last line at the end of the file
+            lines.pop()
+            if not lines:
+                break
+
+        if stop:
+            stops = [
+                i for i, line in enumerate(lines) if line.startswith(stop_keywords)
+            ]
+            start = 0
+            for i in stops:
+                if i > start:
+                    yield lines[start:i]
+                stop.set()
+                yield lines[i : i + 1]
+                start = i + 1
+            if start:
+                lines = lines[start:]
+                if not lines:
+                    continue
+
+        yield lines
+
+
+def lines(file, tail=False):
+    """Read complete lines from a file-like object.
+
+    Incomplete line at the end of the file is dropped unless
+    in tail mode where it is returned once it is complete.
+
+    :param file: open file handle
+    :param tail: tail mode, default: False
+    """
+    watcher = None
+    parts = []
+
+    try:
+        while True:
+            for line in file:
+                if line[-1:] not in ("\n", b"\n"):
+                    parts.append(line)
+                    continue
+
+                if parts:
+                    parts.append(line)
+                    line = line[:0].join(parts)
+                    parts = []
+
+                yield line
+
+            if not tail:
+                break
+
+            if watcher is None:
+                # check for data written before the watch was added
+                watcher = FileWatcher(getattr(file, "name", None))
+                continue
+            watcher.wait()
+    finally:
+        if watcher is not None:
+            watcher.close()
+
+
+def transform(file, tail=False, offset=False, stop=None, batch=None):
     """Read lines from a file-like object.
 
+    With offset, lines are read from the underlying binary buffer
+    of a text file so that byte offsets are counted without
+    re-encoding the lines.
+
     :param file: open file handle
     :param tail: tail mode, default: False
     :param offset: include offset with the message, default: False
     :param stop: stop event
+    :param batch: return lists of up to this number of lines
+        (not supported in tail mode or with offset), default: None
     """
     yield None
-    line = ""
-    pos = 0
-    stop_keyword = '{"message_keyword":"%s"' % str(Message.STOP)
-    stop_keyword_len = len(stop_keyword)
 
-    while True:
-        data = file.readline()
+    if batch and not tail and not offset:
+        yield from batches(file, batch, stop=stop)
+        return
 
-        if type(data) is bytes:
-            data = data.decode("utf-8")
+    stop_keywords = (
+        '{"message_keyword":"%s"' % str(Message.STOP),
+        '["%s"' % str(Message.STOP),
+    )
 
-        line += data
+    if offset:
+        # keep the reference to the text file so that
+        # the buffer is not closed when the text file is collected
+        buffer = getattr(file, "buffer", file)
+        pos = 0
+        for line in lines(buffer, tail=tail):
+            if type(line) is bytes:
+                size = len(line)
+                line = line.decode("utf-8")
+            else:
+                size = len(line.encode("utf-8"))
 
-        if line.endswith("\n"):
-            if stop and line[:stop_keyword_len] == stop_keyword:
+            if stop and line.startswith(stop_keywords):
                 stop.set()
 
-            if offset:
-                yield (line, pos)
-                pos += len(line.encode("utf-8"))
-            else:
-                yield line
+            yield (line, pos)
+            pos += size
+        return
 
-            line = ""
+    for line in lines(file, tail=tail):
+        if type(line) is bytes:
+            line = line.decode("utf-8")
 
-        if data == "":
-            if not tail:
-                break
-            time.sleep(0.15)
+        if stop and line.startswith(stop_keywords):
+            stop.set()
+
+        yield line
@@ -12,49 +12,276 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import subprocess
+import re
+import json
 
-from testflows._core.message import Message
+from testflows._core.message import Message, CompactMessageDecoder, dumps
 
+#: message keyword prefix of a message
+keyword_prefix = b'{"message_keyword":"'
+#: message object of a message
+message_object_re = re.compile(rb',"message_object":(\d+),')
+#: test name of a message
+test_name_re = re.compile(rb',"test_name":("(?:[^"\\]|\\.)*")')
+#: test type of a message
+test_type_re = re.compile(rb',"test_type":"([^"]*)"')
+#: test id field of a message
+test_id_field = b',"test_id":"'
+#: message keyword, message object, test handle and optional
+#: test prefix of a compact (TFSPv3) message
+compact_message_re = re.compile(
+    rb'^\["([A-Z]+)","[^"]*",(\d+),\d+,(?:null|"(?:[^"\\]|\\.)*"),\d+,[^,]+,[^,]+,"([^"]+)",(\{"0":)?'
+)
 
-def transform(file, command, tail=False, stop=None):
+
+class Filter(object):
+    """Filter of raw log messages that matches messages
+    on raw bytes before they are decoded.
+
+    Compact (TFSPv3) messages that match are expanded
+    into full messages.
+
+    :param keywords: message keywords, default: None (any)
+    :param test_name: test name regex pattern that must match
+        at the start of the test name, default: None (any)
+    :param exact: test name pattern must match the whole test name, default: False
+    :param test_types: test types, default: None (any)
+    :param message_object: message object, default: None (any)
+    :param test_id: test id prefix, default: None (any)
+    """
+
+    def __init__(
+        self,
+        keywords=None,
+        test_name=None,
+        exact=False,
+        test_types=None,
+        message_object=None,
+        test_id=None,
+    ):
+        self.keywords = None
+        if keywords is not None:
+            self.keywords = {str(keyword).encode("utf-8") for keyword in keywords}
+        self.test_name = None
+        if test_name is not None:
+            test_name = re.compile(test_name)
+            self.test_name = test_name.fullmatch if exact else test_name.match
+        self.test_types = None
+        if test_types is not None:
+            self.test_types = {str(test_type) for test_type in test_types}
+        self.message_object = message_object
+        self.test_id = test_id
+        self.raw_test_id = None
+        if test_id is not None:
+            self.raw_test_id = test_id_field + str(test_id).encode("utf-8")
+        self.decode = CompactMessageDecoder().decode
+        # matching results of test names
+        self.names = {}
+        # matching results of compact message test handles
+        self.handles = {}
+
+    def match_test(self, test_name, test_type, test_id=None):
+        """Return True if test name, test type and test id match."""
+        if self.test_types is not None and test_type not in self.test_types:
+            return False
+        if self.test_id is not None:
+            if test_id is None or not test_id.startswith(self.test_id):
+                return False
+        if self.test_name is not None:
+            if test_name is None or self.test_name(test_name) is None:
+                return False
+        return True
+
+    def match_name(self, raw_name):
+        """Return True if raw test name matches."""
+        matched = self.names.get(raw_name)
+        if matched is None:
+            matched = self.names[raw_name] = (
+                self.test_name(json.loads(raw_name)) is not None
+            )
+        return matched
+
+    def filter(self, line):
+        """Return message if it matches the filter
+        or None otherwise.
+
+        :param line: raw message (bytes)
+        """
+        if line[:1] == b"[":
+            return self.filter_compact(line)
+
+        if line[:1] != b"{":
+            return None
+
+        if self.keywords is not None:
+            start = len(keyword_prefix)
+            if line[:start] != keyword_prefix:
+                return None
+            if line[start : line.find(b'"', start)] not in self.keywords:
+                return None
+
+        if self.message_object is not None:
+            match = message_object_re.search(line)
+            if match is None or int(match.group(1)) != self.message_object:
+                return None
+
+        if self.raw_test_id is not None and self.raw_test_id not in line:
+            return None
+
+        if self.test_types is not None:
+            match = test_type_re.search(line)
+            if match is None or match.group(1).decode("utf-8") not in self.test_types:
+                return None
+
+        if self.test_name is not None:
+            match = test_name_re.search(line)
+            if match is None or not self.match_name(match.group(1)):
+                return None
+
+        return line.decode("utf-8")
+
+    def filter_compact(self, line):
+        """Return expanded compact (TFSPv3) message
+        if it matches the filter or None otherwise.
+
+        :param line: raw compact message (bytes)
+        """
+        match = compact_message_re.match(line)
+        if match is None:
+            return None
+
+        keyword, message_object, handle, prefix = match.groups()
+
+        if prefix is not None:
+            # messages that include test prefix are always decoded
+            # so that later messages of the test can be expanded
+            try:
+                msg = self.decode(line)
+            except Exception:
+                return None
+            self.handles[handle] = self.match_test(
+                msg.get("test_name"), msg.get("test_type"), msg.get("test_id")
+            )
+        else:
+            msg = None
+
+        if self.keywords is not None and keyword not in self.keywords:
+            return None
+
+        if self.message_object is not None:
+            if int(message_object) != self.message_object:
+                return None
+
+        if (
+            self.test_name is not None
+            or self.test_types is not None
+            or self.test_id is not None
+        ):
+            if not self.handles.get(handle, False):
+                return None
+
+        if msg is None:
+            try:
+                msg = self.decode(line)
+            except Exception:
+                return None
+
+        return dumps(msg) + "\n"
+
+
+def transform(
+    file,
+    keywords=None,
+    test_name=None,
+    exact=False,
+    test_types=None,
+    message_object=None,
+    test_id=None,
+    max_count=None,
+    tail=False,
+    stop=None,
+    batch=None,
+):
     """Read lines from a file-like object and
-    filter them using Unix grep utility.
+    filter them using native message filter.
 
     :param file: open file handle
-    :param command: filter command (like grep)
+    :param keywords: message keywords, default: None (any)
+    :param test_name: test name regex pattern that must match
+        at the start of the test name, default: None (any)
+    :param exact: test name pattern must match the whole test name, default: False
+    :param test_types: test types, default: None (any)
+    :param message_object: message object, default: None (any)
+    :param test_id: test id prefix, default: None (any)
+    :param max_count: stop after this number of matching messages, default: None
     :param tail: tail mode, default: False
     :param stop: stop event
+    :param batch: return lists of up to this number of lines
+        (not supported in tail mode) where STOP message
+        is always in a list of its own, default: None
     """
     yield None
 
-    stop_keyword = ('{"message_keyword":"%s"' % str(Message.STOP)).encode("utf-8")
+    stop_keyword = '{"message_keyword":"%s"' % str(Message.STOP)
     stop_keyword_len = len(stop_keyword)
 
-    process = subprocess.Popen(
-        f"tfs transform raw | {command}", stdin=file, stdout=subprocess.PIPE, shell=True
-    )
+    filter = Filter(
+        keywords=keywords,
+        test_name=test_name,
+        exact=exact,
+        test_types=test_types,
+        message_object=message_object,
+        test_id=test_id,
+    ).filter
 
-    while True:
-        line = process.stdout.readline()
+    # read raw bytes from the underlying buffer of a text file
+    # while keeping the reference to the text file so that
+    # the buffer is not closed when the text file is collected
+    buffer = getattr(file, "buffer", file)
+    count = 0
+    lines = []
+    # batching would delay output in tail mode
+    batch = None if tail else batch
 
-        if line == b"":
-            if not tail:
-                break
+    # input ends at the end of the file even in tail mode
+    # as tailing of the log is done by the file itself
+    for line in buffer:
+        if type(line) is str:
+            line = line.encode("utf-8")
 
-            if process.poll() is not None:
-                break
+        line = filter(line.rstrip(b"\n"))
 
+        if line is None:
             continue
 
+        if not line.endswith("\n"):
+            line += "\n"
+
         if stop and line[:stop_keyword_len] == stop_keyword:
+            if lines:
+                yield lines
+                lines = []
             stop.set()
 
-        yield line.decode("utf-8")
+        if batch:
+            lines.append(line)
+            if len(lines) >= batch or (stop and stop.is_set()):
+                yield lines
+                lines = []
+        else:
+            yield line
+
+        count += 1
 
         if stop and stop.is_set():
             break
 
+        if max_count is not None and count >= max_count:
+            break
+
+    if lines:
+        yield lines
+
     if stop:
         stop.set()
 
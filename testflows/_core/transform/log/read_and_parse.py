@@ -0,0 +1,205 @@
+# Copyright 2024 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import json
+import threading
+import collections
+import multiprocessing
+import concurrent.futures
+
+import testflows.settings as settings
+
+from testflows._core.message import (
+    Message,
+    compact_keys,
+    test_prefix_fields,
+    message_keyword_prefix,
+    compact_message_re,
+    expand,
+)
+from .read import batches
+
+
+def parse_jobs(jobs=None):
+    """Return number of processes used to parse messages.
+
+    :param jobs: number of processes, default: None (`settings.parse_jobs`
+        or number of CPUs if not set)
+    """
+    if jobs is None:
+        jobs = settings.parse_jobs
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    return jobs
+
+
+def decode_chunk(lines, keywords=None, test_types=None):
+    """Decode and filter a chunk of log lines.
+
+    Compact (TFSPv3) messages that refer to a test prefix
+    that is not defined in the chunk are returned undecoded (as lists)
+    and must be expanded using `resolve_chunk`.
+
+    :param lines: list of log lines
+    :param keywords: message keywords, default: None (any)
+    :param test_types: test types, default: None (any)
+    :return: tuple of messages and test prefixes defined in the chunk
+    """
+    messages = []
+    prefixes = {}
+    test_id_key = compact_keys["test_id"]
+    start = len(message_keyword_prefix)
+
+    for line in lines:
+        try:
+            if line[:1] == "{":
+                if keywords is not None:
+                    if not line.startswith(message_keyword_prefix):
+                        continue
+                    if line[start : line.find('"', start)] not in keywords:
+                        continue
+                msg = json.loads(line)
+                if type(msg) is not dict:
+                    continue
+
+            else:
+                match = compact_message_re.match(line)
+                if match is None:
+                    continue
+                keyword, handle, prefix = match.groups()
+                # messages that include test prefix are always decoded
+                # so that later messages of the test can be expanded
+                if prefix is None and keywords is not None and keyword not in keywords:
+                    continue
+                msg = json.loads(line)
+                if test_id_key in msg[-1]:
+                    payload = msg[-1]
+                    prefixes[handle] = {
+                        field: payload[compact_keys[field]]
+                        for field in test_prefix_fields
+                    }
+                if keywords is not None and keyword not in keywords:
+                    continue
+                prefix = prefixes.get(handle)
+                if prefix is None:
+                    messages.append(msg)
+                    continue
+                msg = expand(msg, prefix)
+
+            if test_types is not None and msg.get("test_type") not in test_types:
+                continue
+
+        except Exception:
+            continue
+
+        messages.append(msg)
+
+    return messages, prefixes
+
+
+def resolve_chunk(messages, chunk_prefixes, prefixes, test_types=None):
+    """Expand compact (TFSPv3) messages of a decoded chunk
+    that refer to test prefixes defined in the previous chunks
+    and add test prefixes defined in the chunk.
+
+    :param messages: decoded messages of the chunk
+    :param chunk_prefixes: test prefixes defined in the chunk
+    :param prefixes: test prefixes defined in the previous chunks
+    :param test_types: test types, default: None (any)
+    """
+    resolved = []
+    for msg in messages:
+        if type(msg) is list:
+            prefix = prefixes.get(msg[-2])
+            if prefix is None:
+                continue
+            msg = expand(msg, prefix)
+            if test_types is not None and msg.get("test_type") not in test_types:
+                continue
+        resolved.append(msg)
+    prefixes.update(chunk_prefixes)
+    return resolved
+
+
+def transform(file, keywords=None, test_types=None, stop=None, batch=4096, jobs=None):
+    """Read, filter and parse log lines of a finished log
+    in chunks that are decoded in a process pool
+    and return lists of parsed messages in the original order.
+
+    At most `jobs * 2` chunks are decoded ahead of the reader.
+    Logs that fit into one chunk are parsed in-process.
+
+    :param file: open file handle
+    :param keywords: message keywords, default: None (any)
+    :param test_types: test types, default: None (any)
+    :param stop: stop event
+    :param batch: number of lines in a chunk, default: 4096
+    :param jobs: number of processes, default: None (see `parse_jobs`)
+    """
+    yield None
+
+    if keywords is not None:
+        keywords = {str(keyword) for keyword in keywords}
+    if test_types is not None:
+        test_types = {str(test_type) for test_type in test_types}
+
+    jobs = parse_jobs(jobs)
+    stop_keyword = Message.STOP.name
+    # test prefixes of compact messages
+    prefixes = {}
+    executor = None
+    pending = collections.deque()
+
+    def resolve(result):
+        messages = resolve_chunk(*result, prefixes, test_types=test_types)
+        # STOP message is always read in a chunk of its own
+        if stop and len(messages) == 1:
+            if messages[0]["message_keyword"] == stop_keyword:
+                stop.set()
+        return messages
+
+    try:
+        for lines in batches(file, batch, stop=threading.Event()):
+            if executor is None:
+                if jobs < 2 or len(lines) < batch:
+                    messages = resolve(decode_chunk(lines, keywords, test_types))
+                    if messages:
+                        yield messages
+                    continue
+
+                executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=jobs, mp_context=multiprocessing.get_context("fork")
+                )
+
+            pending.append(executor.submit(decode_chunk, lines, keywords, test_types))
+
+            while len(pending) > jobs * 2:
+                messages = resolve(pending.popleft().result())
+                if messages:
+                    yield messages
+
+        while pending:
+            messages = resolve(pending.popleft().result())
+            if messages:
+                yield messages
+
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    if stop:
+        stop.set()
+
+    yield None
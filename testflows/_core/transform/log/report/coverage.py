@@ -20,6 +20,7 @@ from testflows._core.message import Message
 from testflows._core.cli.colors import color
 from testflows._core.document.srs import Parser, visit_parse_tree
 from testflows._core.document.toc import Visitor as VisitorBase
+from testflows._core.transform.log.subscribe import subscribe
 
 
 def color_line(line):
@@ -257,6 +258,7 @@ def generate(coverages, divider):
     return report or None
 
 
+@subscribe(*formatters)
 def transform(stop, divider="\n"):
     """Totals report.
 
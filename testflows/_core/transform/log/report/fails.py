@@ -20,6 +20,7 @@ from testflows._core.testtype import TestType
 from testflows._core.message import Message
 from testflows._core.cli.colors import color
 from testflows._core.utils.timefuncs import strftimedelta
+from testflows._core.transform.log.subscribe import subscribe
 
 indent = " " * 2
 
@@ -148,6 +149,7 @@ def generate(results, divider, only_new=False):
     return report or None
 
 
+@subscribe(*processors)
 def transform(stop, divider="\n", only_new=False):
     """Transform parsed log line into a short format.
 
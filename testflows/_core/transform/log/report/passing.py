@@ -21,6 +21,7 @@ from testflows._core.message import Message
 from testflows._core.name import split
 from testflows._core.cli.colors import color
 from testflows._core.utils.timefuncs import strftimedelta
+from testflows._core.transform.log.subscribe import subscribe
 
 indent = " " * 2
 
@@ -89,6 +90,7 @@ def generate(results, divider):
     return report or None
 
 
+@subscribe(*processors)
 def transform(stop, divider="\n"):
     """Transform parsed log line into a short format."""
     line = None
@@ -12,6 +12,9 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from sys import intern
+from collections.abc import MutableMapping
+
 from testflows._core.name import parentname
 from testflows._core.message import Message
 from testflows._core.transform.log.report.totals import Counts, all_counts
@@ -23,6 +26,144 @@ from testflows._core.transform.log.report.totals import (
 )
 
 
+#: message fields whose values are shared by many messages
+#: and are interned so that only one copy of each value is kept
+interned_fields = frozenset(
+    (
+        "message_keyword",
+        "message_stream",
+        "test_type",
+        "test_subtype",
+        "test_id",
+        "test_name",
+        "test_parent_type",
+        "test_module",
+        "test_uid",
+        "result_type",
+        "result_test",
+        "attribute_name",
+        "attribute_type",
+        "attribute_group",
+        "argument_name",
+        "argument_type",
+        "argument_group",
+        "tag_value",
+        "requirement_name",
+        "requirement_version",
+        "requirement_group",
+        "requirement_type",
+        "requirement_priority",
+        "specification_name",
+        "specification_version",
+        "metric_name",
+        "metric_units",
+        "metric_type",
+        "metric_group",
+        "value_name",
+        "value_type",
+        "value_group",
+        "ticket_name",
+        "ticket_type",
+        "ticket_group",
+        "example_fields",
+    )
+)
+
+#: shared field indexes and interned field flags of records by field names
+layouts = {}
+
+
+class Record(MutableMapping):
+    """Compact dictionary-like record of message fields.
+
+    Field names are kept in an index that is shared by all
+    the records that have the same fields and only field values
+    are stored in the record itself. Values of `interned_fields`
+    are interned.
+
+    :param fields: dictionary of fields
+    """
+
+    __slots__ = ("_index", "_values")
+
+    def __init__(self, fields):
+        self._set(fields)
+
+    def _set(self, fields):
+        names = tuple(fields)
+        layout = layouts.get(names)
+        if layout is None:
+            layout = layouts[names] = (
+                {intern(name): i for i, name in enumerate(names)},
+                tuple(name in interned_fields for name in names),
+            )
+        self._index, interned = layout
+        self._values = [
+            intern(value) if flag and type(value) is str else value
+            for flag, value in zip(interned, fields.values())
+        ]
+
+    def __getitem__(self, name):
+        return self._values[self._index[name]]
+
+    def get(self, name, default=None):
+        i = self._index.get(name)
+        if i is None:
+            return default
+        return self._values[i]
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __setitem__(self, name, value):
+        i = self._index.get(name)
+        if i is None:
+            self.update({name: value})
+        else:
+            if type(value) is str and name in interned_fields:
+                value = intern(value)
+            self._values[i] = value
+
+    def __delitem__(self, name):
+        if name not in self._index:
+            raise KeyError(name)
+        fields = dict(self)
+        del fields[name]
+        self._set(fields)
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def update(self, other=(), **kwargs):
+        fields = dict(zip(self._index, self._values))
+        fields.update(other, **kwargs)
+        self._set(fields)
+
+    def copy(self):
+        return Record(self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+def add(record, name, msg):
+    """Add message record to the list of messages in the record field.
+    Empty lists are kept as shared empty tuples until
+    the first message is added.
+
+    :param record: record
+    :param name: field name
+    :param msg: message record
+    """
+    messages = record[name]
+    if type(messages) is tuple:
+        messages = record[name] = []
+    messages.append(msg)
+
+
 def process_test(msg, results, names, unique):
     def add_name(name, names, unique, test_id):
         _name = name
@@ -37,18 +178,19 @@ def process_test(msg, results, names, unique):
 
     add_name(msg["test_name"], names, unique, msg["test_id"])
     test = {
-        "attributes": [],
-        "arguments": [],
-        "tags": [],
-        "specifications": [],
-        "requirements": [],
-        "maps": [],
-        "examples": [],
+        "attributes": (),
+        "arguments": (),
+        "tags": (),
+        "specifications": (),
+        "requirements": (),
+        "maps": (),
+        "examples": (),
     }
     test.update(msg)
+    test = Record(test)
     results["tests"][names[msg["test_id"]]] = {
         "test": test,
-        "result": {"tickets": [], "values": [], "metrics": []},
+        "result": Record({"tickets": (), "values": (), "metrics": ()}),
     }
     process_test_counts(msg, results["counts"])
 
@@ -75,44 +217,45 @@ def process_protocol(msg, results, names, unique):
 
 
 def process_attribute(msg, results, names, unique):
-    results["tests"][names[msg["test_id"]]]["test"]["attributes"].append(msg)
+    add(results["tests"][names[msg["test_id"]]]["test"], "attributes", Record(msg))
 
 
 def process_tag(msg, results, names, unique):
-    results["tests"][names[msg["test_id"]]]["test"]["tags"].append(msg)
+    add(results["tests"][names[msg["test_id"]]]["test"], "tags", Record(msg))
 
 
 def process_requirement(msg, results, names, unique):
-    results["tests"][names[msg["test_id"]]]["test"]["requirements"].append(msg)
+    add(results["tests"][names[msg["test_id"]]]["test"], "requirements", Record(msg))
 
 
 def process_specification(msg, results, names, unique):
+    msg = Record(msg)
     results["specifications"].append(msg)
-    results["tests"][names[msg["test_id"]]]["test"]["specifications"].append(msg)
+    add(results["tests"][names[msg["test_id"]]]["test"], "specifications", msg)
 
 
 def process_argument(msg, results, names, unique):
-    results["tests"][names[msg["test_id"]]]["test"]["arguments"].append(msg)
+    add(results["tests"][names[msg["test_id"]]]["test"], "arguments", Record(msg))
 
 
 def process_example(msg, results, names, unique):
-    results["tests"][names[msg["test_id"]]]["test"]["examples"].append(msg)
+    add(results["tests"][names[msg["test_id"]]]["test"], "examples", Record(msg))
 
 
 def process_map(msg, results, names, unique):
-    results["tests"][names[msg["test_id"]]]["test"]["maps"].append(msg)
+    add(results["tests"][names[msg["test_id"]]]["test"], "maps", Record(msg))
 
 
 def process_ticket(msg, results, names, unique):
-    results["tests"][names[msg["test_id"]]]["result"]["tickets"].append(msg)
+    add(results["tests"][names[msg["test_id"]]]["result"], "tickets", Record(msg))
 
 
 def process_metric(msg, results, names, unique):
-    results["tests"][names[msg["test_id"]]]["result"]["metrics"].append(msg)
+    add(results["tests"][names[msg["test_id"]]]["result"], "metrics", Record(msg))
 
 
 def process_value(msg, results, names, unique):
-    results["tests"][names[msg["test_id"]]]["result"]["values"].append(msg)
+    add(results["tests"][names[msg["test_id"]]]["result"], "values", Record(msg))
 
 
 processors = {
@@ -19,6 +19,7 @@ from testflows._core.testtype import TestType, TestSubType
 from testflows._core.message import Message
 from testflows._core.utils.timefuncs import strftimedelta
 from testflows._core.cli.colors import color
+from testflows._core.transform.log.subscribe import subscribe
 
 
 def color_line(line):
@@ -317,6 +318,7 @@ def all_counts():
     }
 
 
+@subscribe(*formatters)
 def transform(stop, divider="\n"):
     """Totals report.
 
@@ -20,6 +20,7 @@ from testflows._core.message import Message
 from testflows._core.name import split, parentname
 from testflows._core.cli.colors import color
 from testflows._core.transform.log.report.totals import Counts, color_result
+from testflows._core.transform.log.subscribe import subscribe
 
 indent = " " * 2
 
@@ -119,6 +120,7 @@ def generate(results, divider):
     return report or None
 
 
+@subscribe(*processors)
 def transform(stop, divider="\n"):
     """Generate unstable report.
 
@@ -17,8 +17,10 @@ import time
 from testflows._core.cli.colors import color
 from testflows._core.utils.timefuncs import localfromtimestamp
 from testflows._core.message import Message
+from testflows._core.transform.log.subscribe import subscribe
 
 
+@subscribe(Message.VERSION.name)
 def transform(stop, divider="\n"):
     """Transform parsed log line into a nice format.
 
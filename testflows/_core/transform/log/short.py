@@ -23,6 +23,7 @@ from testflows._core.message import Message
 from testflows._core.objects import ExamplesTable
 from testflows._core.name import split, parentname, basename
 from testflows._core.cli.colors import color, cursor_up
+from testflows._core.transform.log.subscribe import subscribe
 
 indent = " " * 2
 #: map of tests by name
@@ -485,6 +486,7 @@ formatters = {
 }
 
 
+@subscribe(*formatters)
 def transform(no_colors=False, show_input=True):
     """Transform parsed log line into a short format."""
     line = None
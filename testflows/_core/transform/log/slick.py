@@ -21,6 +21,7 @@ from testflows._core.testtype import TestType, TestSubType
 from testflows._core.message import Message
 from testflows._core.name import split, parentname, basename
 from testflows._core.cli.colors import color, cursor_up
+from testflows._core.transform.log.subscribe import subscribe
 
 indent = " " * 2
 
@@ -218,6 +219,7 @@ formatters = {
 }
 
 
+@subscribe(*formatters)
 def transform(show_input=True):
     """Transform parsed log line into a clean format."""
     last_test_id = []
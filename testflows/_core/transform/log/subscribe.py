@@ -0,0 +1,59 @@
+# Copyright 2024 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import functools
+
+
+class Subscriber(object):
+    """Transform step that only consumes parsed messages
+    with the specified message keywords.
+
+    :param step: transform generator
+    :param keywords: message keywords
+    """
+
+    __slots__ = ("step", "keywords", "send")
+
+    def __init__(self, step, keywords):
+        self.step = step
+        self.keywords = keywords
+        self.send = step.send
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.step)
+
+    def close(self):
+        self.step.close()
+
+
+def subscribe(*keywords):
+    """Declare message keywords that are consumed by the transform
+    so that `fanout` only sends it messages with these keywords.
+    STOP message and None are always sent to all transforms.
+
+    :param *keywords: message keywords
+    """
+    keywords = frozenset(str(keyword) for keyword in keywords)
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return Subscriber(func(*args, **kwargs), keywords)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,113 @@
+# Copyright 2024 Katteli Inc.
+# TestFlows.com Open-Source Software Testing Framework (http://testflows.com)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import sys
+import time
+import select
+import ctypes
+import ctypes.util
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_DELETE_SELF | IN_MOVE_SELF
+
+_libc = None
+
+
+def libc():
+    """Return libc that provides inotify functions
+    or None if inotify is not available."""
+    global _libc
+    if _libc is None:
+        _libc = False
+        if sys.platform.startswith("linux") and hasattr(select, "poll"):
+            try:
+                lib = ctypes.CDLL(
+                    ctypes.util.find_library("c") or "libc.so.6", use_errno=True
+                )
+                lib.inotify_init1.argtypes = [ctypes.c_int]
+                lib.inotify_add_watch.argtypes = [
+                    ctypes.c_int,
+                    ctypes.c_char_p,
+                    ctypes.c_uint32,
+                ]
+                _libc = lib
+            except (OSError, AttributeError):
+                pass
+    return _libc or None
+
+
+class FileWatcher(object):
+    """Waits for a file to be modified.
+
+    Uses inotify on Linux and falls back to sleeping
+    when inotify is not available.
+
+    :param filename: name of the file to watch
+    :param interval: sleep interval when inotify is not available,
+        default: 0.15 sec
+    :param timeout: maximum wait time when inotify is available,
+        default: 1 sec
+    """
+
+    def __init__(self, filename, interval=0.15, timeout=1.0):
+        self.interval = interval
+        self.timeout = timeout
+        self.fd = None
+        self.poll = None
+
+        lib = libc()
+        if lib is None or not isinstance(filename, (str, bytes)):
+            return
+
+        fd = lib.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return
+        if lib.inotify_add_watch(fd, os.fsencode(filename), IN_MASK) < 0:
+            os.close(fd)
+            return
+
+        self.fd = fd
+        self.poll = select.poll()
+        self.poll.register(fd, select.POLLIN)
+
+    def wait(self):
+        """Wait until the file is modified or timeout expires."""
+        if self.fd is None:
+            time.sleep(self.interval)
+            return
+
+        if self.poll.poll(self.timeout * 1000):
+            try:
+                while os.read(self.fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self):
+        """Stop watching the file."""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+            self.poll = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
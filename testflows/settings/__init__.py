@@ -20,7 +20,9 @@ debug = False
 time_resolution = 6
 #: hash length in bytes
 hash_length = 8
-#: hash function
+#: hash name
+hash_name = "sha1"
+#: hash function (None if messages are not hashed)
 hash_func = hashlib.sha1
 #: disable cli colors
 no_colors = False
@@ -31,6 +33,24 @@ output_format = None
 #: log file
 write_logfile = None
 read_logfile = None
+#: log segments that worker processes write to
+log_segments = None
+#: message protocol either v2 or compact v3
+protocol = "v2"
+#: log file codec name[:level]
+log_codec = "lzma"
+#: number of processes used to decompress large log files
+#: (None means number of CPUs)
+read_jobs = None
+#: number of processes used to parse messages of finished log files
+#: (None means number of CPUs)
+parse_jobs = None
+#: results cache directory, None disables the cache (see `tfs --results-cache`)
+results_cache = None
+#: maximum total size of the results cache in bytes
+results_cache_size = 1073741824
+#: live output (pass messages to the output handler in-process)
+live_output = False
 #: database
 database = None
 #: show skipped tests
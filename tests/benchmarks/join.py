@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# Latency and CPU benchmark of joining parallel tests.
+#
+# Compares the current join, that waits for the futures
+# using their done callbacks, against a reference copy
+# of the previous implementation that polled each future
+# with a 0.1 sec timeout in round-robin order.
+#
+# For each number of futures it measures
+#
+# * complete: time from the completion of the last future to the
+#   return of the join and the CPU time of the joining thread
+#   when the futures complete in the reverse order over one second
+# * fail: time from the failure of the future that completes first
+#   to the join raising its exception
+# * steps: time and process CPU time of running and joining
+#   the parallel steps that are executed in a thread pool
+import time
+import threading
+
+from concurrent.futures import Future, CancelledError, TimeoutError
+
+from testflows.core import *
+from testflows._core.parallel import join as current_join
+
+
+def previous_join(*future, futures=None, test=None, all=False):
+    """Reference copy of the previous join
+    without the filter and cancel pending options."""
+    futures = list(future) or futures
+    tests = []
+    exception = None
+    cancel_pending = False
+
+    while futures:
+        future = futures.pop(0)
+        if cancel_pending:
+            if future.cancel():
+                continue
+        try:
+            exc = future.exception(timeout=0.1)
+            if exc is not None:
+                if exception is None:
+                    exception = exc
+                    cancel_pending = True
+                    if test:
+                        test.terminate()
+                if not all:
+                    futures.append(future)
+                    raise exception
+            else:
+                tests.append(future.result(timeout=0.1))
+        except CancelledError:
+            continue
+        except TimeoutError:
+            futures.append(future)
+            continue
+
+    if exception is not None:
+        raise exception
+    return tests
+
+
+joins = {
+    "previous": previous_join,
+    "current": current_join,
+}
+
+
+class Joiner:
+    """Test that is passed to the join
+    and ignores termination."""
+
+    def terminate(self, *args, **kwargs):
+        pass
+
+
+def complete(futures, duration, fail=False):
+    """Complete futures in the reverse order over the duration
+    and return the completion time of the first and the last future."""
+    first = None
+    interval = duration / len(futures)
+    start_time = time.perf_counter()
+    for i, future in enumerate(reversed(futures)):
+        delay = start_time + i * interval - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        if fail and first is None:
+            future.set_exception(ValueError("fail"))
+        else:
+            future.set_result(i)
+        if first is None:
+            first = time.perf_counter()
+    return first, time.perf_counter()
+
+
+def measure_futures(name, count, fail=False, duration=1.0):
+    """Return (latency, CPU time) of joining the futures."""
+    futures = [Future() for _ in range(count)]
+    for future in futures:
+        future.set_running_or_notify_cancel()
+
+    times = []
+    completer = threading.Thread(
+        target=lambda: times.extend(complete(futures, duration, fail=fail))
+    )
+    completer.start()
+
+    cpu_time = time.thread_time()
+    try:
+        joins[name](futures=list(futures), test=Joiner())
+    except ValueError:
+        pass
+    end_time = time.perf_counter()
+    cpu_time = time.thread_time() - cpu_time
+
+    completer.join()
+    first, last = times
+    return end_time - (first if fail else last), cpu_time
+
+
+@TestStep
+def noop(self):
+    """Parallel step that does nothing."""
+    pass
+
+
+def measure_steps(name, count):
+    """Return (time, CPU time) of running and joining the parallel steps."""
+    with Pool(16) as pool:
+        start_time = time.perf_counter()
+        cpu_time = time.process_time()
+        for i in range(count):
+            Step(name=f"step {i}", test=noop, parallel=True, executor=pool)()
+        joins[name](futures=current().futures, test=Joiner())
+        cpu_time = time.process_time() - cpu_time
+        return time.perf_counter() - start_time, cpu_time
+
+
+@TestOutline(Scenario)
+@Examples("count", [(10000,), (100000,)])
+def join_latency(self, count):
+    """Measure join latency and CPU time."""
+    results = {}
+
+    for name in joins:
+        with By(f"measuring the {name} implementation"):
+            latency, cpu_time = measure_futures(name, count)
+            metric(f"{name} complete latency", round(latency * 1000, 1), "ms")
+            metric(f"{name} complete cpu", round(cpu_time * 1000, 1), "ms")
+
+            fail_latency, _ = measure_futures(name, count, fail=True)
+            metric(f"{name} fail latency", round(fail_latency * 1000, 1), "ms")
+
+            steps_time, steps_cpu_time = measure_steps(name, count)
+            metric(f"{name} steps time", round(steps_time * 1000, 1), "ms")
+            metric(f"{name} steps cpu", round(steps_cpu_time * 1000, 1), "ms")
+
+            results[name] = (
+                latency,
+                cpu_time,
+                fail_latency,
+                steps_time,
+                steps_cpu_time,
+            )
+
+    previous, current = results["previous"], results["current"]
+    note(
+        f"{count} futures: complete latency {previous[0] * 1000:.1f}"
+        f" -> {current[0] * 1000:.1f} ms, cpu {previous[1] * 1000:.1f}"
+        f" -> {current[1] * 1000:.1f} ms, fail latency {previous[2] * 1000:.1f}"
+        f" -> {current[2] * 1000:.1f} ms; steps time {previous[3] * 1000:.1f}"
+        f" -> {current[3] * 1000:.1f} ms, cpu {previous[4] * 1000:.1f}"
+        f" -> {current[4] * 1000:.1f} ms"
+    )
+
+
+@TestModule
+def regression(self):
+    """Parallel join latency and CPU benchmark."""
+    for example in join_latency.examples:
+        Scenario(name=f"count {example.count}", test=join_latency)(**vars(example))
+
+
+if main():
+    regression()
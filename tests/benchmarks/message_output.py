@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# Micro-benchmark of the test output protocol.
+#
+# Compares messages per second for note(), metric() and result()
+# messages produced by the current TestOutput, that assembles messages
+# from cached JSON fragments, against a reference copy of the previous
+# implementation that serialized the whole message and then split
+# and rejoined it to splice in the message hash.
+import json
+import time
+
+import testflows.settings as settings
+
+from testflows.core import *
+from testflows._core.io import TestOutput
+from testflows._core.constants import end_of_message
+
+
+class NullIO:
+    """Message IO that discards all messages."""
+
+    def write(self, msg):
+        pass
+
+
+class SplitJoinTestOutput(TestOutput):
+    """Reference copy of the previous TestOutput.message()."""
+
+    def message(self, keyword, message, object_type=0, stream=None):
+        msg_time = time.time()
+
+        msg = {
+            "message_keyword": str(keyword),
+            "message_hash": self.msg_hash,
+            "message_object": object_type,
+            "message_num": self.msg_count,
+            "message_stream": stream,
+            "message_level": self.message_level(keyword),
+            "message_time": round(msg_time, settings.time_resolution),
+            "message_rtime": round(
+                msg_time - self.test.start_time, settings.time_resolution
+            ),
+        }
+        msg.update(self.prefix)
+
+        self.filter_secrets(message)
+
+        msg.update(message)
+        self.test.tracer.debug("test message", extra={"test_message": msg})
+
+        msg = json.dumps(msg, separators=(",", ":"), ensure_ascii=False)
+
+        self.msg_hash = settings.hash_func(msg.encode("utf-8")).hexdigest()[
+            : settings.hash_length
+        ]
+        self.msg_count += 1
+
+        parts = msg.split(",", 2)
+        parts[1] = f'"message_hash":"{self.msg_hash}"'
+        self.io.write(f"{parts[0]},{parts[1]},{parts[2]}{end_of_message}")
+
+
+def output_note(output):
+    output.note("benchmark note message")
+
+
+def output_metric(output):
+    output.metric(Metric(name="benchmark", value=1.0, units="ms"))
+
+
+def output_result(output):
+    output.result(OK(test=current().name))
+
+
+outputs = {"note": output_note, "metric": output_metric, "result": output_result}
+
+
+def rate(output, func, count):
+    """Return number of messages per second."""
+    start_time = time.perf_counter()
+    for i in range(count):
+        func(output)
+    return count / (time.perf_counter() - start_time)
+
+
+@TestOutline(Scenario)
+@Examples("name", [("note",), ("metric",), ("result",)])
+def message_rate(self, name, count=100000):
+    """Measure message output rate."""
+    func = outputs[name]
+
+    with By("measuring the previous implementation"):
+        before = rate(SplitJoinTestOutput(current(), NullIO()), func, count)
+        metric(f"{name} before", round(before), "messages/sec")
+
+    with And("measuring the current implementation"):
+        after = rate(TestOutput(current(), NullIO()), func, count)
+        metric(f"{name} after", round(after), "messages/sec")
+
+    note(f"{name}: {before:.0f} -> {after:.0f} messages/sec ({after / before:.2f}x)")
+
+
+@TestModule
+def regression(self):
+    """Test output protocol micro-benchmark."""
+    for example in message_rate.examples:
+        Scenario(name=example.name, test=message_rate)(**vars(example))
+
+
+if main():
+    regression()
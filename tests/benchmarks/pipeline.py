@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# Throughput benchmark of the log transformation pipelines.
+#
+# Compares messages per second for the streaming mode, where
+# each log line is pushed through all the pipeline steps
+# one at a time, against the batched mode, where read, parse,
+# and the formatter and report steps process lists of lines,
+# using a synthetic log with one million messages.
+import os
+import time
+import tempfile
+
+from testflows.core import *
+from testflows._core.io import TestOutput
+from testflows._core.transform.log.pipeline import (
+    batch_size,
+    DotsLogPipeline,
+    ShortLogPipeline,
+    NiceLogPipeline,
+)
+
+
+class NullIO:
+    """Output that discards everything."""
+
+    def write(self, data):
+        pass
+
+    def flush(self):
+        pass
+
+
+def write_log(file, count):
+    """Write synthetic log with the specified number of messages."""
+    output = TestOutput(current(), file)
+    output.protocol()
+    output.version()
+    output.test_message()
+    for i in range((count - 5) // 4):
+        output.note(f"note message {i}")
+        output.debug(f"debug message {i}")
+        output.text(f"text message {i}")
+        output.metric(Metric(name="benchmark", value=i, units="ms"))
+    output.result(OK(test=current().name))
+    output.stop()
+    return output.msg_count
+
+
+pipelines = {
+    "dots": DotsLogPipeline,
+    "short": ShortLogPipeline,
+    "nice": NiceLogPipeline,
+}
+
+
+def rate(log, pipeline, count, batch):
+    """Return number of messages per second."""
+    with open(log, "r", encoding="utf-8") as input:
+        start_time = time.perf_counter()
+        pipeline(input, NullIO(), batch=batch).run()
+        return count / (time.perf_counter() - start_time)
+
+
+@TestOutline(Scenario)
+@Examples("name", [("dots",), ("short",), ("nice",)])
+def pipeline_rate(self, name, log):
+    """Measure pipeline throughput."""
+    pipeline = pipelines[name]
+    count = self.context.count
+
+    with By("measuring the streaming mode"):
+        streaming = rate(log, pipeline, count, batch=None)
+        metric(f"{name} streaming", round(streaming), "messages/sec")
+
+    with And("measuring the batched mode"):
+        batched = rate(log, pipeline, count, batch=batch_size)
+        metric(f"{name} batched", round(batched), "messages/sec")
+
+    note(
+        f"{name}: {streaming:.0f} -> {batched:.0f} messages/sec"
+        f" ({batched / streaming:.2f}x)"
+    )
+
+
+@TestModule
+def regression(self, count=1000000):
+    """Log transformation pipeline throughput benchmark."""
+    fd, log = tempfile.mkstemp(suffix=".log")
+    try:
+        with Given(f"synthetic log with {count} messages"):
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                self.context.count = write_log(file, count)
+
+        for example in pipeline_rate.examples:
+            Scenario(name=example.name, test=pipeline_rate)(
+                **vars(example), log=log
+            )
+    finally:
+        os.remove(log)
+
+
+if main():
+    regression()
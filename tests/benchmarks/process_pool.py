@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# Startup benchmark of the process pool worker processes.
+#
+# Compares process pools that start their workers
+#
+# * lazy: one at a time when work items are submitted
+# * warm: concurrently, at most one per CPU, when the pool is opened
+#   and waits for all of them to be ready, so with fewer CPUs
+#   than workers the first wave takes longer than with the lazy pool
+#   that reuses the workers which are done with their first work item
+# * fork server: concurrently when the pool is opened by forking
+#   them from a template worker process that has all the modules
+#   already imported
+#
+# For each number of workers it measures the time from opening the pool
+# to the completion of the first wave of work items, one per worker,
+# that each sleep for one second, and the mean startup latency
+# of the worker processes.
+#
+# It also measures work item dispatch of a warm pool
+#
+# * idle: CPU time of the parent process while all the workers are idle
+# * latency: median time from submitting a work item to its start
+#   in the worker process
+import os
+import time
+import statistics
+
+from testflows.core import *
+
+modes = {
+    "lazy": {},
+    "warm": {"warm": True},
+    "fork server": {"warm": True, "fork_server": True},
+}
+
+
+def measure(workers, duration=1.0, **kwargs):
+    """Return (first wave time, mean startup latency) of the process pool."""
+    start_time = time.perf_counter()
+    with ProcessPool(workers, **kwargs) as pool:
+        futures = [pool.submit(time.sleep, args=(duration,)) for _ in range(workers)]
+        for future in futures:
+            future.result()
+        wave_time = time.perf_counter() - start_time
+        latency = pool.startup_latency.values()
+        return wave_time, sum(latency) / len(latency)
+
+
+@TestOutline(Scenario)
+@Examples("workers", [(4,), (16,)])
+def first_wave(self, workers):
+    """Measure time to complete the first wave of work items."""
+    results = {}
+
+    for name, kwargs in modes.items():
+        with By(f"measuring {name} pool"):
+            wave_time, latency = measure(workers, **kwargs)
+            metric(f"{name} first wave", round(wave_time * 1000, 1), "ms")
+            metric(f"{name} mean startup latency", round(latency * 1000, 1), "ms")
+            results[name] = (wave_time, latency)
+
+    note(
+        f"{workers} workers on {os.cpu_count()} CPUs: "
+        + ", ".join(
+            f"{name} first wave {wave_time * 1000:.1f} ms"
+            f" (startup latency {latency * 1000:.1f} ms)"
+            for name, (wave_time, latency) in results.items()
+        )
+    )
+
+
+def measure_dispatch(workers, idle=5.0, count=200):
+    """Return (idle CPU time, median submit to start latency) of the process pool."""
+    with ProcessPool(workers, warm=True) as pool:
+        cpu_time = time.process_time()
+        time.sleep(idle)
+        cpu_time = time.process_time() - cpu_time
+
+        latencies = []
+        for _ in range(count):
+            submit_time = time.time()
+            latencies.append(pool.submit(time.time).result() - submit_time)
+
+        return cpu_time, statistics.median(latencies)
+
+
+@TestOutline(Scenario)
+@Examples("workers", [(4,), (16,)])
+def dispatch(self, workers):
+    """Measure work item dispatch to the workers."""
+    cpu_time, latency = measure_dispatch(workers)
+    metric("idle cpu", round(cpu_time * 1000, 1), "ms")
+    metric("submit to start latency", round(latency * 1000, 3), "ms")
+    note(
+        f"{workers} workers: idle cpu {cpu_time * 1000:.1f} ms over 5 sec,"
+        f" submit to start latency {latency * 1000:.3f} ms"
+    )
+
+
+@TestModule
+def regression(self):
+    """Process pool worker startup and dispatch benchmark."""
+    for example in first_wave.examples:
+        Scenario(name=f"workers {example.workers}", test=first_wave)(**vars(example))
+    for example in dispatch.examples:
+        Scenario(name=f"dispatch workers {example.workers}", test=dispatch)(
+            **vars(example)
+        )
+
+
+if main():
+    regression()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# Throughput benchmark of the log read transform.
+#
+# Compares megabytes per second of the current read transform,
+# that splits lines on the binary buffer of the log file and
+# counts line offsets in bytes, against a reference copy
+# of the previous implementation that read decoded lines
+# and re-encoded each line to count its offset,
+# using a synthetic multi-gigabyte log.
+import os
+import time
+import tempfile
+
+from testflows.core import *
+from testflows._core.io import TestOutput
+from testflows._core.transform.log.read import transform as read_transform
+
+
+def readline_transform(file, offset=False):
+    """Reference copy of the previous read transform."""
+    yield None
+
+    line = ""
+    pos = 0
+
+    while True:
+        data = file.readline()
+
+        line += data
+
+        if line.endswith("\n"):
+            if offset:
+                yield (line, pos)
+                pos += len(line.encode("utf-8"))
+            else:
+                yield line
+
+            line = ""
+
+        if data == "":
+            break
+
+
+def write_log(file, size):
+    """Write synthetic log of at least the specified size in bytes
+    by repeating a block of messages and return number of lines."""
+    block = tempfile.TemporaryFile(mode="w+", encoding="utf-8")
+    with block:
+        output = TestOutput(current(), block)
+        for i in range(10000):
+            output.note(f"note message {i}")
+            output.debug(f"debug message é {i}")
+            output.metric(Metric(name="benchmark", value=i, units="ms"))
+        block.seek(0)
+        block = block.read()
+
+    lines = block.count("\n")
+    block = block.encode("utf-8")
+
+    count = 0
+    written = 0
+    while written < size:
+        file.write(block)
+        written += len(block)
+        count += lines
+
+    return count
+
+
+transforms = {
+    "previous": readline_transform,
+    "current": read_transform,
+}
+
+
+def rate(log, name, offset):
+    """Return number of megabytes per second."""
+    with open(log, "r", encoding="utf-8") as input:
+        transform = transforms[name](input, offset=offset)
+        next(transform)
+        start_time = time.perf_counter()
+        for _ in transform:
+            pass
+        return os.path.getsize(log) / 1048576 / (time.perf_counter() - start_time)
+
+
+@TestOutline(Scenario)
+@Examples("offset", [(False,), (True,)])
+def read_rate(self, offset, log):
+    """Measure read transform throughput."""
+    mode = "offset" if offset else "lines"
+
+    with By("measuring the previous implementation"):
+        previous = rate(log, "previous", offset)
+        metric(f"{mode} previous", round(previous), "MB/sec")
+
+    with And("measuring the current implementation"):
+        current = rate(log, "current", offset)
+        metric(f"{mode} current", round(current), "MB/sec")
+
+    note(
+        f"{mode}: {previous:.0f} -> {current:.0f} MB/sec"
+        f" ({current / previous:.2f}x)"
+    )
+
+
+@TestModule
+def regression(self, size=2147483648):
+    """Log read transform throughput benchmark."""
+    fd, log = tempfile.mkstemp(suffix=".log")
+    try:
+        with Given(f"synthetic log of {size // 1048576} MB"):
+            with os.fdopen(fd, "wb") as file:
+                note(f"{write_log(file, size)} lines")
+
+        for example in read_rate.examples:
+            Scenario(name=f"offset {example.offset}", test=read_rate)(
+                **vars(example), log=log
+            )
+    finally:
+        os.remove(log)
+
+
+if main():
+    regression()
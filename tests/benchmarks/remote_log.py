@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# Benchmark of the log writing by remote tests.
+#
+# Runs one remote test per process pool worker that writes a number
+# of note messages and measures the time from the start of the tests
+# to the completion of all of them and the CPU time of the parent
+# process, that writes all messages into the log file, over the same
+# period.
+import time
+
+from testflows.core import *
+
+
+@TestScenario
+def remote_test(self, count):
+    for i in range(count):
+        note(f"remote test message {i}")
+
+
+def measure(workers, count):
+    """Return (time, parent CPU time) to complete remote tests."""
+    with ProcessPool(workers, warm=True) as pool:
+        start_time = time.perf_counter()
+        cpu_time = time.process_time()
+        for i in range(workers):
+            Scenario(
+                name=f"remote test {i}", test=remote_test, parallel=True, executor=pool
+            )(count=count)
+        join()
+        cpu_time = time.process_time() - cpu_time
+        return time.perf_counter() - start_time, cpu_time
+
+
+@TestOutline(Scenario)
+@Examples("workers", [(4,), (16,)])
+def remote_log(self, workers, count=5000):
+    """Measure log writing by the remote tests."""
+    run_time, cpu_time = measure(workers, count)
+    metric("time", round(run_time * 1000, 1), "ms")
+    metric("parent cpu", round(cpu_time * 1000, 1), "ms")
+    metric("messages", round(workers * count / run_time), "msg/sec")
+    note(
+        f"{workers} workers: {workers * count} messages in {run_time * 1000:.1f} ms"
+        f" ({workers * count / run_time:.0f} msg/sec),"
+        f" parent cpu {cpu_time * 1000:.1f} ms"
+    )
+
+
+@TestModule
+def regression(self):
+    """Remote tests log writing benchmark."""
+    for example in remote_log.examples:
+        Scenario(name=f"workers {example.workers}", test=remote_log)(**vars(example))
+
+
+if main():
+    regression()
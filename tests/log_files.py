@@ -0,0 +1,549 @@
+import os
+import re
+import sys
+import glob
+import json
+import lzma
+import shutil
+import tempfile
+import subprocess
+
+from testflows.core import *
+from testflows.asserts import error
+
+from testflows._core.index import BlockIndex, filename as index_filename
+from testflows._core.log_index import LogIndex
+from testflows._core.compress import CompressedFile, ParallelDecompressReader, codecs
+from testflows._core.message import CompactMessageDecoder
+from testflows._core import database as database_module
+from testflows._core.transform.log.read_and_filter import Filter
+
+program = """
+import time
+from testflows.core import *
+
+@TestScenario
+def scenario(self, i):
+    for j in range(4):
+        with Step(f"step {j}"):
+            note(f"note {i} {j}")
+            time.sleep(0.1)
+
+@TestModule
+def regression(self):
+    for i in range(8):
+        Scenario(name=f"scenario {i}", test=scenario, parallel=True)(i=i)
+        time.sleep(0.1)
+    join()
+
+if main():
+    regression()
+"""
+
+
+@TestStep(Given)
+def temporary_directory(self):
+    with tempfile.TemporaryDirectory() as directory:
+        yield directory
+
+
+def run_program(directory, name="test.log", args=None, cwd=None):
+    """Run test program and return the name of its log file.
+    If name is None then the test program writes temporary log.
+    """
+    filename = os.path.join(directory, "program.py")
+    if not os.path.exists(filename):
+        with open(filename, "w") as fd:
+            fd.write(program)
+    logfile = None
+    command = [sys.executable, filename, "-o", "quiet"]
+    if name is not None:
+        logfile = os.path.join(directory, name)
+        command += ["--log", logfile]
+    subprocess.run(command + (args or []), check=True, cwd=cwd)
+    return logfile
+
+
+def tfs(*args, exitcode=0):
+    """Run tfs command and return its output."""
+    process = subprocess.run(
+        ["tfs", *args], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    assert process.returncode == exitcode, error(process.stdout)
+    return process.stdout
+
+
+#: ANSI color escape sequence
+color_re = re.compile(r"\x1b\[[0-9;]*m")
+#: message date or time column of the nice output format
+time_re = re.compile(r"^(\w{3} \d+,\d{4} \d\d:\d\d:\d\d|\s*(\d+(h|ms|m|s|us) ?)+)")
+#: fields of the results report that differ between runs
+run_fields = {"message_hash", "message_time", "message_rtime", "test_id"}
+
+
+def show_messages(logfile, name):
+    """Return messages of the test shown using tfs show messages
+    without the message time column that differs between runs."""
+    output = color_re.sub("", tfs("show", "messages", "--log", logfile, name))
+    return [time_re.sub("", line) for line in output.splitlines()]
+
+
+def report_results(logfile):
+    """Return tests of the results report without the fields
+    that differ between runs."""
+
+    def strip(value):
+        if isinstance(value, dict):
+            return {k: strip(v) for k, v in value.items() if k not in run_fields}
+        if isinstance(value, list):
+            return [strip(v) for v in value]
+        return value
+
+    report = json.loads(tfs("report", "results", logfile, "--format", "json"))
+    return strip(sorted(report["tests"], key=lambda test: test["test"]["test_name"]))
+
+
+def unindexed_copy(logfile):
+    """Return copy of the log file without its indexes."""
+    copy = f"{logfile}.unindexed"
+    shutil.copyfile(logfile, copy)
+    return copy
+
+
+#: test names that are shown using indexed and unindexed logs
+show_names = [
+    "/regression",
+    "/regression/scenario 3",
+    "/regression/scenario 3/step 1",
+    "/regression/scenario [2-4]",
+]
+
+
+def check_indexed(logfile, unindexed):
+    """Check that tfs show commands output the same
+    for the indexed and the unindexed log."""
+    for command in ("messages", "details"):
+        for name in show_names:
+            expected = tfs("show", command, "--log", unindexed, name)
+            assert expected, error()
+            assert tfs("show", command, "--log", logfile, name) == expected, error()
+
+
+def corrupt_hash(logfile):
+    """Corrupt hash of the first note message in the uncompressed log."""
+    with open(logfile, "r", encoding="utf-8") as fd:
+        lines = fd.readlines()
+    for i, line in enumerate(lines):
+        msg = json.loads(line)
+        if type(msg) is list:
+            keyword, message_hash = msg[0], msg[1]
+        else:
+            keyword, message_hash = msg["message_keyword"], msg["message_hash"]
+        if keyword == "NOTE":
+            corrupted_hash = "0" * len(message_hash)
+            lines[i] = line.replace(f'"{message_hash}"', f'"{corrupted_hash}"', 1)
+            break
+    with open(logfile, "w", encoding="utf-8") as fd:
+        fd.writelines(lines)
+
+
+def decode(file):
+    """Decode all messages that are read from the file."""
+    decoder = CompactMessageDecoder()
+    return [decoder.decode(line) for line in file.read().decode("utf-8").splitlines()]
+
+
+@TestScenario
+def seek_time_compact_log(self):
+    """Check reading compact (TFSPv3) log from each block using seek_time."""
+    with Given("compact log"):
+        logfile = run_program(
+            directory=temporary_directory(), args=["--protocol", "v3"]
+        )
+
+    with And("its block index"):
+        index = BlockIndex.load(logfile)
+        assert index is not None and len(index.blocks) > 2, error()
+
+    for i, block in enumerate(index.blocks):
+        with Example(f"block {i}"):
+            with CompressedFile(logfile) as file:
+                file.seek_time(block["start_time"])
+                messages = decode(file)
+            assert any(
+                msg["message_time"] >= block["start_time"]
+                for msg in messages
+                if "message_time" in msg
+            ), error()
+
+
+@TestScenario
+def seek_test_compact_log(self):
+    """Check reading compact (TFSPv3) log of each test using seek_test."""
+    with Given("compact log"):
+        logfile = run_program(
+            directory=temporary_directory(), args=["--protocol", "v3"]
+        )
+
+    with And("its block index"):
+        index = BlockIndex.load(logfile)
+
+    for num, test_id in enumerate(index.tests):
+        with Example(f"test {num}"):
+            with CompressedFile(logfile) as file:
+                file.seek_test(test_ids=[test_id])
+                messages = decode(file)
+            assert any(msg.get("test_id") == test_id for msg in messages), error()
+
+
+@TestScenario
+def compact_protocol(self):
+    """Check that compact (TFSPv3) logs written using each codec
+    show the same messages and results as the default log."""
+    with Given("default log"):
+        directory = temporary_directory()
+        logfile = run_program(directory=directory)
+        messages = show_messages(logfile, "/regression/scenario 3")
+        results = report_results(logfile)
+        assert messages and results, error()
+
+    for codec in codecs:
+        with Example(f"{codec} codec"):
+            logfile = run_program(
+                directory=directory,
+                name=f"{codec}.log",
+                args=["--protocol", "v3", "--log-codec", codec],
+            )
+            assert show_messages(logfile, "/regression/scenario 3") == messages, error()
+            assert report_results(logfile) == results, error()
+
+
+@TestScenario
+def verify_hash(self):
+    """Check that tfs log verify reports corrupted message hash
+    for each hash function and protocol."""
+    with Given("temporary directory"):
+        directory = temporary_directory()
+
+    for protocol in ("v2", "v3"):
+        for hash_name in ("sha1", "blake2b", "crc32"):
+            with Example(f"{hash_name} hash {protocol} protocol"):
+                with When("I write uncompressed log"):
+                    logfile = run_program(
+                        directory=directory,
+                        name=f"{hash_name}-{protocol}.log",
+                        args=["--protocol", protocol, "--log-codec", "none"]
+                        + ["--hash", hash_name],
+                    )
+
+                with Then("it is verified"):
+                    output = tfs("log", "verify", logfile)
+                    assert f"using {hash_name}" in output, error()
+
+                with When("I corrupt message hash"):
+                    corrupt_hash(logfile)
+
+                with Then("the mismatch is reported"):
+                    output = tfs("log", "verify", logfile, exitcode=1)
+                    assert "hash mismatch" in output, error()
+
+
+@TestScenario
+def block_index(self):
+    """Check that tfs show commands output the same using
+    the block index of the log and without it."""
+    with Given("temporary directory"):
+        directory = temporary_directory()
+
+    for protocol in ("v2", "v3"):
+        with Example(f"{protocol} protocol"):
+            logfile = run_program(
+                directory=directory,
+                name=f"{protocol}.log",
+                args=["--protocol", protocol],
+            )
+            assert BlockIndex.load(logfile) is not None, error()
+            check_indexed(logfile, unindexed_copy(logfile))
+
+
+@TestScenario
+def parallel_read(self):
+    """Check tell and seek while reading a log file
+    that is decompressed in parallel."""
+
+    class ParallelFile(CompressedFile):
+        parallel_min_size = 0
+        compressed_chunk_size = 1024
+
+    with Given("log file with multiple compressed streams"):
+        logfile = os.path.join(temporary_directory(), "streams.log")
+        data = b"".join(f"line {i}\n".encode() for i in range(100000))
+        with open(logfile, "wb") as fd:
+            for offset in range(0, len(data), 65536):
+                fd.write(lzma.compress(data[offset : offset + 65536]))
+
+    with ParallelFile(logfile, jobs=2) as file:
+        with When("I read part of the file"):
+            assert file.read(100000) == data[:100000], error()
+
+        with Then("it is decompressed in parallel"):
+            assert isinstance(file.raw, ParallelDecompressReader), error()
+
+        with And("tell returns the position in the uncompressed data"):
+            assert file.tell() == 100000, error()
+
+        with When("I seek relative to the current position"):
+            file.seek(-50000, 1)
+
+        with Then("reading continues from the new position"):
+            assert file.tell() == 50000, error()
+            assert file.read(100) == data[50000:50100], error()
+
+        with When("I seek to the start of the file"):
+            file.seek(0)
+
+        with Then("the whole file is read"):
+            assert file.read() == data, error()
+
+
+@TestScenario
+def native_filter(self):
+    """Check that native filter selects the same messages
+    as filtering decoded messages."""
+    with Given("temporary directory"):
+        directory = temporary_directory()
+
+    for protocol in ("v2", "v3"):
+        with Example(f"{protocol} protocol"):
+            logfile = run_program(
+                directory=directory,
+                name=f"{protocol}.log",
+                args=["--protocol", protocol],
+            )
+            with CompressedFile(logfile) as file:
+                lines = file.read().splitlines()
+            decoder = CompactMessageDecoder()
+            messages = [decoder.decode(line) for line in lines]
+
+            for name in show_names:
+                for exact in (False, True):
+                    for keywords in (None, {"NOTE", "RESULT"}):
+                        pattern = re.compile(name)
+                        match = pattern.fullmatch if exact else pattern.match
+                        expected = [
+                            msg
+                            for msg in messages
+                            if msg.get("test_name") is not None
+                            and match(msg["test_name"])
+                            and (keywords is None or msg["message_keyword"] in keywords)
+                        ]
+                        assert expected, error()
+
+                        message_filter = Filter(
+                            test_name=name, exact=exact, keywords=keywords
+                        )
+                        filtered = [message_filter.filter(line) for line in lines]
+                        assert [
+                            json.loads(msg) for msg in filtered if msg is not None
+                        ] == expected, error()
+
+            for name in show_names[:3]:
+                test_id = next(
+                    msg["test_id"] for msg in messages if msg.get("test_name") == name
+                )
+                expected = [
+                    msg
+                    for msg in messages
+                    if msg.get("test_id") is not None
+                    and msg["test_id"].startswith(test_id)
+                ]
+                assert expected, error()
+
+                message_filter = Filter(test_id=test_id)
+                filtered = [message_filter.filter(line) for line in lines]
+                assert [
+                    json.loads(msg) for msg in filtered if msg is not None
+                ] == expected, error()
+
+
+@TestScenario
+def log_index(self):
+    """Check that tfs show commands output the same using
+    the log index created by tfs log index and without it."""
+    with Given("temporary directory"):
+        directory = temporary_directory()
+
+    for protocol in ("v2", "v3"):
+        with Example(f"{protocol} protocol"):
+            logfile = run_program(
+                directory=directory,
+                name=f"{protocol}.log",
+                args=["--protocol", protocol],
+            )
+            unindexed = unindexed_copy(logfile)
+
+            with When("I index the log without using its block index"):
+                os.remove(index_filename(logfile))
+                tfs("log", "index", logfile)
+
+            with Then("it has log index"):
+                log_index = LogIndex.load(logfile)
+                assert log_index is not None, error()
+                log_index.close()
+
+            with And("show commands output the same"):
+                check_indexed(logfile, unindexed)
+
+
+@TestScenario
+def query(self):
+    """Check that tfs query returns the same results
+    as the results report for each protocol."""
+    results_query = (
+        "SELECT test_name, result_type FROM results"
+        " WHERE run = (SELECT max(run) FROM runs) AND test_type != 'Step'"
+        " ORDER BY test_name"
+    )
+
+    with Given("temporary directory"):
+        directory = temporary_directory()
+        database = os.path.join(directory, "runs.db")
+
+    for protocol in ("v2", "v3"):
+        with Example(f"{protocol} protocol"):
+            logfile = run_program(
+                directory=directory,
+                name=f"{protocol}.log",
+                args=["--protocol", protocol],
+            )
+            expected = [
+                {
+                    "test_name": test["result"]["test_name"],
+                    "result_type": test["result"]["result_type"],
+                }
+                for test in report_results(logfile)
+            ]
+            assert expected, error()
+
+            with When("I query the log"):
+                output = tfs(
+                    "query", results_query, "--log", logfile, "--format", "json"
+                )
+                assert json.loads(output) == expected, error()
+
+            with When("I add the log to the database"):
+                output = tfs(
+                    "query",
+                    "--database",
+                    database,
+                    results_query,
+                    "--log",
+                    logfile,
+                    "--format",
+                    "json",
+                )
+                assert json.loads(output) == expected, error()
+
+    with Then("the database has each run"):
+        output = tfs(
+            "query",
+            "--database",
+            database,
+            "SELECT count(*) AS runs FROM runs",
+            "--format",
+            "json",
+        )
+        assert json.loads(output) == [{"runs": 2}], error()
+
+
+@TestScenario
+def database(self):
+    """Check that the test program writes its results to the database
+    specified using --database and to the default database file
+    when no options are specified."""
+    results_query = (
+        "SELECT test_name, result_type FROM results"
+        " WHERE test_type != 'Step' ORDER BY test_name"
+    )
+
+    with Given("temporary directory"):
+        directory = temporary_directory()
+
+    for name, args in (
+        ("results.db", ["--database", f"file={os.path.join(directory, 'results.db')}"]),
+        (database_module.default_file, ["--database"]),
+    ):
+        with Example(" ".join(args[:1] + [name])):
+            with When("I run test program with database output"):
+                logfile = run_program(
+                    directory=directory,
+                    name=f"{name}.log",
+                    args=args,
+                    cwd=directory,
+                )
+
+            with Then("the database has the results of the run"):
+                expected = [
+                    {
+                        "test_name": test["result"]["test_name"],
+                        "result_type": test["result"]["result_type"],
+                    }
+                    for test in report_results(logfile)
+                ]
+                assert expected, error()
+                output = tfs(
+                    "query",
+                    "--database",
+                    os.path.join(directory, name),
+                    results_query,
+                    "--format",
+                    "json",
+                )
+                assert json.loads(output) == expected, error()
+
+
+@TestScenario
+def last_log(self):
+    """Check that tfs log last retrieves the temporary log
+    of the last test program run and not its sidecar files."""
+    with Given("temporary directory"):
+        directory = temporary_directory()
+
+    with When("I run test program that writes temporary log"):
+        run_program(directory=directory, name=None)
+
+    with Then("temporary log has block index sidecar"):
+        assert glob.glob(
+            os.path.join(tempfile.gettempdir(), f"testflows.{os.getpid()}.*.log.idx")
+        ), error()
+
+    with When("I retrieve the last temporary log"):
+        logfile = os.path.join(directory, "last.log")
+        tfs("log", "last", logfile)
+
+    with Then("it is the log of the test program"):
+        with CompressedFile(logfile) as file:
+            messages = decode(file)
+        assert messages[0]["message_keyword"] == "PROTOCOL", error()
+        assert any(
+            msg.get("test_name") == "/regression/scenario 3" for msg in messages
+        ), error()
+
+    with When("I retrieve the last temporary log without the last command"):
+        output = os.path.join(directory, "output.log")
+        tfs("log", output)
+
+    with Then("it is the same log"):
+        with open(logfile, "rb") as fd, open(output, "rb") as output_fd:
+            assert fd.read() == output_fd.read(), error()
+
+
+@TestFeature
+def feature(self):
+    """Test reading log files."""
+    for scenario in loads(current_module(), Scenario):
+        scenario()
+
+
+if main():
+    feature()
@@ -0,0 +1,147 @@
+import time
+import asyncio
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from testflows.core import *
+from testflows.asserts import error
+
+from testflows._core.parallel import join
+
+
+class Parent:
+    """Stand-in for the parent test that records
+    if join() has terminated it.
+    """
+
+    def __init__(self):
+        self.terminated = False
+
+    def terminate(self):
+        self.terminated = True
+
+
+def blocked(released):
+    released.wait(timeout=30)
+    return "blocked"
+
+
+def failing():
+    raise ValueError("failing")
+
+
+@TestScenario
+def fail_fast(self):
+    """Check that join() handles a failure as soon as the failing
+    future completes even if the futures before it are still running.
+    """
+    released = threading.Event()
+    parent = Parent()
+
+    with ThreadPoolExecutor(max_workers=21) as pool:
+        try:
+            with Given("twenty futures that block followed by a failing future"):
+                futures = [pool.submit(blocked, released) for i in range(20)]
+                futures.append(pool.submit(failing))
+
+            with When("I join the futures"):
+                start_time = time.time()
+                try:
+                    join(*futures, test=parent)
+                except ValueError:
+                    pass
+                else:
+                    fail("join() did not raise")
+                join_time = time.time() - start_time
+
+            with Then("join returns before any of the blocked futures"):
+                assert not any(f.done() for f in futures[:-1]), error()
+
+            with And("does not wait on each blocked future in turn"):
+                assert join_time < 1, error()
+
+            with And("terminates the parent test"):
+                assert parent.terminated, error()
+        finally:
+            released.set()
+
+
+@TestScenario
+def done_callbacks_removed(self):
+    """Check that join() removes its done callbacks so that
+    they do not pile up on futures that are joined again.
+    """
+    released = threading.Event()
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        try:
+            with Given("futures that are pending"):
+                futures = [pool.submit(time.sleep, 0.1) for i in range(4)]
+
+            with When("I join the same futures multiple times"):
+                for i in range(3):
+                    join(*futures, test=Parent())
+
+            with Then("no done callbacks are left"):
+                for f in futures:
+                    assert f._done_callbacks == [], error()
+
+            with When("join raises while some futures are still pending"):
+                futures = [pool.submit(blocked, released), pool.submit(failing)]
+                try:
+                    join(*futures, test=Parent())
+                except ValueError:
+                    pass
+
+            with Then("no done callbacks are left on the pending future"):
+                assert not futures[0].done(), error()
+                assert futures[0]._done_callbacks == [], error()
+        finally:
+            released.set()
+
+
+@TestScenario
+def async_done_callbacks_removed(self):
+    """Check that async join() removes its done callbacks from
+    both asyncio and concurrent futures.
+    """
+
+    released = threading.Event()
+
+    async def run(pool):
+        loop = asyncio.get_event_loop()
+        async_futures = [loop.create_future() for i in range(2)]
+        for i, f in enumerate(async_futures):
+            loop.call_later(0.1, f.set_result, i)
+        concurrent_futures = [pool.submit(blocked, released) for i in range(2)]
+        loop.call_later(0.1, released.set)
+        futures = async_futures + concurrent_futures
+
+        for i in range(3):
+            results = await join(*futures, test=Parent(), force_async=True)
+        return async_futures, concurrent_futures, results
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        with When("I join pending asyncio and concurrent futures multiple times"):
+            async_futures, concurrent_futures, results = asyncio.run(run(pool))
+
+        with Then("all the results are returned"):
+            assert len(results) == 4, error()
+
+        with And("no done callbacks are left"):
+            for f in async_futures:
+                assert not f._callbacks, error()
+            for f in concurrent_futures:
+                assert f._done_callbacks == [], error()
+
+
+@TestFeature
+def feature(self):
+    """Check joining parallel futures."""
+    for scenario in loads(current_module(), Scenario):
+        scenario()
+
+
+if main():
+    feature()
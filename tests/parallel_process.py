@@ -1,15 +1,19 @@
 from multiprocessing.managers import ValueProxy
 import os
 import sys
+import glob
 import time
 import asyncio
 
 from tracemalloc import start
 
+import testflows.settings as settings
+
 from testflows.core import *
 from testflows.asserts import error, raises
 
 from testflows._core.parallel.service import BaseServiceObject, ServiceError
+from testflows._core.index import BlockIndex
 from testflows._core.exceptions import exception as get_exception
 
 
@@ -52,6 +56,11 @@ def simple(x, y):
     return x + y
 
 
+def get_setting(name):
+    """Simple function that returns global setting."""
+    return getattr(settings, name)
+
+
 def simple_error():
     """Simple function that raises error."""
     raise ValueError("error")
@@ -197,6 +206,66 @@ def feature(self):
         with Scenario("async test that runs parallel tests in a process pool"):
             Scenario(test=my_async_test)()
 
+    with Scenario("run tests in warm process pool"):
+        for fork_server in (False, True):
+            with Example(f"fork server {fork_server}"):
+                with ProcessPool(4, warm=True, fork_server=fork_server) as pool:
+                    assert len(pool.startup_latency) == 4, error()
+                    futures = []
+                    for i in range(8):
+                        futures.append(
+                            Scenario(
+                                name=f"test {i}",
+                                test=my_scenario,
+                                parallel=True,
+                                executor=pool,
+                            )()
+                        )
+                    for v in join(*futures):
+                        assert v.value == "value", error()
+                    f = pool.submit(simple, args=[2, 2])
+                    assert f.result() == 4, error()
+
+    with Scenario("worker settings are only sent when changed"):
+        with ProcessPool(2) as pool:
+            with Example("unchanged"):
+                version = pool._worker_settings().version
+                for i in range(4):
+                    f = pool.submit(get_setting, args=["show_skipped"])
+                    assert f.result() == settings.show_skipped, error()
+                assert pool._worker_settings().version == version, error()
+
+            with Example("changed"):
+                show_skipped = settings.show_skipped
+                settings.show_skipped = not show_skipped
+                try:
+                    for i in range(4):
+                        f = pool.submit(get_setting, args=["show_skipped"])
+                        assert f.result() == (not show_skipped), error()
+                    assert pool._worker_settings().version == version + 1, error()
+                finally:
+                    settings.show_skipped = show_skipped
+
+    with Scenario("remote test messages are merged from log segments"):
+        with ProcessPool(2) as pool:
+            for i in range(4):
+                Scenario(
+                    name=f"segment test {i}",
+                    test=my_scenario,
+                    parallel=True,
+                    executor=pool,
+                )(count=3)
+            join()
+
+            segments = glob.glob(f"{settings.write_logfile}.segment.*")
+            assert segments, error()
+
+            names = BlockIndex.load(settings.write_logfile).names.values()
+            for i in range(4):
+                assert any(
+                    name.endswith(f"/segment test {i}") for name in names if name
+                ), error()
+
 
 if main():
     feature()